@@ -9,6 +9,17 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 from itertools import combinations
+import time
+
+# Distilasyon (öğrenci model) ayarları
+STUDENT_HIDDEN_UNITS = 64
+STUDENT_EPOCHS = 80
+STUDENT_BATCH_SIZE = 64
+STUDENT_LEARNING_RATE = 0.01
+DISTILL_TEMPERATURE = 2.0
+DISTILL_AUGMENT_COPIES = 4      # öğretmenin etiketlediği gürültülü kopya sayısı
+DISTILL_NOISE_STD = 0.01
+STUDENT_FORMAT_VERSION = 1
 
 # Veri yükleme
 data_dict = pickle.load(open('./data.pickle', 'rb'))
@@ -42,6 +53,8 @@ for name, model in models.items():
 
 # Model kombinasyonlarını test etme
 combinations_results = {}
+best_clf = None
+best_combo_score = -1.0
 
 for r in range(2, len(models) + 1):
     for combo in combinations(models.items(), r):
@@ -52,6 +65,9 @@ for r in range(2, len(models) + 1):
         y_pred_combo = voting_clf.predict(x_test)
         combo_score = accuracy_score(y_test, y_pred_combo)
         combinations_results[combo_name] = combo_score
+        if combo_score > best_combo_score:
+            best_combo_score = combo_score
+            best_clf = voting_clf
         print(f"Combination {combo_name}: {combo_score * 100:.2f}% accuracy")
 
 # Sonuçları tablo halinde gösterme
@@ -79,4 +95,132 @@ with open('combined_model.p', 'wb') as f:
     pickle.dump({'model': voting_clf}, f)
 
 print(f"Veri sayısı: {len(data)}")
-print(f"Etiket sayısı: {len(labels)}")
\ No newline at end of file
+print(f"Etiket sayısı: {len(labels)}")
+
+# ---------------------------------------------------------------------------
+# Bilgi damıtma (knowledge distillation): en iyi kombinasyondan küçük bir MLP
+# Öğrenci 42 -> STUDENT_HIDDEN_UNITS (ReLU) -> sınıf sayısı, yalnızca NumPy.
+# Çıktı dosyası web/backend/utils/student_model.py (StudentMLP) ile yüklenir.
+# ---------------------------------------------------------------------------
+
+def soften(probabilities, temperature):
+    """Öğretmen olasılıklarını sıcaklık ile yumuşatma (p^(1/T), yeniden normalize)"""
+    logp = np.log(np.clip(probabilities, 1e-12, 1.0)) / temperature
+    logp -= logp.max(axis=1, keepdims=True)
+    p = np.exp(logp)
+    return p / p.sum(axis=1, keepdims=True)
+
+def student_forward(x, params):
+    """Öğrenci ileri geçiş: (gizli katman, olasılıklar)"""
+    hidden = np.maximum(x @ params['W0'] + params['b0'], 0.0)
+    logits = hidden @ params['W1'] + params['b1']
+    logits -= logits.max(axis=1, keepdims=True)
+    probs = np.exp(logits)
+    probs /= probs.sum(axis=1, keepdims=True)
+    return hidden, probs
+
+def train_student(x, targets, n_classes, seed=42):
+    """Yumuşak hedeflere (cross-entropy) Adam ile küçük MLP eğitme"""
+    rng = np.random.default_rng(seed)
+    n_features = x.shape[1]
+    params = {
+        'W0': rng.normal(0.0, np.sqrt(2.0 / n_features), (n_features, STUDENT_HIDDEN_UNITS)),
+        'b0': np.zeros(STUDENT_HIDDEN_UNITS),
+        'W1': rng.normal(0.0, np.sqrt(1.0 / STUDENT_HIDDEN_UNITS), (STUDENT_HIDDEN_UNITS, n_classes)),
+        'b1': np.zeros(n_classes),
+    }
+    m = {k: np.zeros_like(v) for k, v in params.items()}
+    v = {k: np.zeros_like(val) for k, val in params.items()}
+    beta1, beta2, eps = 0.9, 0.999, 1e-8
+    step = 0
+
+    for epoch in range(STUDENT_EPOCHS):
+        order = rng.permutation(len(x))
+        for start in range(0, len(x), STUDENT_BATCH_SIZE):
+            idx = order[start:start + STUDENT_BATCH_SIZE]
+            xb, tb = x[idx], targets[idx]
+            hidden, probs = student_forward(xb, params)
+
+            # softmax + cross-entropy gradyanı
+            d_logits = (probs - tb) / len(xb)
+            d_hidden = (d_logits @ params['W1'].T) * (hidden > 0)
+            grads = {
+                'W1': hidden.T @ d_logits,
+                'b1': d_logits.sum(axis=0),
+                'W0': xb.T @ d_hidden,
+                'b0': d_hidden.sum(axis=0),
+            }
+
+            step += 1
+            for k in params:
+                m[k] = beta1 * m[k] + (1 - beta1) * grads[k]
+                v[k] = beta2 * v[k] + (1 - beta2) * grads[k] ** 2
+                m_hat = m[k] / (1 - beta1 ** step)
+                v_hat = v[k] / (1 - beta2 ** step)
+                params[k] -= STUDENT_LEARNING_RATE * m_hat / (np.sqrt(v_hat) + eps)
+
+    return params
+
+def per_sample_latency_ms(predict_fn, samples, repeats=200):
+    """Tek örnek (1, 42) gecikmesi - canlı tahmindeki gibi"""
+    rows = [samples[i % len(samples)].reshape(1, -1) for i in range(repeats)]
+    for row in rows[:10]:
+        predict_fn(row)
+    start = time.perf_counter()
+    for row in rows:
+        predict_fn(row)
+    return (time.perf_counter() - start) * 1000.0 / repeats
+
+print(f"\nDistilasyon: öğretmen = {best_combo} (%{best_combo_score * 100:.2f} doğruluk)")
+
+# Öğretmenin etiketlediği eğitim seti (orijinal + gürültülü kopyalar)
+rng = np.random.default_rng(42)
+x_train_f = x_train.astype(np.float64)
+distill_x = [x_train_f] + [x_train_f + rng.normal(0.0, DISTILL_NOISE_STD, x_train_f.shape)
+                           for _ in range(DISTILL_AUGMENT_COPIES)]
+distill_x = np.vstack(distill_x)
+teacher_targets = soften(best_clf.predict_proba(distill_x), DISTILL_TEMPERATURE)
+
+# Girdi standardizasyonu (öğrenci dosyasına kaydedilir)
+feature_mean = x_train_f.mean(axis=0)
+feature_scale = x_train_f.std(axis=0)
+feature_scale[feature_scale < 1e-8] = 1.0
+
+student_params = train_student((distill_x - feature_mean) / feature_scale, teacher_targets,
+                               n_classes=len(best_clf.classes_))
+
+# Öğrenci log(p_öğretmen) / T öğrendi - sıcaklığı son katmana katlayarak
+# servis edilen güven değerlerini öğretmen ölçeğine geri getirme (T=1)
+student_params['W1'] *= DISTILL_TEMPERATURE
+student_params['b1'] *= DISTILL_TEMPERATURE
+
+def student_predict_proba(x):
+    return student_forward((np.asarray(x, dtype=np.float64) - feature_mean) / feature_scale,
+                           student_params)[1]
+
+teacher_test_pred = best_clf.predict(x_test)
+student_test_pred = best_clf.classes_[np.argmax(student_predict_proba(x_test), axis=1)]
+
+teacher_accuracy = accuracy_score(y_test, teacher_test_pred)
+student_accuracy = accuracy_score(y_test, student_test_pred)
+teacher_agreement = np.mean(student_test_pred == teacher_test_pred)
+teacher_latency = per_sample_latency_ms(best_clf.predict_proba, x_test)
+student_latency = per_sample_latency_ms(student_predict_proba, x_test)
+
+print(f"Öğretmen doğruluğu: %{teacher_accuracy * 100:.2f}")
+print(f"Öğrenci doğruluğu:  %{student_accuracy * 100:.2f}")
+print(f"Öğretmen ile uyum:  %{teacher_agreement * 100:.2f}")
+print(f"Gecikme (tek örnek): öğretmen {teacher_latency:.3f} ms, öğrenci {student_latency:.3f} ms "
+      f"({teacher_latency / max(student_latency, 1e-9):.1f}x)")
+
+# Öğrenci modeli kaydetme (sadece NumPy dizileri - MODEL_TYPE=student)
+np.savez('student_model.npz',
+         format_version=np.array(STUDENT_FORMAT_VERSION),
+         mean=feature_mean.astype(np.float32),
+         scale=feature_scale.astype(np.float32),
+         classes=np.asarray(best_clf.classes_),
+         W0=student_params['W0'].astype(np.float32),
+         b0=student_params['b0'].astype(np.float32),
+         W1=student_params['W1'].astype(np.float32),
+         b1=student_params['b1'].astype(np.float32))
+print("Öğrenci model kaydedildi: student_model.npz")
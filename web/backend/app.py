@@ -1,4 +1,4 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, g
 from flask_cors import CORS
 import base64
 import cv2
@@ -8,16 +8,37 @@ import traceback
 from io import BytesIO
 from PIL import Image
 import os
+import json
 import threading
 import time
 from collections import defaultdict, deque
 from functools import wraps
+from typing import Optional
 
 from config import Config
-from utils.hand_detector import HandDetector
-from utils.predictor import SignLanguagePredictor
+from utils.hand_detector import normalize_landmarks, NUM_LANDMARKS, NUM_FEATURES
+from utils.predictor import MicroBatchScheduler
+from utils import model_loader
+from utils.detector_pool import HandDetectorPool
+from utils.feature_cache import FeatureCache
+from utils.motion_gate import MotionGate
+from utils.low_light import LowLightPreprocessor
+from utils.response_format import parse_fields, format_response, dumps
+from utils.metrics import (Metrics, StageTimer, counter_family, gauge_family, histogram_family,
+                           render_families, render_fleet, render_gauge)
+from utils.tracing import TraceWriter, server_timing_header
+from utils.write_behind import SessionHistoryWriter
+from utils.cluster_state import ClusterStateAggregator, CLUSTER_COUNTERS, CLUSTER_FLOAT_COUNTERS
+from utils.memory import get_memory_usage
+from utils.frame_decode import decode_frame, RGB_DECODE_SUPPORTED
 from utils.redis_manager import redis_manager
 
+# WebSocket streaming (opsiyonel - flask-sock kurulu değilse /api/stream devre dışı)
+try:
+    from flask_sock import Sock
+except ImportError:
+    Sock = None
+
 # Initialize Flask app
 app = Flask(__name__)
 
@@ -38,14 +59,43 @@ def after_request(response):
     response.headers['Access-Control-Allow-Methods'] = 'GET, POST, PUT, DELETE, OPTIONS'
     response.headers['Access-Control-Allow-Headers'] = '*'
     response.headers['Access-Control-Max-Age'] = '3600'
+    # Tarayıcı JS'i (fetch / PerformanceResourceTiming) timing header'larını okuyabilsin
+    response.headers['Access-Control-Expose-Headers'] = 'Server-Timing, X-Trace-ID'
+    response.headers['Timing-Allow-Origin'] = '*'
     
     return response
 
 # Global instances
 hand_detector = None
 predictor = None
+batch_scheduler = None
+feature_cache = None
+motion_gate = None
+low_light = None
+trace_writer = None
+cluster_state = None
+session_writer = None
 request_counter = 0
 
+# Prometheus metrics (worker başına) - aşama histogramları /metrics'te
+metrics = Metrics()
+metrics.describe('signdesk_frames_processed_total', 'Frames that went through hand detection.')
+metrics.describe('signdesk_hands_detected_total', 'Frames in which a hand was detected.')
+
+# Kare renk sırası - decoder RGB üretebiliyorsa MediaPipe öncesi BGR->RGB kopyası yapılmaz
+FRAME_RGB = Config.DECODE_RGB and RGB_DECODE_SUPPORTED
+
+# Warm-up / readiness (worker başına)
+WARMUP_STATE = {
+    'completed': False,
+    'duration_ms': None,
+    'frames': 0,
+    'source': None,
+    'timings': {},
+    'error': None,
+    'completed_at': None
+}
+
 # Performance optimization - Rate limiting and request throttling
 REQUEST_LIMITS = defaultdict(lambda: deque())
 REQUEST_LOCK = threading.Lock()
@@ -69,7 +119,9 @@ GLOBAL_STATE = {
     'cache_hits': 0,
     'cache_misses': 0,
     'average_response_time': 0.0,
+    'total_response_time': 0.0,
     'active_sessions': set(),
+    'recent_sessions': {},  # son cluster flush'ından beri aktif session'lar
     'session_stats': defaultdict(lambda: {
         'request_count': 0,
         'last_activity': time.time(),
@@ -148,10 +200,12 @@ def throttle_requests(min_interval=0.1):
         return decorated_function
     return decorator
 
-def get_cache_key(frame_data: str) -> str:
-    """Generate cache key from frame data"""
+def get_cache_key(frame_data) -> str:
+    """Generate cache key from frame data (base64 string or raw bytes)"""
     import hashlib
-    return hashlib.md5(frame_data.encode()).hexdigest()[:16]
+    if isinstance(frame_data, str):
+        frame_data = frame_data.encode()
+    return hashlib.md5(frame_data).hexdigest()[:16]
 
 def get_cached_prediction(cache_key: str) -> dict:
     """Get cached prediction with Redis fallback"""
@@ -213,6 +267,11 @@ def update_session_data(session_id: str, data: dict):
 
 def add_session_prediction(session_id: str, prediction: dict):
     """Add prediction to session history with Redis fallback"""
+    # Write-behind - kare Redis'i beklemez, arka plan thread'i toplu yazar
+    if session_writer is not None:
+        session_writer.add_prediction(session_id, prediction)
+        return
+    
     # Try Redis first
     if redis_manager.add_session_prediction(session_id, prediction):
         return
@@ -231,6 +290,10 @@ def add_session_prediction(session_id: str, prediction: dict):
 
 def add_session_word(session_id: str, word: str):
     """Add word to session history with Redis fallback"""
+    if session_writer is not None:
+        session_writer.add_word(session_id, word)
+        return
+    
     # Try Redis first
     if redis_manager.add_session_word(session_id, word):
         return
@@ -247,6 +310,23 @@ def add_session_word(session_id: str, word: str):
             session['word_history'] = session['word_history'][-100:]
         session['last_activity'] = time.time()
 
+def write_session_history(batch: dict):
+    """Write a coalesced history batch (session writer thread) with in-memory fallback"""
+    # Try Redis first - tüm session'lar tek pipeline
+    if redis_manager.add_session_history(batch):
+        return
+    
+    # Fallback to in-memory storage
+    with SESSIONS_LOCK:
+        now = time.time()
+        for session_id, history in batch.items():
+            session = SESSIONS[session_id]
+            if history['predictions']:
+                session['predictions'] = (session['predictions'] + history['predictions'])[-50:]
+            if history['word_history']:
+                session['word_history'] = (session['word_history'] + history['word_history'])[-100:]
+            session['last_activity'] = now
+
 def cleanup_old_sessions():
     """Clean up sessions older than 24 hours"""
     # Try Redis cleanup first
@@ -266,8 +346,15 @@ def cleanup_old_sessions():
     
     return redis_cleaned + len(expired_sessions)
 
-def update_global_state(session_id: str, request_success: bool, response_time: float, cache_hit: bool = False):
-    """Update global state tracking"""
+def update_global_state(session_id: str, request_success: bool, response_time: float,
+                        cache_hit: Optional[bool] = None):
+    """
+    Update global state tracking
+
+    cache_hit is True/False only for requests that looked up the MD5 frame
+    cache and went through with the result; None (landmark / batch / motion
+    gate / error paths) leaves the hit/miss counters untouched.
+    """
     with STATE_LOCK:
         GLOBAL_STATE['total_requests'] += 1
         if request_success:
@@ -275,22 +362,35 @@ def update_global_state(session_id: str, request_success: bool, response_time: f
         else:
             GLOBAL_STATE['failed_requests'] += 1
         
-        if cache_hit:
+        if cache_hit is True:
             GLOBAL_STATE['cache_hits'] += 1
-        else:
+        elif cache_hit is False:
             GLOBAL_STATE['cache_misses'] += 1
         
         # Update average response time
         total_reqs = GLOBAL_STATE['total_requests']
         current_avg = GLOBAL_STATE['average_response_time']
         GLOBAL_STATE['average_response_time'] = ((current_avg * (total_reqs - 1)) + response_time) / total_reqs
+        GLOBAL_STATE['total_response_time'] += response_time
         
         # Update session stats
+        now = time.time()
         GLOBAL_STATE['active_sessions'].add(session_id)
         session_stats = GLOBAL_STATE['session_stats'][session_id]
         session_stats['request_count'] += 1
-        session_stats['last_activity'] = time.time()
+        session_stats['last_activity'] = now
         session_stats['total_time'] += response_time
+        if cluster_state is not None:
+            # Redis'e flush thread'i taşır - burada sadece dict yazımı
+            GLOBAL_STATE['recent_sessions'][session_id] = now
+
+def snapshot_cluster_counters():
+    """Cumulative worker counters plus sessions active since the previous call (cluster flush)"""
+    with STATE_LOCK:
+        counters = {name: GLOBAL_STATE[name] for name in CLUSTER_COUNTERS + CLUSTER_FLOAT_COUNTERS}
+        sessions = GLOBAL_STATE['recent_sessions']
+        GLOBAL_STATE['recent_sessions'] = {}
+    return counters, sessions
 
 def get_global_state() -> dict:
     """Get current global state"""
@@ -312,7 +412,8 @@ def get_global_state() -> dict:
         
         GLOBAL_STATE['active_sessions'] = active_sessions
         
-        return {
+        state = {
+            'scope': 'worker',
             'total_requests': GLOBAL_STATE['total_requests'],
             'successful_requests': GLOBAL_STATE['successful_requests'],
             'failed_requests': GLOBAL_STATE['failed_requests'],
@@ -322,58 +423,171 @@ def get_global_state() -> dict:
             'error_rate': round(error_rate, 2),
             'average_response_time': round(GLOBAL_STATE['average_response_time'], 3),
             'active_sessions_count': len(active_sessions),
+            'detector_pool': hand_detector.get_stats() if hand_detector else None,
+            'micro_batching': batch_scheduler.get_stats() if batch_scheduler else None,
+            'feature_cache': feature_cache.get_stats() if feature_cache else None,
+            'motion_gate': motion_gate.get_stats() if motion_gate else None,
+            'preprocessing': low_light.get_stats() if low_light else None,
+            'tracing': trace_writer.get_stats() if trace_writer else None,
+            'cluster_state': cluster_state.get_stats() if cluster_state else None,
+            'session_writer': session_writer.get_stats() if session_writer else None,
+            'memory': get_memory_usage(),
             'timestamp': datetime.now().isoformat()
         }
+        local_counters = {name: GLOBAL_STATE[name] for name in CLUSTER_COUNTERS + CLUSTER_FLOAT_COUNTERS}
+    
+    # Tüm worker'ların toplamı (Redis) - ulaşılamazsa bu worker'ın değerleri kalır
+    cluster = cluster_state.read(local_counters) if cluster_state is not None else None
+    if cluster is not None:
+        total_requests = cluster.get('total_requests', 0)
+        total_cache_requests = cluster.get('cache_hits', 0) + cluster.get('cache_misses', 0)
+        state.update({
+            'scope': 'cluster',
+            'total_requests': total_requests,
+            'successful_requests': cluster.get('successful_requests', 0),
+            'failed_requests': cluster.get('failed_requests', 0),
+            'cache_hits': cluster.get('cache_hits', 0),
+            'cache_misses': cluster.get('cache_misses', 0),
+            'cache_hit_rate': round(cluster.get('cache_hits', 0) / total_cache_requests * 100, 2) if total_cache_requests else 0,
+            'error_rate': round(cluster.get('failed_requests', 0) / total_requests * 100, 2) if total_requests else 0,
+            'average_response_time': round(cluster.get('total_response_time', 0.0) / total_requests, 3) if total_requests else 0.0,
+            'active_sessions_count': cluster.get('active_sessions', 0),
+            'workers_reporting': cluster.get('workers_reporting', 0)
+        })
+    return state
+
+def _classify_uncached(features) -> dict:
+    """Run the classifier (through the micro-batcher when enabled)"""
+    if batch_scheduler is not None:
+        return batch_scheduler.predict(features)
+    return predictor.predict(features)
+
+def classify_features(features) -> dict:
+    """Classify one feature vector (landmark cache -> micro-batcher -> model)"""
+    if feature_cache is not None:
+        return feature_cache.classify(features, _classify_uncached)
+    return _classify_uncached(features)
+
+def classify_feature_batch(features_list) -> list:
+    """Classify many feature vectors with one model call for the cache misses"""
+    if feature_cache is not None:
+        return feature_cache.classify_batch(features_list, predictor.predict_batch)
+    return predictor.predict_batch(features_list)
+
+def load_predictor() -> bool:
+    """Load the predictor (model + label map) in this process"""
+    global predictor
+
+    loaded = model_loader.load_predictor()
+    if loaded is None:
+        return False
+    predictor = loaded
+    return True
 
 def initialize_services():
     """Initialize hand detector and predictor"""
-    global hand_detector, predictor
+    global hand_detector, predictor, batch_scheduler, feature_cache, motion_gate, low_light, trace_writer, cluster_state
+    global session_writer
     
     try:
         print("🚀 Initializing services...")
         
-        # Check if model file exists
-        model_path = Config.MODEL_PATH
-        if not os.path.exists(model_path):
-            print(f"⚠️ Model file not found at {model_path}")
-            # Try alternative paths
-            alternative_paths = [
-                './models/combined_model.p',
-                '/app/models/combined_model.p',
-                'models/combined_model.p',
-                '/opt/signdesk/backend/models/combined_model.p',
-                '/opt/signdesk/models/combined_model.p',
-                'C:\\Users\\aslan\\Desktop\\web\\backend\\models\\combined_model.p'
-            ]
-            
-            for alt_path in alternative_paths:
-                if os.path.exists(alt_path):
-                    print(f"✅ Found model at alternative path: {alt_path}")
-                    model_path = alt_path
-                    break
-            else:
-                print("❌ Model file not found in any alternative path")
-                print("Available files:")
-                for root, dirs, files in os.walk('.'):
-                    for file in files:
-                        if file.endswith('.p') or file.endswith('.pkl'):
-                            print(f"  - {os.path.join(root, file)}")
+        # Master'da önceden yüklenmiş model varsa worker onu paylaşır
+        if predictor is None and model_loader.preloaded_predictor is not None:
+            predictor = model_loader.preloaded_predictor
+            print(f"✅ Using preloaded model ({predictor.model_type})")
+        elif predictor is None:
+            if not load_predictor():
                 return False
         
-        # Initialize hand detector
-        print("📸 Loading MediaPipe Hand Detector...")
-        hand_detector = HandDetector(
-            min_detection_confidence=Config.MIN_DETECTION_CONFIDENCE
+        # Initialize hand detector (session başına ayrı MediaPipe tracker)
+        # MediaPipe fork-safe değil - her worker kendi pool'unu fork sonrası oluşturur
+        print("📸 Loading MediaPipe Hand Detector pool...")
+        hand_detector = HandDetectorPool(
+            max_contexts=Config.DETECTOR_POOL_MAX_CONTEXTS,
+            idle_timeout=Config.DETECTOR_IDLE_TIMEOUT,
+            min_detection_confidence=Config.MIN_DETECTION_CONFIDENCE,
+            min_tracking_confidence=Config.MIN_TRACKING_CONFIDENCE,
+            roi_enabled=Config.ENABLE_ROI_CROP,
+            roi_expand=Config.ROI_EXPAND,
+            roi_min_size=Config.ROI_MIN_SIZE,
+            roi_max_area=Config.ROI_MAX_AREA,
+            rgb_input=FRAME_RGB
         )
-        print("✅ Hand detector initialized")
+        print(f"✅ Hand detector pool initialized (max {Config.DETECTOR_POOL_MAX_CONTEXTS} contexts, "
+              f"ROI crop {'on' if Config.ENABLE_ROI_CROP else 'off'})")
         
-        # Initialize predictor with found model path
-        print(f"🤖 Loading ML Model from {model_path}...")
-        predictor = SignLanguagePredictor(
-            model_path=model_path,
-            labels_dict=Config.LABELS_DICT
-        )
-        print("✅ Predictor initialized")
+        if Config.ENABLE_MICRO_BATCHING:
+            batch_scheduler = MicroBatchScheduler(
+                predictor,
+                max_batch_size=Config.MICRO_BATCH_MAX_SIZE,
+                max_wait_ms=Config.MICRO_BATCH_MAX_WAIT_MS
+            )
+            print(f"✅ Micro-batching enabled (max {Config.MICRO_BATCH_MAX_SIZE} rows / {Config.MICRO_BATCH_MAX_WAIT_MS} ms)")
+        
+        if Config.ENABLE_FEATURE_CACHE:
+            feature_cache = FeatureCache(
+                grid=Config.FEATURE_CACHE_GRID,
+                max_size=Config.FEATURE_CACHE_SIZE,
+                probe=Config.FEATURE_CACHE_PROBE
+            )
+            print(f"✅ Landmark cache enabled (grid {Config.FEATURE_CACHE_GRID}, {Config.FEATURE_CACHE_SIZE} entries)")
+        
+        if Config.ENABLE_MOTION_GATE:
+            motion_gate = MotionGate(
+                threshold=Config.MOTION_GATE_THRESHOLD,
+                pixel_threshold=Config.MOTION_GATE_PIXEL_THRESHOLD,
+                thumbnail_width=Config.MOTION_GATE_THUMBNAIL_WIDTH,
+                max_skips=Config.MOTION_GATE_MAX_SKIPS,
+                max_age=Config.MOTION_GATE_MAX_AGE,
+                max_sessions=Config.MOTION_GATE_MAX_SESSIONS,
+                rgb_input=FRAME_RGB
+            )
+            print(f"✅ Motion gate enabled (threshold {Config.MOTION_GATE_THRESHOLD})")
+        
+        if Config.ENABLE_PREPROCESSING:
+            low_light = LowLightPreprocessor(
+                dark_threshold=Config.PREPROCESS_DARK_THRESHOLD,
+                hysteresis=Config.PREPROCESS_HYSTERESIS,
+                gamma=Config.PREPROCESS_GAMMA,
+                clip_limit=Config.PREPROCESS_CLAHE_CLIP,
+                check_interval=Config.PREPROCESS_CHECK_INTERVAL,
+                max_sessions=Config.PREPROCESS_MAX_SESSIONS,
+                rgb_input=FRAME_RGB
+            )
+            print(f"✅ Low-light preprocessing enabled (brightness < {Config.PREPROCESS_DARK_THRESHOLD})")
+        
+        if Config.ENABLE_REQUEST_TRACE:
+            trace_writer = TraceWriter(
+                Config.TRACE_FILE,
+                max_bytes=Config.TRACE_MAX_BYTES,
+                backup_count=Config.TRACE_BACKUP_COUNT
+            )
+            print(f"✅ Request tracing enabled ({Config.TRACE_HEADER}: 1 -> {trace_writer.path})")
+        
+        if Config.ENABLE_WRITE_BEHIND:
+            session_writer = SessionHistoryWriter(
+                write_session_history,
+                max_pending=Config.WRITE_BEHIND_MAX_PENDING,
+                flush_interval=Config.WRITE_BEHIND_FLUSH_INTERVAL,
+                batch_size=Config.WRITE_BEHIND_BATCH_SIZE
+            )
+            session_writer.start()
+            print(f"✅ Session history write-behind enabled (flush every {Config.WRITE_BEHIND_FLUSH_INTERVAL}s)")
+        
+        if Config.ENABLE_CLUSTER_STATE:
+            cluster_state = ClusterStateAggregator(
+                redis_manager,
+                snapshot_cluster_counters,
+                flush_interval=Config.CLUSTER_STATE_FLUSH_INTERVAL,
+                session_window=Config.CLUSTER_SESSION_WINDOW,
+                metrics_snapshot=collect_metric_families
+            )
+            cluster_state.start()
+            print(f"✅ Cluster-wide global state enabled (flush every {Config.CLUSTER_STATE_FLUSH_INTERVAL}s)")
+        
+        if Config.ENABLE_WARMUP:
+            warm_up_services()
         
         print("🎉 All services initialized successfully!")
         return True
@@ -383,6 +597,123 @@ def initialize_services():
         traceback.print_exc()
         return False
 
+def load_warmup_frames(limit: int):
+    """
+    Load encoded warm-up images (WARMUP_IMAGES_DIR) or synthesize frames
+
+    Returns:
+        Tuple of (list of encoded JPEG bytes, source description)
+    """
+    images = []
+    directory = Config.WARMUP_IMAGES_DIR
+    if directory and os.path.isdir(directory):
+        for name in sorted(os.listdir(directory)):
+            if len(images) >= limit:
+                break
+            if name.lower().endswith(('.jpg', '.jpeg', '.png')):
+                with open(os.path.join(directory, name), 'rb') as f:
+                    images.append(f.read())
+    if images:
+        return images, directory
+
+    # Görüntü yoksa sentetik gürültü kareleri (decode + graph yine ısınır)
+    rng = np.random.default_rng(0)
+    for _ in range(limit):
+        frame = rng.integers(0, 256, size=(480, 640, 3), dtype=np.uint8)
+        ok, encoded = cv2.imencode('.jpg', frame)
+        if ok:
+            images.append(encoded.tobytes())
+    return images, 'synthetic'
+
+def warm_up_services() -> bool:
+    """
+    Push warm-up frames through decode, hand detection and classification
+
+    Runs in initialize_services, i.e. in gunicorn's post_fork before the
+    worker starts accepting connections, so the first real request does not
+    pay for MediaPipe graph allocation, the first model call or thread-pool
+    spin-up. Results are exposed by /api/health.
+
+    Returns:
+        True if warm-up completed without errors
+    """
+    start = time.perf_counter()
+    try:
+        images, source = load_warmup_frames(max(1, Config.WARMUP_FRAMES))
+        print(f"🔥 Warming up with {len(images)} frames ({source})...")
+
+        decode_times = []
+        frames = []
+        for encoded in images:
+            t0 = time.perf_counter()
+            frames.append(decode_image_bytes(encoded))
+            decode_times.append((time.perf_counter() - t0) * 1000.0)
+
+        detector_timings = hand_detector.warm_up(frames, spares=Config.WARMUP_SPARE_DETECTORS)
+
+        # Tespit edilen el özellikleri, yoksa normalize aralıkta rastgele vektörler
+        features_list = detector_timings['features'][:len(frames)]
+        rng = np.random.default_rng(0)
+        while len(features_list) < len(frames):
+            features_list.append(rng.uniform(0.0, 0.3, NUM_FEATURES).tolist())
+
+        predict_times = []
+        for features in features_list:
+            t0 = time.perf_counter()
+            _classify_uncached(features)  # landmark cache'i ısınma verisiyle doldurma
+            predict_times.append((time.perf_counter() - t0) * 1000.0)
+
+        t0 = time.perf_counter()
+        predictor.predict_batch(features_list)
+        batch_ms = (time.perf_counter() - t0) * 1000.0
+
+        WARMUP_STATE['timings'] = {
+            'decode_first_ms': round(decode_times[0], 2),
+            'decode_mean_ms': round(sum(decode_times[1:]) / max(1, len(decode_times) - 1), 2),
+            'detector_create_ms': round(detector_timings['create_ms'], 2),
+            'detector_first_ms': round(detector_timings['first_frame_ms'], 2),
+            'detector_mean_ms': round(detector_timings['mean_frame_ms'], 2),
+            'predict_first_ms': round(predict_times[0], 2),
+            'predict_mean_ms': round(sum(predict_times[1:]) / max(1, len(predict_times) - 1), 2),
+            'predict_batch_ms': round(batch_ms, 2),
+            'hands_detected': detector_timings['hands_detected']
+        }
+        WARMUP_STATE['frames'] = len(frames)
+        WARMUP_STATE['source'] = source
+        WARMUP_STATE['error'] = None
+        ok = True
+    except Exception as e:
+        # Warm-up sadece optimizasyon - başarısız olsa da worker trafik alabilir
+        print(f"⚠️ Warm-up failed: {e}")
+        traceback.print_exc()
+        WARMUP_STATE['error'] = str(e)
+        ok = False
+
+    WARMUP_STATE['duration_ms'] = round((time.perf_counter() - start) * 1000.0, 1)
+    WARMUP_STATE['completed'] = True
+    WARMUP_STATE['completed_at'] = datetime.now().isoformat()
+    print(f"✅ Warm-up finished in {WARMUP_STATE['duration_ms']} ms")
+    return ok
+
+def is_ready() -> bool:
+    """Worker is ready for traffic: services loaded and warm-up finished"""
+    services_ready = hand_detector is not None and predictor is not None and predictor.is_loaded()
+    return services_ready and (WARMUP_STATE['completed'] or not Config.ENABLE_WARMUP)
+
+def decode_image_bytes(img_data) -> np.ndarray:
+    """
+    Decode encoded image bytes (JPEG/PNG) to OpenCV image
+
+    Frames wider than DECODE_TARGET_WIDTH are decoded at a reduced scale.
+
+    Args:
+        img_data: bytes, bytearray or memoryview holding the encoded image
+
+    Returns:
+        OpenCV image (RGB if FRAME_RGB, otherwise BGR)
+    """
+    return decode_frame(img_data, Config.DECODE_TARGET_WIDTH, rgb=FRAME_RGB)
+
 def decode_base64_image(base64_string: str) -> np.ndarray:
     """
     Decode base64 string to OpenCV image (optimized)
@@ -391,7 +722,7 @@ def decode_base64_image(base64_string: str) -> np.ndarray:
         base64_string: Base64 encoded image string
 
     Returns:
-        OpenCV image (BGR format)
+        OpenCV image (RGB if FRAME_RGB, otherwise BGR)
     """
     try:
         # Remove data URL prefix if present
@@ -400,18 +731,241 @@ def decode_base64_image(base64_string: str) -> np.ndarray:
 
         # Decode base64 directly to numpy array (daha hızlı)
         img_data = base64.b64decode(base64_string)
-        nparr = np.frombuffer(img_data, np.uint8)
+        return decode_image_bytes(img_data)
 
-        # Decode to OpenCV image (BGR format)
-        img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+    except Exception as e:
+        raise ValueError(f"Failed to decode image: {str(e)}")
 
-        if img is None:
-            raise ValueError("Failed to decode image data")
+# Binary frame ingest - her thread kendi tekrar kullanılabilir buffer'ını tutar
+# Tarayıcı toBlob JPEG yerine PNG/WebP döndürebilir - cv2.imdecode hepsini çözer
+BINARY_FRAME_MIMETYPES = ('image/jpeg', 'image/png', 'image/webp', 'application/octet-stream')
+_frame_buffers = threading.local()
 
-        return img
+def _get_frame_buffer(size: int) -> bytearray:
+    """Return this thread's reusable frame buffer, grown to at least `size` bytes"""
+    buffer = getattr(_frame_buffers, 'buffer', None)
+    if buffer is None or len(buffer) < size:
+        buffer = bytearray(max(size, Config.FRAME_BUFFER_SIZE))
+        _frame_buffers.buffer = buffer
+    return buffer
 
-    except Exception as e:
-        raise ValueError(f"Failed to decode image: {str(e)}")
+def read_binary_frame(stream, content_length: Optional[int]) -> memoryview:
+    """
+    Read a raw image body into the thread's reusable buffer
+
+    Args:
+        stream: File-like object (request body or multipart file stream)
+        content_length: Declared body size in bytes, None if unknown
+
+    Returns:
+        memoryview over the bytes read (valid until the next call on this thread)
+    """
+    if content_length is None:
+        # Chunked upload - boyut bilinmiyor, tek seferde oku
+        data = stream.read(Config.MAX_FRAME_BYTES + 1)
+        content_length = len(data)
+        if content_length > Config.MAX_FRAME_BYTES:
+            raise ValueError(f"Frame too large (max {Config.MAX_FRAME_BYTES} bytes)")
+        buffer = _get_frame_buffer(content_length)
+        buffer[:content_length] = data
+        return memoryview(buffer)[:content_length]
+
+    if content_length <= 0:
+        raise ValueError("Frame body is empty")
+    if content_length > Config.MAX_FRAME_BYTES:
+        raise ValueError(f"Frame too large (max {Config.MAX_FRAME_BYTES} bytes)")
+
+    view = memoryview(_get_frame_buffer(content_length))
+    readinto = getattr(stream, 'readinto', None)
+    total = 0
+    while total < content_length:
+        if readinto is not None:
+            count = readinto(view[total:content_length])
+        else:
+            chunk = stream.read(content_length - total)
+            count = len(chunk)
+            view[total:total + count] = chunk
+        if not count:
+            break
+        total += count
+
+    if total == 0:
+        raise ValueError("Frame body is empty")
+    return view[:total]
+
+def read_request_frame():
+    """
+    Extract frame bytes from the current request
+
+    Supports raw `image/jpeg` / `image/png` / `image/webp` / `application/octet-stream` bodies, multipart
+    uploads with a `frame` file field and the legacy JSON `{"frame": base64}` body.
+
+    Returns:
+        Tuple of (frame_payload, is_binary) where frame_payload is a memoryview
+        for binary uploads and the base64 string for JSON, or (None, False)
+        when the request carries no frame
+    """
+    mimetype = request.mimetype
+    if mimetype in BINARY_FRAME_MIMETYPES:
+        return read_binary_frame(request.stream, request.content_length), True
+
+    if mimetype == 'multipart/form-data':
+        upload = request.files.get('frame')
+        if upload is None:
+            return None, False
+        upload.stream.seek(0, os.SEEK_END)
+        size = upload.stream.tell()
+        upload.stream.seek(0)
+        return read_binary_frame(upload.stream, size), True
+
+    data = request.get_json(silent=True)
+    if not data or 'frame' not in data:
+        return None, False
+    return data['frame'], False
+
+def prediction_error_body(error: str) -> dict:
+    """Build the standard failed-prediction response body"""
+    return {
+        "success": False,
+        "error": error,
+        "hand_detected": False,
+        "prediction": {
+            "letter": None,
+            "confidence": 0.0,
+            "label_index": None
+        },
+        "timestamp": datetime.now().isoformat()
+    }
+
+def prediction_error_response(error: str, status_code: int):
+    """Build the standard failed-prediction JSON response"""
+    return jsonify(prediction_error_body(error)), status_code
+
+def request_response_format():
+    """
+    Read the response projection from the query string
+
+    `fields=prediction,bbox` keeps only those top-level fields (plus success/error),
+    `landmarks=compact` sends landmarks as a flat int16-range list.
+
+    Returns:
+        Tuple of (field set or None, compact landmarks flag)
+    """
+    return parse_fields(request.args.get('fields')), request.args.get('landmarks') == 'compact'
+
+def prediction_json_response(body: dict, status_code: int = 200):
+    """Serialize a prediction body with the request's projection and the fast JSON encoder"""
+    fields, compact = request_response_format()
+    payload = dumps(format_response(body, fields, compact))
+    return app.response_class(payload, status=status_code, mimetype='application/json')
+
+def new_prediction_response(session_id: str, hand_detected: bool) -> dict:
+    """Build an empty successful prediction response"""
+    return {
+        "success": True,
+        "hand_detected": hand_detected,
+        "prediction": {
+            "letter": None,
+            "confidence": 0.0,
+            "label_index": None
+        },
+        "landmarks": None,
+        "bounding_box": None,
+        "timestamp": datetime.now().isoformat(),
+        "error": None,
+        "session_id": session_id
+    }
+
+def apply_prediction_result(response: dict, session_id: str, prediction_result: dict):
+    """Copy classifier output into the response and record it in session history"""
+    response['prediction'] = {
+        "letter": prediction_result['letter'],
+        "confidence": prediction_result['confidence'],
+        "label_index": prediction_result['label_index'],
+        "top_k": prediction_result.get('top_k')
+    }
+    
+    # Add prediction to session history
+    add_session_prediction(session_id, prediction_result)
+    
+    if not prediction_result['success']:
+        response['error'] = prediction_result['error']
+
+def apply_detection_result(response: dict, detection_result: dict, frame: np.ndarray):
+    """Copy landmarks and the normalized bounding box from a detection into the response"""
+    # Include landmarks (only x, y for frontend)
+    if detection_result['landmarks']:
+        response['landmarks'] = [
+            {'x': lm['x'], 'y': lm['y']} 
+            for lm in detection_result['landmarks']
+        ]
+    
+    # Normalize bounding box coordinates (0..1) to avoid backend resize mismatch
+    try:
+        h_norm, w_norm = frame.shape[:2]
+        bb = detection_result['bounding_box']
+        response['bounding_box'] = {
+            'x1': max(0.0, min(1.0, bb['x1'] / float(w_norm))),
+            'y1': max(0.0, min(1.0, bb['y1'] / float(h_norm))),
+            'x2': max(0.0, min(1.0, bb['x2'] / float(w_norm))),
+            'y2': max(0.0, min(1.0, bb['y2'] / float(h_norm))),
+        }
+    except Exception:
+        response['bounding_box'] = None
+
+def parse_landmark_payload(data: dict):
+    """
+    Parse a landmark-only prediction body
+
+    Accepts either `landmarks` (21 points as {x, y[, z]} dicts or [x, y[, z]] lists)
+    or `features` (the 42-value vector produced by `normalize_landmarks`).
+
+    Returns:
+        Tuple of (features, landmarks, bounding_box); landmarks and bounding_box
+        are None when only features were provided
+
+    Raises:
+        ValueError: If the payload is missing or malformed
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Landmark data missing in request")
+
+    if data.get('landmarks') is not None:
+        points = data['landmarks']
+        if not isinstance(points, list) or len(points) != NUM_LANDMARKS:
+            raise ValueError(f"Expected {NUM_LANDMARKS} landmarks")
+        
+        x_coords, y_coords = [], []
+        try:
+            for point in points:
+                if isinstance(point, dict):
+                    x, y = point['x'], point['y']
+                else:
+                    x, y = point[0], point[1]
+                x_coords.append(float(x))
+                y_coords.append(float(y))
+        except (KeyError, IndexError, TypeError, ValueError):
+            raise ValueError("Landmarks must be {x, y[, z]} objects or [x, y[, z]] arrays")
+        
+        landmarks = [{'x': x, 'y': y} for x, y in zip(x_coords, y_coords)]
+        bounding_box = {
+            'x1': max(0.0, min(1.0, min(x_coords))),
+            'y1': max(0.0, min(1.0, min(y_coords))),
+            'x2': max(0.0, min(1.0, max(x_coords))),
+            'y2': max(0.0, min(1.0, max(y_coords))),
+        }
+        return normalize_landmarks(x_coords, y_coords), landmarks, bounding_box
+
+    if data.get('features') is not None:
+        features = data['features']
+        if not isinstance(features, list) or len(features) != NUM_FEATURES:
+            raise ValueError(f"Expected {NUM_FEATURES} features")
+        try:
+            return [float(v) for v in features], None, None
+        except (TypeError, ValueError):
+            raise ValueError("Features must be numbers")
+
+    raise ValueError("Landmark data missing in request")
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
@@ -425,8 +979,11 @@ def health_check():
         
         return jsonify({
             "status": "healthy" if is_healthy else "unhealthy",
+            "live": True,
+            "ready": is_ready(),
             "model_loaded": predictor.is_loaded() if predictor else False,
             "mediapipe_ready": hand_detector is not None,
+            "warmup": dict(WARMUP_STATE, enabled=Config.ENABLE_WARMUP),
             "timestamp": datetime.now().isoformat(),
             "config": {
                 "min_detection_confidence": Config.MIN_DETECTION_CONFIDENCE,
@@ -442,6 +999,21 @@ def health_check():
             "timestamp": datetime.now().isoformat()
         }), 500
 
+@app.route('/api/health/live', methods=['GET'])
+def liveness_check():
+    """Liveness probe - process is up and serving HTTP"""
+    return jsonify({"live": True, "timestamp": datetime.now().isoformat()}), 200
+
+@app.route('/api/health/ready', methods=['GET'])
+def readiness_check():
+    """Readiness probe - services loaded and warm-up finished (503 otherwise)"""
+    ready = is_ready()
+    return jsonify({
+        "ready": ready,
+        "warmup": dict(WARMUP_STATE, enabled=Config.ENABLE_WARMUP),
+        "timestamp": datetime.now().isoformat()
+    }), 200 if ready else 503
+
 @app.route('/api/labels', methods=['GET'])
 def get_labels():
     """Get label dictionary endpoint"""
@@ -463,11 +1035,186 @@ def get_labels():
             "error": str(e)
         }), 500
 
+def preprocess_frame(frame: np.ndarray, session_id: str, timer: StageTimer):
+    """
+    Motion gate and low-light preprocessing in front of hand detection
+
+    Shared by the single-frame pipeline and the batch endpoint.
+
+    Args:
+        frame: Decoded frame
+        session_id: Client session ID
+        timer: Stage timer of the request
+
+    Returns:
+        Tuple of (frame to detect on, motion gate thumbnail or None,
+        previous response if the motion gate skipped the frame else None)
+    """
+    # Motion gate - kare son işlenen kareden neredeyse farksızsa önceki sonucu döndür
+    thumbnail = None
+    if motion_gate is not None:
+        thumbnail, previous_response = motion_gate.check(session_id, frame)
+        timer.lap('motion_gate')
+        if previous_response is not None:
+            previous_response['motion_skipped'] = True
+            previous_response['timestamp'] = datetime.now().isoformat()
+            return frame, thumbnail, previous_response
+
+    # Low-light preprocessing (CLAHE + gamma on luma) - sadece karanlık session'larda
+    if low_light is not None:
+        try:
+            frame, _ = low_light.process(session_id, frame, thumbnail)
+        except cv2.error:
+            pass
+        timer.lap('preprocessing')
+    return frame, thumbnail, None
+
+def run_frame_pipeline(frame_payload, is_binary: bool, session_id: str, start_time: float,
+                       timer: Optional[StageTimer] = None):
+    """
+    Run cache lookup, decode, detection and classification for one frame
+
+    Shared by the HTTP predict route and the streaming endpoint.
+
+    Args:
+        frame_payload: Base64 string or raw encoded image bytes
+        is_binary: True when frame_payload holds raw image bytes
+        session_id: Client session ID
+        start_time: Request start timestamp (time.time())
+        timer: Stage timer of the request (stage durations are added to it)
+
+    Returns:
+        Tuple of (response body dict, HTTP status code)
+    """
+    global request_counter
+    if timer is None:
+        timer = StageTimer()
+    
+    # Smart cache with very short TTL (100ms) - only catches rapid duplicates
+    # This prevents processing identical frames sent in quick succession
+    cache_key = get_cache_key(frame_payload)
+    cached_result = get_cached_prediction(cache_key)
+    timer.lap('cache_lookup')
+    if cached_result:
+        cached_result['cached'] = True
+        response_time = time.time() - start_time
+        update_global_state(session_id, True, response_time, cache_hit=True)
+        return cached_result, 200
+    
+    request_counter += 1
+
+    # Decode image (binary body doğrudan cv2.imdecode'a gider)
+    try:
+        if is_binary:
+            frame = decode_image_bytes(frame_payload)
+        else:
+            frame = decode_base64_image(frame_payload)
+    except ValueError as e:
+        return prediction_error_body(str(e)), 400
+    timer.lap('decode')
+
+    frame, thumbnail, previous_response = preprocess_frame(frame, session_id, timer)
+    if previous_response is not None:
+        response_time = time.time() - start_time
+        # Motion gate'in kendi skip sayacı var - cache hit/miss oranını bozmasın
+        update_global_state(session_id, True, response_time)
+        return previous_response, 200
+
+    # Detect hand (single pass - no flip fallback)
+    detection_result = hand_detector.process_frame(frame, session_id)
+    timer.lap('detection')
+    metrics.inc('signdesk_frames_processed_total')
+    if detection_result['hand_detected']:
+        metrics.inc('signdesk_hands_detected_total')
+
+    # Debug logs in development
+    if Config.DEBUG:
+        try:
+            h_dbg, w_dbg = frame.shape[:2]
+            print(f"🧪 Frame {w_dbg}x{h_dbg} | hand_detected={detection_result['hand_detected']}")
+            # Brightness quick check (mean over grayscale)
+            try:
+                gray = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY if FRAME_RGB else cv2.COLOR_BGR2GRAY)
+                brightness = float(np.mean(gray))
+                print(f"   ↳ brightness≈{brightness:.1f}")
+            except Exception:
+                pass
+            # Save debug frames every N requests
+            if Config.SAVE_DEBUG_FRAMES and request_counter % max(1, Config.DEBUG_FRAME_INTERVAL) == 0:
+                os.makedirs('debug_frames', exist_ok=True)
+                ts = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+                out_path = os.path.join('debug_frames', f'frame_{ts}_{w_dbg}x{h_dbg}.jpg')
+                cv2.imwrite(out_path, cv2.cvtColor(frame, cv2.COLOR_RGB2BGR) if FRAME_RGB else frame)
+                print(f"   ↳ saved debug frame: {out_path}")
+        except Exception:
+            pass
+        timer.skip()
+    
+    # Initialize response
+    response = new_prediction_response(session_id, detection_result['hand_detected'])
+    
+    # If hand detected, make prediction
+    if detection_result['hand_detected']:
+        features = detection_result['features']
+        prediction_result = classify_features(features)
+        timer.lap('classification')
+        apply_prediction_result(response, session_id, prediction_result)
+        timer.lap('session_write')
+        apply_detection_result(response, detection_result, frame)
+
+    if motion_gate is not None:
+        motion_gate.update(session_id, thumbnail, response)
+
+    # Cache with short TTL for duplicate frame prevention
+    set_cached_prediction(cache_key, response)
+    timer.lap('cache_store')
+    
+    # Update global state
+    response_time = time.time() - start_time
+    update_global_state(session_id, True, response_time, cache_hit=False)
+    timer.lap('global_state')
+    
+    return response, 200
+
+def trace_requested() -> bool:
+    """True when the client asked for a request trace through the debug header"""
+    if trace_writer is None:
+        return False
+    return request.headers.get(Config.TRACE_HEADER, '').lower() in ('1', 'true', 'yes')
+
+def finish_prediction_request(endpoint: str, timer: StageTimer, http_response, session_id: str,
+                              body: Optional[dict] = None):
+    """
+    Record stage metrics and attach Server-Timing / trace headers
+
+    Args:
+        endpoint: Endpoint label used in metrics and traces
+        timer: Stage timer of the request (serialization already lapped)
+        http_response: Flask response to decorate
+        session_id: Client session ID
+        body: Response body (summary fields go into the trace)
+
+    Returns:
+        The same response object
+    """
+    total = timer.total()
+    metrics.observe_request(endpoint, timer, total)
+    
+    traced = trace_requested()
+    if Config.ENABLE_SERVER_TIMING or traced:
+        http_response.headers['Server-Timing'] = server_timing_header(timer.durations, total, detailed=traced)
+    if traced:
+        trace_id = trace_writer.write(endpoint, session_id, http_response.status_code,
+                                      timer.durations, total, body)
+        http_response.headers['X-Trace-ID'] = trace_id
+    return http_response
+
 @app.route('/api/predict', methods=['POST'])
 # Rate limiting kaldırıldı - frontend throttling yeterli
 def predict():
     """Main prediction endpoint"""
     start_time = time.time()
+    timer = StageTimer()
     session_id = request.headers.get('X-Session-ID', 'unknown')
     
     try:
@@ -475,188 +1222,304 @@ def predict():
         if hand_detector is None or predictor is None:
             response_time = time.time() - start_time
             update_global_state(session_id, False, response_time)
-            return jsonify({
-                "success": False,
-                "error": "Services not initialized",
-                "hand_detected": False,
-                "prediction": {
-                    "letter": None,
-                    "confidence": 0.0,
-                    "label_index": None
-                },
-                "timestamp": datetime.now().isoformat()
-            }), 503
+            return prediction_error_response("Services not initialized", 503)
         
-        # Get request data
-        data = request.get_json()
+        # Get request data (raw JPEG, multipart veya legacy base64 JSON)
+        try:
+            frame_payload, is_binary = read_request_frame()
+        except ValueError as e:
+            return prediction_error_response(str(e), 400)
         
-        if not data or 'frame' not in data:
-            return jsonify({
-                "success": False,
-                "error": "Frame data missing in request",
-                "hand_detected": False,
-                "prediction": {
-                    "letter": None,
-                    "confidence": 0.0,
-                    "label_index": None
-                },
-                "timestamp": datetime.now().isoformat()
-            }), 400
-        
-        # Smart cache with very short TTL (100ms) - only catches rapid duplicates
-        # This prevents processing identical frames sent in quick succession
-        cache_key = get_cache_key(data['frame'])
-        cached_result = get_cached_prediction(cache_key)
-        if cached_result:
-            cached_result['cached'] = True
-            response_time = time.time() - start_time
-            update_global_state(session_id, True, response_time, cache_hit=True)
-            return jsonify(cached_result), 200
+        if frame_payload is None:
+            return prediction_error_response("Frame data missing in request", 400)
+        timer.lap('body_parse')
+        
+        response, status_code = run_frame_pipeline(frame_payload, is_binary, session_id, start_time, timer)
+        http_response = prediction_json_response(response, status_code)
+        timer.lap('serialization')
+        return finish_prediction_request('predict', timer, http_response, session_id, response)
+        
+    except Exception as e:
+        print(f"❌ Error in predict endpoint: {e}")
+        traceback.print_exc()
+        
+        # Update global state for error
+        response_time = time.time() - start_time
+        update_global_state(session_id, False, response_time)
         
-        global request_counter
-        request_counter += 1
+        return prediction_error_response(f"Internal server error: {str(e)}", 500)
 
-        # Decode base64 image
+@app.route('/api/predict/landmarks', methods=['POST'])
+def predict_landmarks():
+    """Landmark-only prediction endpoint (client-side hand tracking, no image decode)"""
+    start_time = time.time()
+    timer = StageTimer()
+    session_id = request.headers.get('X-Session-ID', 'unknown')
+    
+    try:
+        if predictor is None:
+            response_time = time.time() - start_time
+            update_global_state(session_id, False, response_time)
+            return prediction_error_response("Predictor not initialized", 503)
+        
         try:
-            frame = decode_base64_image(data['frame'])
+            features, landmarks, bounding_box = parse_landmark_payload(request.get_json(silent=True))
         except ValueError as e:
-            return jsonify({
-                "success": False,
-                "error": str(e),
-                "hand_detected": False,
-                "prediction": {
-                    "letter": None,
-                    "confidence": 0.0,
-                    "label_index": None
-                },
-                "timestamp": datetime.now().isoformat()
-            }), 400
-
-        # Optional preprocessing (CLAHE on luminance) - varsayılan olarak kapalı
-        if Config.ENABLE_PREPROCESSING:
-            try:
-                lab = cv2.cvtColor(frame, cv2.COLOR_BGR2LAB)
-                l, a, b = cv2.split(lab)
-                clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-                cl = clahe.apply(l)
-                limg = cv2.merge((cl, a, b))
-                frame = cv2.cvtColor(limg, cv2.COLOR_LAB2BGR)
-
-                # Gamma correction for low light
-                gamma = max(0.5, min(3.0, Config.PREPROCESS_GAMMA))
-                invGamma = 1.0 / gamma
-                table = np.array([((i / 255.0) ** invGamma) * 255
-                    for i in np.arange(0, 256)]).astype("uint8")
-                frame = cv2.LUT(frame, table)
-            except Exception:
-                pass
-
-        # Detect hand (single pass - no flip fallback)
-        detection_result = hand_detector.process_frame(frame)
+            return prediction_error_response(str(e), 400)
+        timer.lap('body_parse')
+        
+        response = new_prediction_response(session_id, True)
+        prediction_result = classify_features(features)
+        timer.lap('classification')
+        apply_prediction_result(response, session_id, prediction_result)
+        response['landmarks'] = landmarks
+        response['bounding_box'] = bounding_box
+        timer.lap('session_write')
+        
+        response_time = time.time() - start_time
+        update_global_state(session_id, True, response_time)
+        timer.lap('global_state')
+        
+        http_response = prediction_json_response(response, 200)
+        timer.lap('serialization')
+        return finish_prediction_request('landmarks', timer, http_response, session_id, response)
+        
+    except Exception as e:
+        print(f"❌ Error in predict_landmarks endpoint: {e}")
+        traceback.print_exc()
+        
+        response_time = time.time() - start_time
+        update_global_state(session_id, False, response_time)
+        
+        return prediction_error_response(f"Internal server error: {str(e)}", 500)
 
-        # Debug logs in development
-        if Config.DEBUG:
-            try:
-                h_dbg, w_dbg = frame.shape[:2]
-                print(f"🧪 Frame {w_dbg}x{h_dbg} | hand_detected={detection_result['hand_detected']}")
-                # Brightness quick check (mean over grayscale)
-                try:
-                    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                    brightness = float(np.mean(gray))
-                    print(f"   ↳ brightness≈{brightness:.1f}")
-                except Exception:
-                    pass
-                # Save debug frames every N requests
-                if Config.SAVE_DEBUG_FRAMES and request_counter % max(1, Config.DEBUG_FRAME_INTERVAL) == 0:
-                    os.makedirs('debug_frames', exist_ok=True)
-                    ts = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
-                    out_path = os.path.join('debug_frames', f'frame_{ts}_{w_dbg}x{h_dbg}.jpg')
-                    cv2.imwrite(out_path, frame)
-                    print(f"   ↳ saved debug frame: {out_path}")
-            except Exception:
-                pass
+@app.route('/api/predict/batch', methods=['POST'])
+def predict_batch():
+    """Batch prediction endpoint - N frames or landmark sets, one classifier call"""
+    start_time = time.time()
+    timer = StageTimer()
+    session_id = request.headers.get('X-Session-ID', 'unknown')
+    
+    try:
+        if predictor is None:
+            response_time = time.time() - start_time
+            update_global_state(session_id, False, response_time)
+            return prediction_error_response("Predictor not initialized", 503)
         
-        # Initialize response
-        response = {
-            "success": True,
-            "hand_detected": detection_result['hand_detected'],
-            "prediction": {
-                "letter": None,
-                "confidence": 0.0,
-                "label_index": None
-            },
-            "landmarks": None,
-            "bounding_box": None,
-            "timestamp": datetime.now().isoformat(),
-            "error": None,
-            "session_id": session_id
-        }
+        data = request.get_json(silent=True) or {}
+        frames = data.get('frames')
+        landmark_sets = data.get('landmarks')
+        feature_sets = data.get('features')
         
-        # If hand detected, make prediction
-        if detection_result['hand_detected']:
-            features = detection_result['features']
-            prediction_result = predictor.predict(features)
-            
-            response['prediction'] = {
-                "letter": prediction_result['letter'],
-                "confidence": prediction_result['confidence'],
-                "label_index": prediction_result['label_index']
-            }
-            
-            # Add prediction to session history
-            add_session_prediction(session_id, prediction_result)
-            
-            # Include landmarks (only x, y for frontend)
-            if detection_result['landmarks']:
-                response['landmarks'] = [
-                    {'x': lm['x'], 'y': lm['y']} 
-                    for lm in detection_result['landmarks']
-                ]
-            
-            # Normalize bounding box coordinates (0..1) to avoid backend resize mismatch
+        items = next((v for v in (frames, landmark_sets, feature_sets) if v is not None), None)
+        if not isinstance(items, list) or not items:
+            return prediction_error_response("Batch must contain 'frames', 'landmarks' or 'features'", 400)
+        if len(items) > Config.MAX_BATCH_SIZE:
+            return prediction_error_response(f"Batch too large (max {Config.MAX_BATCH_SIZE})", 400)
+        if frames is not None and hand_detector is None:
+            response_time = time.time() - start_time
+            update_global_state(session_id, False, response_time)
+            return prediction_error_response("Services not initialized", 503)
+        timer.lap('body_parse')
+        
+        # Stage 1: per-item detection / parsing, features collected for one vectorized call
+        responses = []
+        pending = []  # (response index, features)
+        gate_updates = []  # (response index, motion gate thumbnail)
+        client_errors = set()  # bozuk item'lar - /api/predict'teki 400 gibi sayılmaz
+        for item in items:
             try:
-                h_norm, w_norm = frame.shape[:2]
-                bb = detection_result['bounding_box']
-                response['bounding_box'] = {
-                    'x1': max(0.0, min(1.0, bb['x1'] / float(w_norm))),
-                    'y1': max(0.0, min(1.0, bb['y1'] / float(h_norm))),
-                    'x2': max(0.0, min(1.0, bb['x2'] / float(w_norm))),
-                    'y2': max(0.0, min(1.0, bb['y2'] / float(h_norm))),
-                }
-            except Exception:
-                response['bounding_box'] = None
-            
-            if not prediction_result['success']:
-                response['error'] = prediction_result['error']
-
-        # Cache with short TTL for duplicate frame prevention
-        set_cached_prediction(cache_key, response)
+                if frames is not None:
+                    frame = decode_base64_image(item)
+                    timer.lap('decode')
+                    # /api/predict ile aynı ön işleme (motion gate + low light)
+                    frame, thumbnail, previous_response = preprocess_frame(frame, session_id, timer)
+                    if previous_response is not None:
+                        responses.append(previous_response)
+                        continue
+                    detection_result = hand_detector.process_frame(frame, session_id)
+                    timer.lap('detection')
+                    metrics.inc('signdesk_frames_processed_total')
+                    item_response = new_prediction_response(session_id, detection_result['hand_detected'])
+                    if detection_result['hand_detected']:
+                        metrics.inc('signdesk_hands_detected_total')
+                        apply_detection_result(item_response, detection_result, frame)
+                        pending.append((len(responses), detection_result['features']))
+                    if thumbnail is not None:
+                        gate_updates.append((len(responses), thumbnail))
+                else:
+                    key = 'landmarks' if landmark_sets is not None else 'features'
+                    features, landmarks, bounding_box = parse_landmark_payload({key: item})
+                    item_response = new_prediction_response(session_id, True)
+                    item_response['landmarks'] = landmarks
+                    item_response['bounding_box'] = bounding_box
+                    pending.append((len(responses), features))
+            except ValueError as e:
+                item_response = new_prediction_response(session_id, False)
+                item_response['success'] = False
+                item_response['error'] = str(e)
+                client_errors.add(len(responses))
+            responses.append(item_response)
+        
+        # Stage 2: single (N, 42) predict_proba call (landmark cache hits skipped)
+        timer.skip()
+        prediction_results = classify_feature_batch([features for _, features in pending])
+        timer.lap('classification')
+        for (index, _), prediction_result in zip(pending, prediction_results):
+            apply_prediction_result(responses[index], session_id, prediction_result)
+        # Referans kare sınıflandırmadan sonra yazılır - batch içindeki kareler birbirine göre gate'lenmez
+        for index, thumbnail in gate_updates:
+            motion_gate.update(session_id, thumbnail, responses[index])
+        timer.lap('session_write')
         
-        # Update global state
+        # Global state is tracked per item so totals stay comparable with /api/predict
+        # (client errors are skipped there too; the MD5 frame cache is not used here)
         response_time = time.time() - start_time
-        update_global_state(session_id, True, response_time, cache_hit=False)
+        per_item_time = response_time / len(responses)
+        for index, item_response in enumerate(responses):
+            if index not in client_errors:
+                update_global_state(session_id, item_response['success'], per_item_time)
         
-        return jsonify(response), 200
+        fields, compact = request_response_format()
+        body = {
+            "success": True,
+            "count": len(responses),
+            "results": [format_response(item, fields, compact) for item in responses],
+            "session_id": session_id,
+            "timestamp": datetime.now().isoformat()
+        }
+        http_response = app.response_class(dumps(body), status=200, mimetype='application/json')
+        timer.lap('serialization')
+        return finish_prediction_request('batch', timer, http_response, session_id, body)
         
     except Exception as e:
-        print(f"❌ Error in predict endpoint: {e}")
+        print(f"❌ Error in predict_batch endpoint: {e}")
         traceback.print_exc()
         
-        # Update global state for error
         response_time = time.time() - start_time
         update_global_state(session_id, False, response_time)
         
-        return jsonify({
-            "success": False,
-            "error": f"Internal server error: {str(e)}",
-            "hand_detected": False,
-            "prediction": {
-                "letter": None,
-                "confidence": 0.0,
-                "label_index": None
-            },
-            "timestamp": datetime.now().isoformat()
-        }), 500
+        return prediction_error_response(f"Internal server error: {str(e)}", 500)
+
+def handle_stream(ws, session_id: str):
+    """
+    Serve one streaming connection
+
+    The receive loop only enqueues frames; a worker thread runs the shared
+    frame pipeline and pushes results back as they complete. When the client
+    sends faster than we can process, the oldest queued frame is dropped so
+    results always track the newest frame.
+
+    Messages from the client are either binary (raw JPEG bytes) or JSON text
+    (`{"frame": base64, "id": ...}`). Each result carries `seq` (server-side
+    frame counter) and `frame_id` (client id, if given). `fields` /
+    `landmarks=compact` query parameters of the connection URL apply to
+    every result.
+    """
+    pending = deque(maxlen=max(1, Config.STREAM_QUEUE_SIZE))
+    # Worker thread'inde request context yok - projeksiyon bağlantı açılırken okunur
+    fields, compact = request_response_format()
+    condition = threading.Condition()
+    state = {'closed': False, 'dropped': 0}
+
+    def worker():
+        while True:
+            with condition:
+                while not pending and not state['closed']:
+                    condition.wait()
+                if state['closed']:
+                    return
+                seq, frame_id, frame_payload, is_binary = pending.popleft()
+            
+            start_time = time.time()
+            timer = StageTimer()
+            try:
+                response, _ = run_frame_pipeline(frame_payload, is_binary, session_id, start_time, timer)
+            except Exception as e:
+                print(f"❌ Error in stream pipeline: {e}")
+                response_time = time.time() - start_time
+                update_global_state(session_id, False, response_time)
+                response = prediction_error_body(f"Internal server error: {str(e)}")
+            
+            response = dict(format_response(response, fields, compact),
+                            seq=seq, frame_id=frame_id, dropped_frames=state['dropped'])
+            payload = dumps(response).decode('utf-8')
+            timer.lap('serialization')
+            metrics.observe_request('stream', timer)
+            try:
+                ws.send(payload)
+            except Exception:
+                with condition:
+                    state['closed'] = True
+                return
+
+    worker_thread = threading.Thread(target=worker, name=f"stream-{session_id}", daemon=True)
+    worker_thread.start()
+
+    seq = 0
+    try:
+        while not state['closed']:
+            message = ws.receive()
+            if message is None:
+                break
+            
+            if isinstance(message, (bytes, bytearray)):
+                frame_id, frame_payload, is_binary = None, bytes(message), True
+            else:
+                try:
+                    data = json.loads(message)
+                except ValueError:
+                    continue
+                if not isinstance(data, dict) or 'frame' not in data:
+                    continue
+                frame_id, frame_payload, is_binary = data.get('id'), data['frame'], False
+            
+            seq += 1
+            with condition:
+                if len(pending) == pending.maxlen:
+                    state['dropped'] += 1
+                pending.append((seq, frame_id, frame_payload, is_binary))
+                condition.notify()
+    finally:
+        with condition:
+            state['closed'] = True
+            condition.notify()
+        worker_thread.join(timeout=5)
+
+if Sock is not None and Config.ENABLE_STREAMING:
+    sock = Sock(app)
+    # Açık stream'ler gthread thread'lerini tutar - limit HTTP istekleri için thread bırakır
+    STREAM_SLOTS = threading.BoundedSemaphore(max(1, Config.STREAM_MAX_CONNECTIONS))
+    metrics.describe('signdesk_stream_rejected_total', 'WebSocket handshakes rejected because the worker stream limit was reached.')
+
+    @app.before_request
+    def acquire_stream_slot():
+        """Reject stream handshakes over STREAM_MAX_CONNECTIONS with 503 (client falls back to HTTP)"""
+        if request.path != '/api/stream':
+            return None
+        if not STREAM_SLOTS.acquire(blocking=False):
+            metrics.inc('signdesk_stream_rejected_total')
+            return jsonify(prediction_error_body("Stream limit reached")), 503
+        g.stream_slot = True
+        return None
+
+    @app.teardown_request
+    def release_stream_slot(exc=None):
+        """Release the stream slot once the WebSocket handler has returned"""
+        if g.pop('stream_slot', False):
+            STREAM_SLOTS.release()
+
+    @sock.route('/api/stream')
+    def stream(ws):
+        """WebSocket streaming endpoint - client pushes frames, server pushes predictions"""
+        # Tarayıcı WebSocket API'si header gönderemez - session ID query parametresi ile gelir
+        session_id = request.args.get('session_id') or request.headers.get('X-Session-ID', 'unknown')
+        
+        if hand_detector is None or predictor is None:
+            ws.send(json.dumps(prediction_error_body("Services not initialized")))
+            return
+        
+        handle_stream(ws, session_id)
 
 @app.route('/api/redis/info', methods=['GET'])
 def get_redis_info():
@@ -666,11 +1529,36 @@ def get_redis_info():
 
 @app.route('/api/redis/sessions', methods=['GET'])
 def get_redis_sessions():
-    """Get all active sessions from Redis"""
-    session_ids = redis_manager.get_all_sessions()
+    """
+    Page through active sessions in Redis (SCAN cursor)
+
+    Query parameters: `cursor` (0 or absent starts from the beginning) and
+    `count` (SCAN COUNT hint, max 1000). Pages may be empty or contain
+    duplicates - iteration is complete when `next_cursor` is 0.
+    """
+    try:
+        cursor = max(0, int(request.args.get('cursor', 0)))
+        count = min(max(1, int(request.args.get('count', 100))), 1000)
+    except ValueError:
+        return jsonify({"success": False, "error": "cursor and count must be integers"}), 400
+    
+    next_cursor, session_ids = redis_manager.scan_sessions(cursor, count)
     return jsonify({
         "active_sessions": session_ids,
         "count": len(session_ids),
+        "cursor": cursor,
+        "next_cursor": next_cursor,
+        "complete": next_cursor == 0,
+        "timestamp": datetime.now().isoformat()
+    }), 200
+
+@app.route('/api/redis/expire-legacy-sessions', methods=['POST'])
+def expire_legacy_redis_sessions():
+    """One-time admin pass: give pre-index session keys without a TTL one (full SCAN)"""
+    expired = redis_manager.expire_legacy_sessions()
+    return jsonify({
+        "success": True,
+        "expired_keys": expired,
         "timestamp": datetime.now().isoformat()
     }), 200
 
@@ -679,6 +1567,101 @@ def get_global_state_endpoint():
     """Get global state information"""
     return jsonify(get_global_state()), 200
 
+def collect_metric_families() -> list:
+    """
+    Prometheus metric families of this worker
+
+    Stage/request histograms and detection counters come from `metrics`;
+    cache, motion gate, ROI, preprocessing and Redis counters are read from
+    the components' own stats at collection time.
+    """
+    families = metrics.collect()
+    
+    with STATE_LOCK:
+        requests_ok = GLOBAL_STATE['successful_requests']
+        requests_failed = GLOBAL_STATE['failed_requests']
+        cache_hits = GLOBAL_STATE['cache_hits']
+        cache_misses = GLOBAL_STATE['cache_misses']
+        active_sessions = len(GLOBAL_STATE['active_sessions'])
+    
+    families.append(counter_family('signdesk_requests_total', 'Prediction requests by outcome.',
+                                   [((('status', 'success'),), requests_ok), ((('status', 'failed'),), requests_failed)]))
+    families.append(counter_family('signdesk_frame_cache_lookups_total', 'Duplicate-frame cache lookups by result.',
+                                   [((('result', 'hit'),), cache_hits), ((('result', 'miss'),), cache_misses)]))
+    if feature_cache is not None:
+        stats = feature_cache.get_stats()
+        families.append(counter_family('signdesk_feature_cache_lookups_total', 'Landmark cache lookups by result.',
+                                       [((('result', 'hit'),), stats['hits']), ((('result', 'miss'),), stats['misses'])]))
+    if motion_gate is not None:
+        stats = motion_gate.get_stats()
+        families.append(counter_family('signdesk_motion_gate_frames_total', 'Frames checked by the motion gate by result.',
+                                       [((('result', 'skipped'),), stats['frames_skipped']),
+                                        ((('result', 'processed'),), stats['frames_checked'] - stats['frames_skipped'])]))
+    if hand_detector is not None:
+        stats = hand_detector.get_stats()
+        families.append(counter_family('signdesk_roi_frames_total', 'Frames detected inside a session ROI by result.',
+                                       [((('result', 'hit'),), stats['roi_hits']), ((('result', 'fallback'),), stats['roi_fallbacks'])]))
+        families.append(gauge_family('signdesk_detector_contexts', 'Live per-session MediaPipe trackers.',
+                                     [((), stats['active_contexts'])]))
+    if low_light is not None:
+        stats = low_light.get_stats()
+        families.append(counter_family('signdesk_low_light_frames_enhanced_total', 'Frames corrected by low-light preprocessing.',
+                                       [((), stats['frames_enhanced'])]))
+    if batch_scheduler is not None:
+        stats = batch_scheduler.get_stats()
+        families.append(histogram_family('signdesk_micro_batch_size', 'Feature rows per micro-batch classifier call.',
+                                         stats['batch_size']))
+        families.append(histogram_family('signdesk_micro_batch_wait_seconds', 'Time a request waited in the micro-batch queue.',
+                                         stats['wait_time_ms'], scale=0.001))
+    
+    redis_stats = redis_manager.get_stats()
+    families.append(counter_family('signdesk_redis_fallbacks_total', 'Redis calls served by the in-memory fallback (Redis unreachable).',
+                                   [((('operation', op),), count) for op, count in sorted(redis_stats['fallbacks'].items())]))
+    families.append(counter_family('signdesk_redis_errors_total', 'Redis commands that raised an error.',
+                                   [((('operation', op),), count) for op, count in sorted(redis_stats['errors'].items())]))
+    families.append(gauge_family('signdesk_redis_circuit_open', 'Redis circuit breaker state (1 = open, in-memory fallback).',
+                                 [((), 1 if redis_stats['circuit']['state'] == 'open' else 0)]))
+    families.append(counter_family('signdesk_redis_circuit_trips_total', 'Times the Redis circuit breaker opened.',
+                                   [((), redis_stats['circuit']['trips'])]))
+    
+    if session_writer is not None:
+        stats = session_writer.get_stats()
+        families.append(gauge_family('signdesk_session_write_queue_depth', 'Session history entries waiting for the write-behind flush.',
+                                     [((), stats['queue_depth'])]))
+        families.append(counter_family('signdesk_session_writes_total', 'Session history entries by outcome.',
+                                       [((('result', 'written'),), stats['written']), ((('result', 'dropped'),), stats['dropped'])]))
+    
+    families.append(gauge_family('signdesk_active_sessions', 'Sessions seen in the last hour by this worker.', [((), active_sessions)]))
+    memory = get_memory_usage()
+    families.append(gauge_family('signdesk_worker_rss_bytes', 'Resident set size of this worker.',
+                                 [((), int(memory.get('rss_mb', 0) * 1024 * 1024))]))
+    return families
+
+def render_metrics() -> str:
+    """
+    Prometheus exposition text - fleet-wide when the cluster aggregator is on
+
+    Counters and histogram buckets are the sum over all gunicorn workers
+    (pushed with the cluster-state flush), gauges carry a `worker` label.
+    Without Redis the scrape falls back to the answering worker's values.
+    """
+    families = collect_metric_families()
+    fleet = cluster_state.read_metrics(families) if cluster_state is not None else None
+    if fleet is None:
+        lines = render_families(families)
+        workers = 1
+    else:
+        counters, gauges, workers = fleet
+        lines = render_fleet(families, counters, gauges)
+    lines += render_gauge('signdesk_metrics_workers_reporting', 'Workers whose samples are included in this scrape.',
+                          [((), workers)])
+    return '\n'.join(lines) + '\n'
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Prometheus scrape endpoint"""
+    return app.response_class(render_metrics(), status=200, content_type='text/plain; version=0.0.4; charset=utf-8')
+
 @app.route('/api/session', methods=['GET'])
 def get_session_info():
     """Get session information"""
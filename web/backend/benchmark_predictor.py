@@ -0,0 +1,92 @@
+"""
+Benchmark script for SignLanguagePredictor
+Measures per-frame CPU time of the legacy two-pass inference
+(model.predict + model.predict_proba) against the single-pass predictor
+the compiled NumPy engine and the distilled student model.
+
+Usage:
+    python benchmark_predictor.py [model_path] [iterations]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+from config import Config
+from utils.predictor import SignLanguagePredictor
+
+# Configuration
+DEFAULT_ITERATIONS = 500
+WARMUP_ITERATIONS = 20
+
+def make_features(count: int) -> np.ndarray:
+    """Create synthetic 42-feature vectors in the normalized landmark range"""
+    rng = np.random.default_rng(42)
+    return rng.uniform(0.0, 0.3, size=(count, 42)).astype(np.float32)
+
+def time_per_frame(fn, samples: np.ndarray) -> float:
+    """Return mean CPU milliseconds per call of fn(row)"""
+    for row in samples[:WARMUP_ITERATIONS]:
+        fn(row)
+
+    start = time.process_time()
+    for row in samples:
+        fn(row)
+    return (time.process_time() - start) * 1000.0 / len(samples)
+
+def run_benchmark(model_path: str, iterations: int):
+    """Run legacy vs single-pass benchmark and print the results"""
+    print("\n" + "="*60)
+    print("⏱️  Predictor Benchmark")
+    print("="*60)
+    print(f"Model: {model_path}")
+    print(f"Iterations: {iterations}")
+
+    predictor = SignLanguagePredictor(model_path=model_path, labels_dict=Config.LABELS_DICT)
+    model = predictor.model
+    samples = make_features(iterations)
+
+    def legacy(row):
+        features_array = row.reshape(1, -1)
+        model.predict(features_array)
+        model.predict_proba(features_array)
+
+    def single_pass(row):
+        predictor.predict(row.tolist())
+
+    legacy_ms = time_per_frame(legacy, samples)
+    single_ms = time_per_frame(single_pass, samples)
+
+    print(f"Legacy (predict + predict_proba): {legacy_ms:.3f} ms/frame")
+    print(f"Single pass (predict_proba):      {single_ms:.3f} ms/frame")
+    if single_ms > 0:
+        print(f"Speedup: {legacy_ms / single_ms:.2f}x")
+
+    compiled_predictor = SignLanguagePredictor(model_path=model_path, labels_dict=Config.LABELS_DICT,
+                                               model_type='compiled')
+    if compiled_predictor.model_type == 'compiled':
+        compiled_ms = time_per_frame(lambda row: compiled_predictor.predict(row.tolist()), samples)
+        print(f"Compiled engine:                  {compiled_ms:.3f} ms/frame")
+        if compiled_ms > 0:
+            print(f"Speedup vs legacy: {legacy_ms / compiled_ms:.2f}x")
+
+    if os.path.exists(Config.STUDENT_MODEL_PATH):
+        student_predictor = SignLanguagePredictor(model_path=model_path, labels_dict=Config.LABELS_DICT,
+                                                  model_type='student',
+                                                  student_model_path=Config.STUDENT_MODEL_PATH)
+        student_ms = time_per_frame(lambda row: student_predictor.predict(row.tolist()), samples)
+        print(f"Student model:                    {student_ms:.3f} ms/frame")
+        if student_ms > 0:
+            print(f"Speedup vs legacy: {legacy_ms / student_ms:.2f}x")
+
+if __name__ == "__main__":
+    model_path = sys.argv[1] if len(sys.argv) > 1 else Config.MODEL_PATH
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_ITERATIONS
+
+    if not os.path.exists(model_path):
+        print(f"❌ Model file not found: {model_path}")
+        sys.exit(1)
+
+    run_benchmark(model_path, iterations)
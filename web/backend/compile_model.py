@@ -0,0 +1,57 @@
+"""
+Compile the pickled ensemble into the NumPy inference engine artifact
+
+Usage:
+    python compile_model.py [model_path] [output_path]
+
+Then run the backend with MODEL_TYPE=compiled.
+"""
+
+import os
+import pickle
+import sys
+
+import numpy as np
+
+from config import Config
+from utils.compiled_model import compile_model, check_parity
+
+# Parity check configuration
+PARITY_SAMPLES = 200
+
+def main(model_path: str, output_path: str) -> bool:
+    print("\n" + "="*60)
+    print("🛠️  Compiling model")
+    print("="*60)
+
+    if not os.path.exists(model_path):
+        print(f"❌ Model file not found: {model_path}")
+        return False
+
+    with open(model_path, 'rb') as f:
+        model = pickle.load(f)['model']
+    print(f"Model: {type(model).__name__} ({model_path})")
+
+    try:
+        compiled = compile_model(model)
+    except NotImplementedError as e:
+        print(f"❌ Model cannot be compiled: {e}")
+        return False
+
+    for component in compiled.components:
+        print(f"  - {component.kind}")
+
+    # Quick parity check on synthetic landmark features
+    rng = np.random.default_rng(0)
+    samples = rng.uniform(0.0, 0.3, size=(PARITY_SAMPLES, 42)).astype(np.float32)
+    parity = check_parity(model, compiled, samples)
+    print(f"Parity: max |Δp| = {parity['max_abs_diff']:.2e}, label agreement = {parity['label_agreement'] * 100:.2f}%")
+
+    compiled.save(output_path)
+    print(f"✅ Compiled model saved to {output_path} ({os.path.getsize(output_path) / 1024 / 1024:.1f} MB)")
+    return True
+
+if __name__ == "__main__":
+    model_path = sys.argv[1] if len(sys.argv) > 1 else Config.MODEL_PATH
+    output_path = sys.argv[2] if len(sys.argv) > 2 else Config.COMPILED_MODEL_PATH
+    sys.exit(0 if main(model_path, output_path) else 1)
@@ -15,9 +15,69 @@ class Config:
     
     # Model settings
     MODEL_PATH = os.getenv('MODEL_PATH', './models/combined_model.p')
+    MODEL_TYPE = os.getenv('MODEL_TYPE', 'sklearn')  # sklearn | compiled | student
+    COMPILED_MODEL_PATH = os.getenv('COMPILED_MODEL_PATH', './models/combined_model.npz')
+    STUDENT_MODEL_PATH = os.getenv('STUDENT_MODEL_PATH', './models/student_model.npz')  # train_classifier.py çıktısı
+    # Gunicorn master modeli bir kez yükler, worker'lar copy-on-write paylaşır
+    PRELOAD_MODEL = os.getenv('PRELOAD_MODEL', 'true').lower() in ('1', 'true', 'yes')
+    MMAP_MODEL = os.getenv('MMAP_MODEL', 'true').lower() in ('1', 'true', 'yes')  # compiled / student .npz read-only mmap
     MIN_DETECTION_CONFIDENCE = float(os.getenv('MIN_DETECTION_CONFIDENCE', 0.3))
     MIN_TRACKING_CONFIDENCE = float(os.getenv('MIN_TRACKING_CONFIDENCE', 0.5))
     MAX_NUM_HANDS = int(os.getenv('MAX_NUM_HANDS', 1))  # Tek el - performans optimizasyonu
+    PREDICTION_TOP_K = int(os.getenv('PREDICTION_TOP_K', 3))  # Yanıttaki alternatif harf sayısı (<=1 kapalı)
+    
+    # Landmark-space prediction cache (worker başına LRU)
+    ENABLE_FEATURE_CACHE = os.getenv('ENABLE_FEATURE_CACHE', 'true').lower() in ('1', 'true', 'yes')
+    FEATURE_CACHE_GRID = float(os.getenv('FEATURE_CACHE_GRID', 0.01))  # normalize landmark birimi
+    FEATURE_CACHE_SIZE = int(os.getenv('FEATURE_CACHE_SIZE', 1024))
+    FEATURE_CACHE_PROBE = int(os.getenv('FEATURE_CACHE_PROBE', 8))  # hücre kaçarsa son N girdiye mesafe kontrolü
+    
+    # Session-scoped hand tracking contexts (worker başına)
+    # Bellek limiti - aktif tracker sayısı (context başına ~50 MB). Session affinity yoksa her worker
+    # tüm session'ları görür; HTTP için nginx hash upstream'i kullanın (README: Session affinity)
+    DETECTOR_POOL_MAX_CONTEXTS = int(os.getenv('DETECTOR_POOL_MAX_CONTEXTS', 16))
+    DETECTOR_IDLE_TIMEOUT = float(os.getenv('DETECTOR_IDLE_TIMEOUT', 60.0))  # saniye
+    
+    # ROI crop - önceki el kutusunun etrafı kırpılarak MediaPipe'a verilir
+    ENABLE_ROI_CROP = os.getenv('ENABLE_ROI_CROP', 'true').lower() in ('1', 'true', 'yes')
+    ROI_EXPAND = float(os.getenv('ROI_EXPAND', 2.0))  # pencere kenarı / el kutusunun büyük kenarı
+    ROI_MIN_SIZE = int(os.getenv('ROI_MIN_SIZE', 96))  # piksel
+    ROI_MAX_AREA = float(os.getenv('ROI_MAX_AREA', 0.5))  # kare alanının bu oranından büyük pencere kullanılmaz
+    
+    # Motion gate - sabit karelerde MediaPipe + model atlanır (session başına)
+    ENABLE_MOTION_GATE = os.getenv('ENABLE_MOTION_GATE', 'true').lower() in ('1', 'true', 'yes')
+    MOTION_GATE_THRESHOLD = float(os.getenv('MOTION_GATE_THRESHOLD', 0.002))  # değişen piksel oranı
+    MOTION_GATE_PIXEL_THRESHOLD = int(os.getenv('MOTION_GATE_PIXEL_THRESHOLD', 12))  # gri seviye farkı (0-255)
+    MOTION_GATE_THUMBNAIL_WIDTH = int(os.getenv('MOTION_GATE_THUMBNAIL_WIDTH', 64))  # piksel
+    MOTION_GATE_MAX_SKIPS = int(os.getenv('MOTION_GATE_MAX_SKIPS', 10))  # ardışık atlama sonrası zorunlu işleme
+    MOTION_GATE_MAX_AGE = float(os.getenv('MOTION_GATE_MAX_AGE', 1.0))  # saniye
+    MOTION_GATE_MAX_SESSIONS = int(os.getenv('MOTION_GATE_MAX_SESSIONS', 256))
+    
+    # Warm-up - worker trafik almadan önce MediaPipe + model ilk çağrı maliyetini öder
+    ENABLE_WARMUP = os.getenv('ENABLE_WARMUP', 'true').lower() in ('1', 'true', 'yes')
+    WARMUP_IMAGES_DIR = os.getenv('WARMUP_IMAGES_DIR', '../../datarevorce')  # yoksa sentetik kareler
+    WARMUP_FRAMES = int(os.getenv('WARMUP_FRAMES', 8))
+    WARMUP_SPARE_DETECTORS = int(os.getenv('WARMUP_SPARE_DETECTORS', 1))  # ısıtılmış yedek tracker
+    
+    # Frame ingest settings (binary upload path)
+    MAX_FRAME_BYTES = int(os.getenv('MAX_FRAME_BYTES', 4 * 1024 * 1024))  # 4 MB
+    FRAME_BUFFER_SIZE = int(os.getenv('FRAME_BUFFER_SIZE', 256 * 1024))  # Başlangıç buffer boyutu
+    MAX_BATCH_SIZE = int(os.getenv('MAX_BATCH_SIZE', 64))  # /api/predict/batch için maksimum öğe
+    
+    # Decode - büyük JPEG'ler libjpeg içinde 1/2, 1/4, 1/8 ölçekle açılır
+    DECODE_TARGET_WIDTH = int(os.getenv('DECODE_TARGET_WIDTH', 640))  # 0 = her zaman tam çözünürlük
+    DECODE_RGB = os.getenv('DECODE_RGB', 'true').lower() in ('1', 'true', 'yes')  # OpenCV >= 4.10 gerekir
+    
+    # Cross-request micro-batching (threaded worker'larda anlamlı - sync worker'da kapalı kalsın)
+    ENABLE_MICRO_BATCHING = os.getenv('ENABLE_MICRO_BATCHING', 'false').lower() in ('1', 'true', 'yes')
+    MICRO_BATCH_MAX_SIZE = int(os.getenv('MICRO_BATCH_MAX_SIZE', 16))
+    MICRO_BATCH_MAX_WAIT_MS = float(os.getenv('MICRO_BATCH_MAX_WAIT_MS', 3.0))
+    
+    # Streaming (WebSocket) settings
+    ENABLE_STREAMING = os.getenv('ENABLE_STREAMING', 'true').lower() in ('1', 'true', 'yes')
+    STREAM_QUEUE_SIZE = int(os.getenv('STREAM_QUEUE_SIZE', 2))  # Bağlantı başına bekleyen kare (eskiler düşürülür)
+    # Worker başına açık stream - her stream bir gthread thread'ini tutar, kalanlar HTTP'ye kalır
+    STREAM_MAX_CONNECTIONS = int(os.getenv('STREAM_MAX_CONNECTIONS', max(1, int(os.getenv('GUNICORN_THREADS', 8)) // 4)))
     
     # Timing settings
     LETTER_CONFIRMATION_DELAY = float(os.getenv('LETTER_CONFIRMATION_DELAY', 3.0))
@@ -41,11 +101,45 @@ class Config:
     REDIS_SOCKET_TIMEOUT = int(os.getenv('REDIS_SOCKET_TIMEOUT', 5))
     REDIS_SOCKET_CONNECT_TIMEOUT = int(os.getenv('REDIS_SOCKET_CONNECT_TIMEOUT', 5))
     
+    # Redis değer formatı - msgpack (kuruluysa) veya json; eşiğin üstündeki değerler zlib ile sıkıştırılır
+    REDIS_SERIALIZER = os.getenv('REDIS_SERIALIZER', 'json')  # tüm worker'lar güncellenince 'msgpack'
+    REDIS_COMPRESS_THRESHOLD = int(os.getenv('REDIS_COMPRESS_THRESHOLD', 0))  # bayt, 0 = kapalı (msgpack ile 1024 önerilir)
+    
+    # Circuit breaker - bağlantı hatasında Redis atlanır, probe üstel backoff ile yeniden dener
+    REDIS_BREAKER_BASE_DELAY = float(os.getenv('REDIS_BREAKER_BASE_DELAY', 0.5))  # saniye - ilk deneme
+    REDIS_BREAKER_MAX_DELAY = float(os.getenv('REDIS_BREAKER_MAX_DELAY', 30.0))  # saniye - backoff üst sınırı
+    
     # Debug settings
     SAVE_DEBUG_FRAMES = os.getenv('SAVE_DEBUG_FRAMES', 'false').lower() in ('1', 'true', 'yes')
     DEBUG_FRAME_INTERVAL = int(os.getenv('DEBUG_FRAME_INTERVAL', 20))
-    ENABLE_PREPROCESSING = os.getenv('ENABLE_PREPROCESSING', 'false').lower() in ('1', 'true', 'yes')  # Performans için kapalı
+    
+    # Low-light preprocessing - parlaklık eşiğin altındaysa CLAHE + gamma (session başına karar)
+    ENABLE_PREPROCESSING = os.getenv('ENABLE_PREPROCESSING', 'true').lower() in ('1', 'true', 'yes')
     PREPROCESS_GAMMA = float(os.getenv('PREPROCESS_GAMMA', 1.3))  # >1.0 daha parlak
+    PREPROCESS_DARK_THRESHOLD = float(os.getenv('PREPROCESS_DARK_THRESHOLD', 90))  # ortalama parlaklık (0-255)
+    PREPROCESS_HYSTERESIS = float(os.getenv('PREPROCESS_HYSTERESIS', 10))  # karanlık moddan çıkış payı
+    PREPROCESS_CLAHE_CLIP = float(os.getenv('PREPROCESS_CLAHE_CLIP', 2.0))
+    PREPROCESS_CHECK_INTERVAL = int(os.getenv('PREPROCESS_CHECK_INTERVAL', 10))  # kare - parlaklık ölçüm aralığı
+    PREPROCESS_MAX_SESSIONS = int(os.getenv('PREPROCESS_MAX_SESSIONS', 256))  # worker başına (LRU)
+    
+    # Server-Timing header + debug header ile istenen request trace'leri (JSONL, boyuta göre döner)
+    ENABLE_SERVER_TIMING = os.getenv('ENABLE_SERVER_TIMING', 'true').lower() in ('1', 'true', 'yes')
+    ENABLE_REQUEST_TRACE = os.getenv('ENABLE_REQUEST_TRACE', 'true').lower() in ('1', 'true', 'yes')
+    TRACE_HEADER = os.getenv('TRACE_HEADER', 'X-Debug-Trace')  # değeri 1/true olan istekler trace'lenir
+    TRACE_FILE = os.getenv('TRACE_FILE', 'logs/request_trace-{pid}.jsonl')  # {pid} - worker başına dosya
+    TRACE_MAX_BYTES = int(os.getenv('TRACE_MAX_BYTES', 10 * 1024 * 1024))
+    TRACE_BACKUP_COUNT = int(os.getenv('TRACE_BACKUP_COUNT', 3))
+    
+    # Session geçmişi write-behind - tahmin geçmişi kuyruğa, arka plan thread'i toplu yazar
+    ENABLE_WRITE_BEHIND = os.getenv('ENABLE_WRITE_BEHIND', 'true').lower() in ('1', 'true', 'yes')
+    WRITE_BEHIND_MAX_PENDING = int(os.getenv('WRITE_BEHIND_MAX_PENDING', 10000))  # dolunca en eski kayıt atılır
+    WRITE_BEHIND_FLUSH_INTERVAL = float(os.getenv('WRITE_BEHIND_FLUSH_INTERVAL', 0.05))  # saniye
+    WRITE_BEHIND_BATCH_SIZE = int(os.getenv('WRITE_BEHIND_BATCH_SIZE', 500))  # bu derinlikte erken flush
+    
+    # Cluster geneli global state - worker sayaçları Redis'e toplu (pipeline) flush edilir
+    ENABLE_CLUSTER_STATE = os.getenv('ENABLE_CLUSTER_STATE', 'true').lower() in ('1', 'true', 'yes')
+    CLUSTER_STATE_FLUSH_INTERVAL = float(os.getenv('CLUSTER_STATE_FLUSH_INTERVAL', 1.0))  # saniye
+    CLUSTER_SESSION_WINDOW = int(os.getenv('CLUSTER_SESSION_WINDOW', 3600))  # saniye - aktif session penceresi
     
     @staticmethod
     def validate():
@@ -1,6 +1,7 @@
 # Gunicorn Configuration for Sign Language Backend
 # Bu dosya performans optimizasyonu için Gunicorn ayarlarını içerir
 
+import gc
 import multiprocessing
 import os
 
@@ -8,10 +9,20 @@ import os
 bind = f"0.0.0.0:{os.getenv('PORT', '5001')}"
 backlog = 2048
 
-# Worker processes - Gevent sorunları için geçici sync
-workers = 8  # sync worker için daha fazla worker
-worker_class = "sync"  # Geçici olarak sync (gevent yerine)
+# Worker processes
+workers = int(os.getenv('GUNICORN_WORKERS', 8))
+# Worker'lar portu paylaşır, istekler session'dan bağımsız dağılır. Session başına tracker /
+# motion gate / low-light durumu için session affinity: GUNICORN_WORKERS=1 ile birden fazla
+# instance + nginx `hash` upstream'i (bkz. web/frontend/nginx.conf)
+# gthread: WebSocket stream'leri (/api/stream) worker'ı değil bir thread'i tutar.
+# sync worker'da her bağlantı bütün worker'ı bloklar ve stream'ler timeout'ta öldürülür.
+worker_class = "gthread"
+threads = int(os.getenv('GUNICORN_THREADS', 8))  # Worker başına eşzamanlı istek / stream
+# Açık stream'ler thread'leri tutar; STREAM_MAX_CONNECTIONS (varsayılan threads // 4) üstündeki
+# handshake'ler 503 alır ve istemci HTTP'ye döner - kalan thread'ler HTTP isteklerine kalır
 worker_connections = 1000
+# gthread'de timeout sadece worker'ın ana döngüsünün kilitlenmesini yakalar;
+# uzun süren stream'ler bu süreye takılmaz
 timeout = 30
 keepalive = 2
 
@@ -40,7 +51,9 @@ tmp_upload_dir = None
 # certfile = None
 
 # Performance tuning
-preload_app = False  # Her worker kendi servisleri başlatsın
+preload_app = False  # Her worker kendi servisleri başlatsın (MediaPipe fork-safe değil)
+# Model ise on_starting'de master'da bir kez yüklenir (PRELOAD_MODEL) ve worker'lar
+# copy-on-write / read-only mmap ile paylaşır
 # worker_tmp_dir = "/dev/shm"  # RAM disk kullan (Linux) - Windows'ta çalışmaz
 
 # Graceful timeout
@@ -52,6 +65,26 @@ raw_env = [
     'PYTHONPATH=/opt/signdesk/backend',
 ]
 
+def on_starting(server):
+    """Master başlarken çalışır - modeli fork'tan önce bir kez yükle"""
+    from config import Config
+    if not Config.PRELOAD_MODEL:
+        return
+
+    try:
+        # app değil - Redis bağlantısı, probe thread'i ve MediaPipe master'da açılmasın
+        from utils.model_loader import preload_model
+        from utils.memory import get_memory_usage, format_memory_usage
+        if preload_model():
+            # Preload edilen nesneleri GC taramasından çıkar - worker'larda
+            # refcount/GC yazıları paylaşılan sayfaları kopyalatmasın
+            gc.freeze()
+            server.log.info(f"✅ Model preloaded in master ({format_memory_usage(get_memory_usage())})")
+        else:
+            server.log.warning("⚠️ Model not preloaded - each worker loads its own copy")
+    except Exception as e:
+        server.log.error(f"❌ Failed to preload model: {e}")
+
 def when_ready(server):
     """Server hazır olduğunda çalışır"""
     server.log.info("🚀 Sign Language Backend server is ready!")
@@ -71,8 +104,12 @@ def post_fork(server, worker):
     # Import app ve servisleri başlat
     try:
         from app import initialize_services
+        from utils.memory import get_memory_usage, format_memory_usage
+        memory_before = format_memory_usage(get_memory_usage())
         if initialize_services():
             server.log.info(f"✅ Worker ready with services loaded (pid: {worker.pid})")
+            server.log.info(f"📊 Worker memory (pid: {worker.pid}): before init {memory_before}, "
+                            f"after init {format_memory_usage(get_memory_usage())}")
         else:
             server.log.error(f"❌ Worker started but services failed to load (pid: {worker.pid})")
     except Exception as e:
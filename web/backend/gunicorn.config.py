@@ -9,9 +9,19 @@ bind = f"0.0.0.0:{os.getenv('PORT', '5001')}"
 backlog = 2048
 
 # Worker processes
-workers = min(multiprocessing.cpu_count() * 2 + 1, 8)  # Maksimum 8 worker
-worker_class = "sync"
+workers = int(os.getenv('GUNICORN_WORKERS', min(multiprocessing.cpu_count() * 2 + 1, 8)))  # Maksimum 8 worker
+# Worker'lar portu paylaşır, istekler session'dan bağımsız dağılır. Session başına tracker /
+# motion gate / low-light durumu için session affinity: GUNICORN_WORKERS=1 ile birden fazla
+# instance + nginx `hash` upstream'i (bkz. web/frontend/nginx.conf)
+# gthread: WebSocket stream'leri (/api/stream) worker'ı değil bir thread'i tutar.
+# sync worker'da her bağlantı bütün worker'ı bloklar ve stream'ler timeout'ta öldürülür.
+worker_class = "gthread"
+threads = int(os.getenv('GUNICORN_THREADS', 8))  # Worker başına eşzamanlı istek / stream
+# Açık stream'ler thread'leri tutar; STREAM_MAX_CONNECTIONS (varsayılan threads // 4) üstündeki
+# handshake'ler 503 alır ve istemci HTTP'ye döner - kalan thread'ler HTTP isteklerine kalır
 worker_connections = 1000
+# gthread'de timeout sadece worker'ın ana döngüsünün kilitlenmesini yakalar;
+# uzun süren stream'ler bu süreye takılmaz
 timeout = 30
 keepalive = 2
 
@@ -29,6 +29,7 @@ def test_health_check():
         if response.status_code == 200:
             data = response.json()
             if data['status'] == 'healthy':
+                print(f"Ready: {data.get('ready')} | Warm-up: {data.get('warmup', {}).get('duration_ms')} ms")
                 print("✅ Health check passed!")
                 return True
             else:
@@ -185,6 +186,99 @@ def test_predict_with_webcam():
         print(f"❌ Error: {e}")
         return False
 
+def test_predict_landmarks():
+    """Test /api/predict/landmarks endpoint with synthetic landmarks"""
+    print("\n" + "="*60)
+    print("✋ Testing Landmark Predict Endpoint")
+    print("="*60)
+    
+    try:
+        # 21 synthetic landmark points (normalized 0..1)
+        landmarks = [{"x": 0.4 + 0.01 * i, "y": 0.6 - 0.015 * i, "z": 0.0} for i in range(21)]
+        
+        start_time = time.time()
+        response = requests.post(
+            f"{API_BASE_URL}/api/predict/landmarks",
+            json={"landmarks": landmarks},
+            timeout=TIMEOUT
+        )
+        elapsed_time = time.time() - start_time
+        
+        print(f"Status Code: {response.status_code}")
+        print(f"Response Time: {elapsed_time:.3f}s")
+        
+        if response.status_code == 200:
+            data = response.json()
+            print(f"Prediction: {data['prediction']}")
+            print("✅ Landmark predict endpoint working!")
+            return True
+        else:
+            print(f"❌ Landmark predict endpoint failed: {response.json()}")
+            return False
+            
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return False
+
+def test_metrics():
+    """Test /metrics endpoint (Prometheus text format)"""
+    print("\n" + "="*60)
+    print("📊 Testing Metrics Endpoint")
+    print("="*60)
+    
+    try:
+        response = requests.get(f"{API_BASE_URL}/metrics", timeout=TIMEOUT)
+        print(f"Status Code: {response.status_code}")
+        
+        if response.status_code == 200 and 'signdesk_requests_total' in response.text:
+            stages = sorted({line.split('stage="')[1].split('"')[0]
+                             for line in response.text.splitlines()
+                             if line.startswith('signdesk_stage_duration_seconds_count')})
+            print(f"Stages: {', '.join(stages) or '-'}")
+            workers = [line.split()[-1] for line in response.text.splitlines()
+                       if line.startswith('signdesk_metrics_workers_reporting')]
+            print(f"Workers reporting: {workers[0] if workers else '-'}")
+            print("✅ Metrics endpoint working!")
+            return True
+        else:
+            print("❌ Metrics endpoint failed")
+            return False
+            
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return False
+
+def test_server_timing():
+    """Test Server-Timing header and debug trace on /api/predict/landmarks"""
+    print("\n" + "="*60)
+    print("⏱️ Testing Server-Timing / Debug Trace")
+    print("="*60)
+    
+    try:
+        landmarks = [{"x": 0.4 + 0.01 * i, "y": 0.6 - 0.015 * i, "z": 0.0} for i in range(21)]
+        response = requests.post(
+            f"{API_BASE_URL}/api/predict/landmarks",
+            json={"landmarks": landmarks},
+            headers={"X-Session-ID": "test-trace", "X-Debug-Trace": "1"},
+            timeout=TIMEOUT
+        )
+        
+        server_timing = response.headers.get('Server-Timing', '')
+        print(f"Status Code: {response.status_code}")
+        print(f"Server-Timing: {server_timing or '-'}")
+        print(f"X-Trace-ID: {response.headers.get('X-Trace-ID', '-')}")
+        
+        if response.status_code == 200 and 'total;dur=' in server_timing:
+            print("✅ Server-Timing header present!")
+            return True
+        else:
+            print("❌ Server-Timing header missing")
+            return False
+            
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return False
+
 def test_invalid_request():
     """Test API with invalid request"""
     print("\n" + "="*60)
@@ -239,6 +333,9 @@ def run_all_tests():
         "Labels": test_labels(),
         "Predict (Dummy)": test_predict_with_dummy_image(),
         "Predict (Webcam)": test_predict_with_webcam(),
+        "Predict (Landmarks)": test_predict_landmarks(),
+        "Metrics": test_metrics(),
+        "Server-Timing": test_server_timing(),
         "Invalid Requests": test_invalid_request()
     }
     
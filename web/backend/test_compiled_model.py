@@ -0,0 +1,129 @@
+"""
+Parity tests for the compiled NumPy inference engine
+Compares every compiled base estimator and the full ensemble against the
+original sklearn / LightGBM model.
+
+Run: python test_compiled_model.py [model_path] [data_pickle]
+"""
+
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from config import Config
+from utils.compiled_model import CompiledEnsemble, compile_estimator, compile_model, check_parity
+
+# Configuration
+PROBA_TOLERANCE = 1e-2     # SVC coupling is solved exactly; libsvm stops at 0.005 / n_classes
+MIN_LABEL_AGREEMENT = 0.99
+SYNTHETIC_SAMPLES = 500
+DATA_PICKLE_PATH = '../../data.pickle'
+
+def load_samples(data_path: str) -> np.ndarray:
+    """Real landmark features from data.pickle when available, plus synthetic ones"""
+    rng = np.random.default_rng(7)
+    samples = [rng.uniform(0.0, 0.3, size=(SYNTHETIC_SAMPLES, 42))]
+    if os.path.exists(data_path):
+        with open(data_path, 'rb') as f:
+            data = np.asarray(pickle.load(f)['data'], dtype=np.float64)
+        samples.append(data[:, :42])
+        print(f"Using {len(data)} samples from {data_path}")
+    return np.vstack(samples).astype(np.float32)
+
+def report(name: str, parity: dict, strict: bool = True) -> bool:
+    """Print one parity result and return pass/fail"""
+    passed = parity['label_agreement'] >= MIN_LABEL_AGREEMENT
+    if strict:
+        passed = passed and parity['max_abs_diff'] <= PROBA_TOLERANCE
+    status = "✅" if passed else "❌"
+    print(f"{status} {name}: max |Δp| = {parity['max_abs_diff']:.2e}, "
+          f"label agreement = {parity['label_agreement'] * 100:.2f}% ({parity['samples']} samples)")
+    return passed
+
+def check_estimators(model, samples: np.ndarray) -> bool:
+    """Parity of each base estimator"""
+    print("\n" + "="*60)
+    print("🧩 Testing base estimators")
+    print("="*60)
+
+    estimators = getattr(model, 'estimators_', None) if type(model).__name__ == 'VotingClassifier' else [model]
+    results = []
+    for estimator in estimators:
+        compiled = CompiledEnsemble([compile_estimator(estimator)], None, estimator.classes_)
+        parity = check_parity(estimator, compiled, samples)
+        results.append(report(type(estimator).__name__, parity))
+    return all(results)
+
+def check_ensemble(model, samples: np.ndarray) -> bool:
+    """Parity of the full soft-voting ensemble"""
+    print("\n" + "="*60)
+    print("🗳️  Testing full ensemble")
+    print("="*60)
+
+    compiled = compile_model(model)
+    return report("Ensemble", check_parity(model, compiled, samples))
+
+def check_save_load(model, samples: np.ndarray) -> bool:
+    """Saved artifact must reproduce the in-memory compiled model exactly"""
+    print("\n" + "="*60)
+    print("💾 Testing save / load round-trip")
+    print("="*60)
+
+    compiled = compile_model(model)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'model.npz')
+        compiled.save(path)
+        loaded = CompiledEnsemble.load(path)
+
+    identical = np.array_equal(compiled.predict_proba(samples), loaded.predict_proba(samples))
+    print(f"{'✅' if identical else '❌'} Round-trip output identical: {identical}")
+    return identical
+
+def check_single_row_latency(model, samples: np.ndarray) -> bool:
+    """Report single-row latency of both engines (informational)"""
+    print("\n" + "="*60)
+    print("⏱️  Single-row latency")
+    print("="*60)
+
+    compiled = compile_model(model)
+    rows = samples[:200]
+    for name, engine in (("sklearn", model), ("compiled", compiled)):
+        start = time.perf_counter()
+        for row in rows:
+            engine.predict_proba(row.reshape(1, -1))
+        elapsed = (time.perf_counter() - start) * 1000.0 / len(rows)
+        print(f"{name}: {elapsed:.3f} ms/row")
+    return True
+
+def run_all_tests(model_path: str, data_path: str):
+    with open(model_path, 'rb') as f:
+        model = pickle.load(f)['model']
+    samples = load_samples(data_path)
+
+    results = {
+        "Base estimators": check_estimators(model, samples),
+        "Ensemble": check_ensemble(model, samples),
+        "Save / load": check_save_load(model, samples),
+        "Latency": check_single_row_latency(model, samples),
+    }
+
+    print("\n" + "="*60)
+    print("📊 TEST SUMMARY")
+    print("="*60)
+    for test_name, result in results.items():
+        print(f"{test_name}: {'✅ PASSED' if result else '❌ FAILED'}")
+    return all(results.values())
+
+if __name__ == "__main__":
+    model_path = sys.argv[1] if len(sys.argv) > 1 else Config.MODEL_PATH
+    data_path = sys.argv[2] if len(sys.argv) > 2 else DATA_PICKLE_PATH
+
+    if not os.path.exists(model_path):
+        print(f"❌ Model file not found: {model_path}")
+        sys.exit(1)
+
+    sys.exit(0 if run_all_tests(model_path, data_path) else 1)
@@ -1,4 +1,15 @@
-from .hand_detector import HandDetector
-from .predictor import SignLanguagePredictor
+# Paket import'u hafif kalsın - gunicorn master'ı (on_starting) utils.model_loader'ı
+# import ederken MediaPipe yüklenmesin; sınıflar ilk erişimde import edilir
+_EXPORTS = {
+    'HandDetector': '.hand_detector',
+    'SignLanguagePredictor': '.predictor',
+    'HandDetectorPool': '.detector_pool',
+}
 
-__all__ = ['HandDetector', 'SignLanguagePredictor']
\ No newline at end of file
+__all__ = ['HandDetector', 'SignLanguagePredictor', 'HandDetectorPool']
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    return getattr(import_module(_EXPORTS[name], __name__), name)
\ No newline at end of file
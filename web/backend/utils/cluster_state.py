@@ -0,0 +1,200 @@
+"""
+Fleet-wide request counters across Gunicorn workers
+
+Each worker keeps counting into its own GLOBAL_STATE exactly as before. A
+background thread periodically takes a snapshot, sends the difference to the
+last flushed snapshot to Redis as one pipelined batch (HINCRBY /
+HINCRBYFLOAT on a shared hash, ZADD of recently active session IDs) and
+records the worker's heartbeat. The predict path never waits on Redis or on
+another process; fleet totals lag by at most one flush interval.
+
+Worker restarts (max_requests) are harmless: the new process starts from a
+zero snapshot, and the exiting one flushes its remainder at exit.
+
+The same batch carries the worker's Prometheus samples: counter and
+histogram bucket increments are summed in one Redis hash, gauges are stored
+per worker. `/metrics` then reports the whole fleet no matter which worker
+answers the scrape.
+"""
+
+import atexit
+import os
+import socket
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .metrics import Family, flatten_families
+
+# Hash'te toplanan sayaçlar (HINCRBY); total_response_time float (HINCRBYFLOAT)
+CLUSTER_COUNTERS = ('total_requests', 'successful_requests', 'failed_requests',
+                    'cache_hits', 'cache_misses')
+CLUSTER_FLOAT_COUNTERS = ('total_response_time',)
+
+Snapshot = Tuple[Dict[str, float], Dict[str, float]]
+
+class ClusterStateAggregator:
+    """
+    Batched push of worker counters to Redis and fleet-wide read-back
+
+    `snapshot` is supplied by the app: it returns the worker's cumulative
+    counters and the sessions active since the previous call
+    ({session_id: last_activity}), clearing the latter. The optional
+    `metrics_snapshot` returns the worker's Prometheus metric families.
+    """
+
+    def __init__(self, redis_manager, snapshot: Callable[[], Snapshot],
+                 flush_interval: float = 1.0, session_window: int = 3600,
+                 metrics_snapshot: Optional[Callable[[], List[Family]]] = None):
+        """
+        Initialize aggregator
+
+        Args:
+            redis_manager: RedisManager used for the pipelined writes/reads
+            snapshot: Callable returning (cumulative counters, newly active sessions)
+            flush_interval: Seconds between flushes
+            session_window: Seconds a session counts as active
+            metrics_snapshot: Callable returning this worker's metric families (None = counters only)
+        """
+        self.redis_manager = redis_manager
+        self.snapshot = snapshot
+        self.metrics_snapshot = metrics_snapshot
+        self.flush_interval = max(0.1, flush_interval)
+        self.session_window = session_window
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+
+        self._flushed = {name: 0 for name in CLUSTER_COUNTERS + CLUSTER_FLOAT_COUNTERS}
+        self._flushed_metrics: Dict[str, float] = {}
+        self._pending_sessions: Dict[str, float] = {}
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._stats = {'flushes': 0, 'failed_flushes': 0, 'sessions_flushed': 0}
+
+    def start(self):
+        """Start the background flush thread"""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="cluster-state-flush", daemon=True)
+        self._thread.start()
+        # Worker kapanırken (max_requests restart) son farkı kaybetme
+        atexit.register(self.stop)
+
+    def stop(self):
+        """Stop the flush thread and push what is left"""
+        self._stop.set()
+        self.flush()
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def pending_deltas(self, counters: Dict[str, float], flushed: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+        """Counter increments not yet pushed to Redis (against `flushed`, default: last flush)"""
+        flushed = self._flushed if flushed is None else flushed
+        return {name: counters.get(name, 0) - flushed[name] for name in flushed}
+
+    def pending_metric_deltas(self, samples: Dict[str, float], flushed: Optional[Dict[str, float]] = None) -> Dict[str, float]:
+        """Metric sample increments not yet pushed to Redis (zero deltas left out)"""
+        flushed = self._flushed_metrics if flushed is None else flushed
+        deltas = {}
+        for field, value in samples.items():
+            delta = value - flushed.get(field, 0)
+            if delta:
+                deltas[field] = delta
+        return deltas
+
+    def _collect_metrics(self) -> Tuple[Dict[str, float], Dict[str, float]]:
+        if self.metrics_snapshot is None:
+            return {}, {}
+        return flatten_families(self.metrics_snapshot(), self.worker_id)
+
+    def flush(self) -> bool:
+        """
+        Push counter deltas, metric samples and active sessions in one Redis round-trip
+
+        Returns:
+            True if Redis accepted the batch (on failure the deltas carry over)
+        """
+        with self._flush_lock:
+            counters, sessions = self.snapshot()
+            metric_samples, metric_gauges = self._collect_metrics()
+            self._pending_sessions.update(sessions)
+            deltas = self.pending_deltas(counters)
+            metric_deltas = self.pending_metric_deltas(metric_samples)
+            # Metrikler açıksa her aralıkta flush - gauge'lar ve heartbeat taze kalsın
+            if (self.metrics_snapshot is None and not any(deltas.values())
+                    and not self._pending_sessions):
+                return True
+
+            ok = self.redis_manager.incr_global_state(
+                deltas, self._pending_sessions, self.worker_id, self.session_window,
+                metric_deltas=metric_deltas,
+                metric_gauges=metric_gauges if self.metrics_snapshot is not None else None)
+            if ok:
+                self._flushed = {name: counters.get(name, 0) for name in self._flushed}
+                self._flushed_metrics = metric_samples
+                self._stats['flushes'] += 1
+                self._stats['sessions_flushed'] += len(self._pending_sessions)
+                self._pending_sessions = {}
+            else:
+                self._stats['failed_flushes'] += 1
+                # Redis uzun süre kapalıysa bekleyen session listesi sınırsız büyümesin
+                if len(self._pending_sessions) > 10000:
+                    self._pending_sessions.clear()
+            return ok
+
+    def read(self, local_counters: Optional[Dict[str, float]] = None) -> Optional[Dict]:
+        """
+        Read fleet-wide totals
+
+        Args:
+            local_counters: This worker's current counters; their unflushed part
+                is added so a worker always sees its own latest requests
+
+        Returns:
+            Dictionary with the summed counters, `active_sessions` and
+            `workers_reporting`, or None when Redis is unavailable
+        """
+        # Redis okuması ve flush edilmiş kopya aynı kilit altında - arada flush olursa fark iki kez sayılmasın
+        with self._flush_lock:
+            cluster = self.redis_manager.get_global_state(self.session_window, self.flush_interval * 5)
+            flushed = dict(self._flushed)
+        if cluster is None:
+            return None
+        if local_counters is not None:
+            for name, delta in self.pending_deltas(local_counters, flushed).items():
+                cluster[name] = cluster.get(name, 0) + delta
+        return cluster
+
+    def read_metrics(self, families: Optional[List[Family]] = None) -> Optional[Tuple[Dict[str, float], Dict[str, float], int]]:
+        """
+        Read fleet-wide Prometheus samples
+
+        Args:
+            families: This worker's current metric families; their unflushed
+                increments are added (gauges lag by at most one flush)
+
+        Returns:
+            Tuple of (summed samples, live workers' gauges, workers reporting),
+            or None when Redis is unavailable
+        """
+        with self._flush_lock:
+            fleet = self.redis_manager.get_global_metrics(self.flush_interval * 5)
+            flushed = dict(self._flushed_metrics)
+        if fleet is None:
+            return None
+        counters, gauges, workers = fleet
+        if families is not None:
+            samples, _ = flatten_families(families, self.worker_id)
+            for field, delta in self.pending_metric_deltas(samples, flushed).items():
+                counters[field] = counters.get(field, 0) + delta
+        return counters, gauges, workers
+
+    def get_stats(self) -> Dict:
+        """Get aggregator metrics"""
+        with self._flush_lock:
+            stats = dict(self._stats)
+            stats['pending_sessions'] = len(self._pending_sessions)
+        stats['worker_id'] = self.worker_id
+        stats['flush_interval'] = self.flush_interval
+        return stats
@@ -0,0 +1,820 @@
+"""
+Compiled NumPy inference engine for the trained ensemble
+
+`compile_model` turns the fitted VotingClassifier produced by
+train_classifier.py (or any one of its supported base estimators) into flat
+arrays: tree ensembles become node arrays walked for all trees at once, KNN
+keeps its training matrix with precomputed norms, and the SVM keeps its
+support vectors with a precomputed one-vs-one coefficient matrix.
+`CompiledEnsemble` runs on numpy alone - sklearn and LightGBM are only
+needed at compile time.
+"""
+
+import json
+import struct
+import zipfile
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+FORMAT_VERSION = 1
+
+# LightGBM missing_type kodları
+MISSING_NONE = 0
+MISSING_ZERO = 1
+MISSING_NAN = 2
+LGBM_ZERO_THRESHOLD = 1e-35
+
+# libsvm sabitleri
+SVM_MIN_PROB = 1e-7
+
+# ZIP local file header: imza + sabit alanlar (30 byte), ardından dosya adı ve extra alan
+_ZIP_LOCAL_HEADER = struct.Struct('<4s2B4HL2L2H')
+_ZIP_LOCAL_SIGNATURE = b'PK\x03\x04'
+
+def mmap_npz(path: str) -> Dict[str, np.ndarray]:
+    """
+    Memory-map every array of an uncompressed .npz archive read-only
+
+    np.load cannot mmap members of a zip, but `np.savez` stores them
+    uncompressed, so each member is a plain .npy file at a fixed offset.
+    Mapped pages live in the page cache and are shared by every process
+    that maps the same file (e.g. all gunicorn workers).
+
+    Args:
+        path: Path to the .npz archive
+
+    Returns:
+        Dictionary of read-only arrays (compressed or empty members are read normally)
+    """
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, 'rb') as f:
+        for info in archive.infolist():
+            name = info.filename[:-4] if info.filename.endswith('.npy') else info.filename
+
+            if info.compress_type != zipfile.ZIP_STORED:
+                with archive.open(info) as member:
+                    arrays[name] = np.lib.format.read_array(member, allow_pickle=False)
+                continue
+
+            f.seek(info.header_offset)
+            header = _ZIP_LOCAL_HEADER.unpack(f.read(_ZIP_LOCAL_HEADER.size))
+            if header[0] != _ZIP_LOCAL_SIGNATURE:
+                raise ValueError(f"Corrupt archive member: {info.filename}")
+            name_length, extra_length = header[-2], header[-1]
+            f.seek(info.header_offset + _ZIP_LOCAL_HEADER.size + name_length + extra_length)
+
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            if dtype.hasobject:
+                raise ValueError(f"Object arrays are not supported: {info.filename}")
+
+            count = int(np.prod(shape))
+            if count == 0:
+                arrays[name] = np.empty(shape, dtype=dtype)
+                continue
+            arrays[name] = np.memmap(f.name, dtype=dtype, mode='r', offset=f.tell(), shape=shape,
+                                     order='F' if fortran_order else 'C')
+    return arrays
+
+def _softmax(x: np.ndarray) -> np.ndarray:
+    """Row-wise softmax"""
+    x = x - x.max(axis=1, keepdims=True)
+    np.exp(x, out=x)
+    x /= x.sum(axis=1, keepdims=True)
+    return x
+
+class _TreeArrays:
+    """
+    Flat node arrays for many trees
+
+    Leaves point to themselves (left == right == own index), so every tree can
+    be walked for exactly `max_depth` steps with no per-node branching.
+    """
+
+    def __init__(self, roots, left, right, feature, threshold, max_depth,
+                 default_left=None, missing_type=None):
+        self.roots = np.asarray(roots, dtype=np.int64)
+        self.left = np.asarray(left, dtype=np.int64)
+        self.right = np.asarray(right, dtype=np.int64)
+        self.feature = np.asarray(feature, dtype=np.int64)
+        self.threshold = np.asarray(threshold, dtype=np.float64)
+        self.max_depth = int(max_depth)
+        self.default_left = None if default_left is None else np.asarray(default_left, dtype=bool)
+        self.missing_type = None if missing_type is None else np.asarray(missing_type, dtype=np.int8)
+
+    def apply(self, X: np.ndarray) -> np.ndarray:
+        """
+        Find the leaf reached by every sample in every tree
+
+        Args:
+            X: (N, n_features) array
+
+        Returns:
+            (N, n_trees) array of node indices
+        """
+        n_samples = X.shape[0]
+        rows = np.arange(n_samples)[:, None]
+        node = np.repeat(self.roots[None, :], n_samples, axis=0)
+
+        for _ in range(self.max_depth):
+            values = X[rows, self.feature[node]]
+            if self.missing_type is None:
+                go_left = values <= self.threshold[node]
+            else:
+                go_left = self._lightgbm_decision(values, node)
+            node = np.where(go_left, self.left[node], self.right[node])
+
+        return node
+
+    def _lightgbm_decision(self, values: np.ndarray, node: np.ndarray) -> np.ndarray:
+        """LightGBM NumericalDecision with zero / NaN missing-value handling"""
+        missing_type = self.missing_type[node]
+        is_nan = np.isnan(values)
+        values = np.where(is_nan & (missing_type != MISSING_NAN), 0.0, values)
+        use_default = (
+            ((missing_type == MISSING_ZERO) & (np.abs(values) <= LGBM_ZERO_THRESHOLD)) |
+            ((missing_type == MISSING_NAN) & is_nan)
+        )
+        with np.errstate(invalid='ignore'):
+            go_left = values <= self.threshold[node]
+        return np.where(use_default, self.default_left[node], go_left)
+
+    def get_state(self, prefix: str) -> Tuple[Dict, Dict[str, np.ndarray]]:
+        params = {'max_depth': self.max_depth}
+        arrays = {
+            f'{prefix}roots': self.roots,
+            f'{prefix}left': self.left,
+            f'{prefix}right': self.right,
+            f'{prefix}feature': self.feature,
+            f'{prefix}threshold': self.threshold,
+        }
+        if self.missing_type is not None:
+            arrays[f'{prefix}default_left'] = self.default_left
+            arrays[f'{prefix}missing_type'] = self.missing_type
+        return params, arrays
+
+    @classmethod
+    def from_state(cls, prefix: str, params: Dict, arrays: Dict[str, np.ndarray]) -> '_TreeArrays':
+        return cls(
+            roots=arrays[f'{prefix}roots'],
+            left=arrays[f'{prefix}left'],
+            right=arrays[f'{prefix}right'],
+            feature=arrays[f'{prefix}feature'],
+            threshold=arrays[f'{prefix}threshold'],
+            max_depth=params['max_depth'],
+            default_left=arrays.get(f'{prefix}default_left'),
+            missing_type=arrays.get(f'{prefix}missing_type')
+        )
+
+class _Component:
+    """One compiled base estimator producing (N, n_classes) probabilities"""
+
+    kind = None
+    uses_float32 = False  # sklearn trees compare float32 inputs
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def get_state(self) -> Tuple[Dict, Dict[str, np.ndarray]]:
+        raise NotImplementedError
+
+    @classmethod
+    def from_state(cls, params: Dict, arrays: Dict[str, np.ndarray]) -> '_Component':
+        raise NotImplementedError
+
+class ForestComponent(_Component):
+    """RandomForest / ExtraTrees / DecisionTree - mean of normalized leaf distributions"""
+
+    kind = 'forest'
+    uses_float32 = True
+
+    def __init__(self, trees: _TreeArrays, leaf_proba: np.ndarray):
+        self.trees = trees
+        self.leaf_proba = np.asarray(leaf_proba, dtype=np.float64)
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        leaves = self.trees.apply(X)
+        return self.leaf_proba[leaves].mean(axis=1)
+
+    def get_state(self):
+        params, arrays = self.trees.get_state('trees.')
+        arrays['leaf_proba'] = self.leaf_proba
+        return params, arrays
+
+    @classmethod
+    def from_state(cls, params, arrays):
+        return cls(_TreeArrays.from_state('trees.', params, arrays), arrays['leaf_proba'])
+
+class AdaBoostComponent(_Component):
+    """AdaBoostClassifier (SAMME.R or SAMME) over decision trees"""
+
+    kind = 'adaboost'
+    uses_float32 = True
+
+    def __init__(self, trees: _TreeArrays, leaf_proba: np.ndarray, estimator_weights: np.ndarray,
+                 weight_sum: float, algorithm: str):
+        self.trees = trees
+        self.leaf_proba = np.asarray(leaf_proba, dtype=np.float64)
+        self.estimator_weights = np.asarray(estimator_weights, dtype=np.float64)
+        self.weight_sum = float(weight_sum)
+        self.algorithm = algorithm
+        self.n_classes = self.leaf_proba.shape[1]
+        if self.algorithm == 'SAMME.R':
+            # _samme_proba yaprak başına sabit - derleme anında önceden hesaplanır
+            proba = np.clip(self.leaf_proba, np.finfo(np.float64).eps, None)
+            log_proba = np.log(proba)
+            self.leaf_score = (self.n_classes - 1) * (
+                log_proba - (1.0 / self.n_classes) * log_proba.sum(axis=1, keepdims=True)
+            )
+        else:
+            self.leaf_score = np.eye(self.n_classes)[np.argmax(self.leaf_proba, axis=1)]
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        leaves = self.trees.apply(X)
+        if self.algorithm == 'SAMME.R':
+            decision = self.leaf_score[leaves].sum(axis=1)
+        else:
+            decision = np.einsum('ntk,t->nk', self.leaf_score[leaves], self.estimator_weights)
+        decision /= self.weight_sum
+
+        if self.n_classes == 2:
+            decision = decision[:, 1] - decision[:, 0]
+            decision = np.vstack([-decision, decision]).T / 2
+        else:
+            decision /= self.n_classes - 1
+        return _softmax(decision)
+
+    def get_state(self):
+        params, arrays = self.trees.get_state('trees.')
+        params.update({'weight_sum': self.weight_sum, 'algorithm': self.algorithm})
+        arrays['leaf_proba'] = self.leaf_proba
+        arrays['estimator_weights'] = self.estimator_weights
+        return params, arrays
+
+    @classmethod
+    def from_state(cls, params, arrays):
+        return cls(
+            _TreeArrays.from_state('trees.', params, arrays),
+            arrays['leaf_proba'],
+            arrays['estimator_weights'],
+            params['weight_sum'],
+            params['algorithm']
+        )
+
+class GBDTComponent(_Component):
+    """LightGBM booster - per-class raw score sums followed by the objective's link"""
+
+    kind = 'lightgbm'
+
+    def __init__(self, trees: _TreeArrays, leaf_value: np.ndarray, num_class: int,
+                 trees_per_iteration: int, objective: str, sigmoid: float, average_output: bool):
+        self.trees = trees
+        self.leaf_value = np.asarray(leaf_value, dtype=np.float64)
+        self.num_class = int(num_class)
+        self.trees_per_iteration = int(trees_per_iteration)
+        self.objective = objective
+        self.sigmoid = float(sigmoid)
+        self.average_output = bool(average_output)
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        leaves = self.trees.apply(X)
+        scores = self.leaf_value[leaves]
+        n_samples = scores.shape[0]
+        raw = scores.reshape(n_samples, -1, self.trees_per_iteration).sum(axis=1)
+        if self.average_output:
+            raw /= scores.shape[1] // self.trees_per_iteration
+
+        if self.objective == 'multiclass':
+            return _softmax(raw)
+        if self.objective == 'multiclassova':
+            return 1.0 / (1.0 + np.exp(-self.sigmoid * raw))
+        # binary
+        positive = 1.0 / (1.0 + np.exp(-self.sigmoid * raw[:, 0]))
+        return np.vstack([1.0 - positive, positive]).T
+
+    def get_state(self):
+        params, arrays = self.trees.get_state('trees.')
+        params.update({
+            'num_class': self.num_class,
+            'trees_per_iteration': self.trees_per_iteration,
+            'objective': self.objective,
+            'sigmoid': self.sigmoid,
+            'average_output': self.average_output
+        })
+        arrays['leaf_value'] = self.leaf_value
+        return params, arrays
+
+    @classmethod
+    def from_state(cls, params, arrays):
+        return cls(
+            _TreeArrays.from_state('trees.', params, arrays),
+            arrays['leaf_value'],
+            params['num_class'],
+            params['trees_per_iteration'],
+            params['objective'],
+            params['sigmoid'],
+            params['average_output']
+        )
+
+class KNNComponent(_Component):
+    """KNeighborsClassifier (euclidean) over a prebuilt training matrix"""
+
+    kind = 'knn'
+
+    def __init__(self, fit_X: np.ndarray, fit_y: np.ndarray, n_classes: int,
+                 n_neighbors: int, weights: str, fit_sq_norms: Optional[np.ndarray] = None):
+        self.fit_X = np.asarray(fit_X, dtype=np.float64)
+        self.fit_y = np.asarray(fit_y, dtype=np.int64)
+        self.n_classes = int(n_classes)
+        self.n_neighbors = int(n_neighbors)
+        self.weights = weights
+        if fit_sq_norms is None:
+            fit_sq_norms = np.einsum('ij,ij->i', self.fit_X, self.fit_X)
+        self.fit_sq_norms = np.asarray(fit_sq_norms, dtype=np.float64)
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        n_samples = X.shape[0]
+        rows = np.arange(n_samples)[:, None]
+        k = self.n_neighbors
+
+        # ||x - t||^2 = ||x||^2 - 2 x.t + ||t||^2
+        sq_dist = self.fit_sq_norms[None, :] - 2.0 * (X @ self.fit_X.T)
+        sq_dist += np.einsum('ij,ij->i', X, X)[:, None]
+
+        if k < sq_dist.shape[1]:
+            neighbors = np.argpartition(sq_dist, k - 1, axis=1)[:, :k]
+        else:
+            neighbors = np.broadcast_to(np.arange(sq_dist.shape[1]), (n_samples, sq_dist.shape[1]))
+        labels = self.fit_y[neighbors]
+
+        if self.weights == 'distance':
+            dist = np.sqrt(np.maximum(sq_dist[rows, neighbors], 0.0))
+            with np.errstate(divide='ignore'):
+                weights = 1.0 / dist
+            inf_mask = np.isinf(weights)
+            inf_rows = np.any(inf_mask, axis=1)
+            weights[inf_rows] = inf_mask[inf_rows]
+        else:
+            weights = np.ones(labels.shape, dtype=np.float64)
+
+        proba = np.zeros((n_samples, self.n_classes), dtype=np.float64)
+        np.add.at(proba, (np.broadcast_to(rows, labels.shape), labels), weights)
+        normalizer = proba.sum(axis=1, keepdims=True)
+        normalizer[normalizer == 0.0] = 1.0
+        return proba / normalizer
+
+    def get_state(self):
+        params = {'n_classes': self.n_classes, 'n_neighbors': self.n_neighbors, 'weights': self.weights}
+        arrays = {'fit_X': self.fit_X, 'fit_y': self.fit_y, 'fit_sq_norms': self.fit_sq_norms}
+        return params, arrays
+
+    @classmethod
+    def from_state(cls, params, arrays):
+        return cls(arrays['fit_X'], arrays['fit_y'], params['n_classes'],
+                   params['n_neighbors'], params['weights'], arrays['fit_sq_norms'])
+
+class SVCComponent(_Component):
+    """
+    SVC(probability=True) - libsvm one-vs-one decision values, Platt scaling
+    and pairwise coupling
+
+    The pairwise-coupling fixed point is solved directly as a linear system
+    instead of libsvm's iterative loop, so results agree with sklearn up to
+    libsvm's stopping tolerance (0.005 / n_classes).
+    """
+
+    kind = 'svc'
+
+    def __init__(self, support_vectors: np.ndarray, coef: np.ndarray, intercept: np.ndarray,
+                 prob_a: np.ndarray, prob_b: np.ndarray, n_classes: int, kernel: str,
+                 gamma: float, coef0: float, degree: int, sv_sq_norms: Optional[np.ndarray] = None):
+        self.support_vectors = np.asarray(support_vectors, dtype=np.float64)
+        self.coef = np.asarray(coef, dtype=np.float64)  # (n_SV, n_pairs)
+        self.intercept = np.asarray(intercept, dtype=np.float64)
+        self.prob_a = np.asarray(prob_a, dtype=np.float64)
+        self.prob_b = np.asarray(prob_b, dtype=np.float64)
+        self.n_classes = int(n_classes)
+        self.kernel = kernel
+        self.gamma = float(gamma)
+        self.coef0 = float(coef0)
+        self.degree = int(degree)
+        if sv_sq_norms is None:
+            sv_sq_norms = np.einsum('ij,ij->i', self.support_vectors, self.support_vectors)
+        self.sv_sq_norms = np.asarray(sv_sq_norms, dtype=np.float64)
+        self.pair_i, self.pair_j = np.triu_indices(self.n_classes, k=1)
+
+    def _kernel(self, X: np.ndarray) -> np.ndarray:
+        dot = X @ self.support_vectors.T
+        if self.kernel == 'linear':
+            return dot
+        if self.kernel == 'rbf':
+            sq_dist = np.einsum('ij,ij->i', X, X)[:, None] - 2.0 * dot + self.sv_sq_norms[None, :]
+            return np.exp(-self.gamma * np.maximum(sq_dist, 0.0))
+        if self.kernel == 'poly':
+            return (self.gamma * dot + self.coef0) ** self.degree
+        return np.tanh(self.gamma * dot + self.coef0)
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        decision = self._kernel(X) @ self.coef + self.intercept
+
+        # Platt scaling (libsvm sigmoid_predict, numerically stable form)
+        f_ab = decision * self.prob_a + self.prob_b
+        e = np.exp(-np.abs(f_ab))
+        pairwise = np.where(f_ab >= 0, e / (1.0 + e), 1.0 / (1.0 + e))
+        pairwise = np.clip(pairwise, SVM_MIN_PROB, 1.0 - SVM_MIN_PROB)
+
+        n_samples = X.shape[0]
+        k = self.n_classes
+        if k == 2:
+            return np.vstack([pairwise[:, 0], 1.0 - pairwise[:, 0]]).T
+
+        # r[i][j] = P(i | i or j)
+        r = np.zeros((n_samples, k, k), dtype=np.float64)
+        r[:, self.pair_i, self.pair_j] = pairwise
+        r[:, self.pair_j, self.pair_i] = 1.0 - pairwise
+
+        # Q[t][j] = -r[j][t] * r[t][j], Q[t][t] = sum_j r[j][t]^2
+        r_t = np.swapaxes(r, 1, 2)
+        q = -r_t * r
+        diag = np.arange(k)
+        q[:, diag, diag] = np.einsum('njt,njt->nt', r, r)
+
+        # min p'Qp s.t. sum(p) = 1  ->  [Q 1; 1' 0] [p; b] = [0; 1]
+        system = np.zeros((n_samples, k + 1, k + 1), dtype=np.float64)
+        system[:, :k, :k] = q
+        system[:, :k, k] = 1.0
+        system[:, k, :k] = 1.0
+        rhs = np.zeros((n_samples, k + 1), dtype=np.float64)
+        rhs[:, k] = 1.0
+        return np.linalg.solve(system, rhs[..., None])[:, :k, 0]
+
+    def get_state(self):
+        params = {
+            'n_classes': self.n_classes,
+            'kernel': self.kernel,
+            'gamma': self.gamma,
+            'coef0': self.coef0,
+            'degree': self.degree
+        }
+        arrays = {
+            'support_vectors': self.support_vectors,
+            'coef': self.coef,
+            'intercept': self.intercept,
+            'prob_a': self.prob_a,
+            'prob_b': self.prob_b,
+            'sv_sq_norms': self.sv_sq_norms
+        }
+        return params, arrays
+
+    @classmethod
+    def from_state(cls, params, arrays):
+        return cls(arrays['support_vectors'], arrays['coef'], arrays['intercept'],
+                   arrays['prob_a'], arrays['prob_b'], params['n_classes'], params['kernel'],
+                   params['gamma'], params['coef0'], params['degree'], arrays['sv_sq_norms'])
+
+COMPONENT_TYPES = {
+    cls.kind: cls for cls in (ForestComponent, AdaBoostComponent, GBDTComponent, KNNComponent, SVCComponent)
+}
+
+class CompiledEnsemble:
+    """Soft-voting ensemble of compiled components (sklearn-compatible predict / predict_proba)"""
+
+    def __init__(self, components: List[_Component], weights: Optional[Sequence[float]], classes: np.ndarray):
+        """
+        Initialize compiled ensemble
+
+        Args:
+            components: Compiled base estimators
+            weights: Soft-voting weights (None = uniform)
+            classes: Output labels, column order of predict_proba
+        """
+        self.components = components
+        self.weights = None if weights is None else np.asarray(weights, dtype=np.float64)
+        self.classes_ = np.asarray(classes)
+
+    def predict_proba(self, X) -> np.ndarray:
+        """
+        Predict class probabilities
+
+        Args:
+            X: (N, n_features) array-like
+
+        Returns:
+            (N, n_classes) probabilities
+        """
+        X = np.asarray(X)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        X64 = X.astype(np.float64, copy=False)
+        X32 = X.astype(np.float32, copy=False)
+
+        probas = [component.predict_proba(X32 if component.uses_float32 else X64)
+                  for component in self.components]
+        if len(probas) == 1:
+            return probas[0]
+        return np.average(np.stack(probas), axis=0, weights=self.weights)
+
+    def predict(self, X) -> np.ndarray:
+        """Predict labels"""
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+    def get_state(self) -> Tuple[Dict, Dict[str, np.ndarray]]:
+        """Flatten into (JSON-serializable metadata, {name: array})"""
+        meta = {
+            'format_version': FORMAT_VERSION,
+            'weights': None if self.weights is None else self.weights.tolist(),
+            'components': []
+        }
+        arrays = {'classes': self.classes_}
+        for index, component in enumerate(self.components):
+            params, component_arrays = component.get_state()
+            meta['components'].append({'kind': component.kind, 'params': params})
+            for name, array in component_arrays.items():
+                arrays[f'c{index}.{name}'] = array
+        return meta, arrays
+
+    @classmethod
+    def from_state(cls, meta: Dict, arrays: Dict[str, np.ndarray]) -> 'CompiledEnsemble':
+        """Rebuild from `get_state` output"""
+        if meta.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported compiled model format: {meta.get('format_version')}")
+
+        components = []
+        for index, spec in enumerate(meta['components']):
+            prefix = f'c{index}.'
+            component_arrays = {name[len(prefix):]: array
+                                for name, array in arrays.items() if name.startswith(prefix)}
+            components.append(COMPONENT_TYPES[spec['kind']].from_state(spec['params'], component_arrays))
+        return cls(components, meta['weights'], arrays['classes'])
+
+    def save(self, path: str):
+        """Save as an uncompressed .npz archive (no pickle)"""
+        meta, arrays = self.get_state()
+        meta_bytes = np.frombuffer(json.dumps(meta).encode('utf-8'), dtype=np.uint8)
+        with open(path, 'wb') as f:
+            np.savez(f, __meta__=meta_bytes, **arrays)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = False) -> 'CompiledEnsemble':
+        """
+        Load a model saved with `save`
+
+        Args:
+            path: Path to the .npz archive
+            mmap: Memory-map the arrays read-only instead of reading them into
+                  private memory (shared between forked workers)
+
+        Returns:
+            CompiledEnsemble instance
+        """
+        if mmap:
+            arrays = mmap_npz(path)
+        else:
+            with np.load(path, allow_pickle=False) as archive:
+                arrays = {name: archive[name] for name in archive.files}
+        meta = json.loads(arrays.pop('__meta__').tobytes().decode('utf-8'))
+        return cls.from_state(meta, arrays)
+
+# ---------------------------------------------------------------------------
+# Compilation (sklearn / LightGBM objects -> components)
+# Sınıf adları ile eşleştirilir; runtime'da sklearn import edilmez.
+# ---------------------------------------------------------------------------
+
+def _pack_sklearn_trees(estimators, n_classes: int) -> Tuple[_TreeArrays, np.ndarray]:
+    """Pack fitted sklearn decision trees into shared node arrays + leaf distributions"""
+    roots, lefts, rights, features, thresholds, leaf_probas = [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+
+    for estimator in estimators:
+        tree = estimator.tree_
+        if tree.n_outputs != 1 or tree.value.shape[2] != n_classes:
+            raise NotImplementedError("Only single-output trees over all classes are supported")
+
+        node_ids = np.arange(tree.node_count)
+        is_leaf = tree.children_left == -1
+        lefts.append(np.where(is_leaf, node_ids, tree.children_left) + offset)
+        rights.append(np.where(is_leaf, node_ids, tree.children_right) + offset)
+        features.append(np.where(is_leaf, 0, tree.feature))
+        thresholds.append(np.where(is_leaf, 0.0, tree.threshold))
+
+        value = np.array(tree.value[:, 0, :], dtype=np.float64)
+        normalizer = value.sum(axis=1, keepdims=True)
+        normalizer[normalizer == 0.0] = 1.0
+        leaf_probas.append(value / normalizer)
+
+        roots.append(offset)
+        offset += tree.node_count
+        max_depth = max(max_depth, int(tree.max_depth))
+
+    trees = _TreeArrays(
+        roots=roots,
+        left=np.concatenate(lefts),
+        right=np.concatenate(rights),
+        feature=np.concatenate(features),
+        threshold=np.concatenate(thresholds),
+        max_depth=max_depth
+    )
+    return trees, np.concatenate(leaf_probas)
+
+def _compile_forest(model) -> ForestComponent:
+    estimators = getattr(model, 'estimators_', [model])
+    trees, leaf_proba = _pack_sklearn_trees(estimators, len(model.classes_))
+    return ForestComponent(trees, leaf_proba)
+
+def _compile_adaboost(model) -> AdaBoostComponent:
+    algorithm = getattr(model, 'algorithm', 'SAMME')
+    if algorithm not in ('SAMME', 'SAMME.R'):
+        raise NotImplementedError(f"Unsupported AdaBoost algorithm: {algorithm}")
+    for estimator in model.estimators_:
+        if type(estimator).__name__ != 'DecisionTreeClassifier':
+            raise NotImplementedError("AdaBoost base estimator must be a DecisionTreeClassifier")
+
+    n_fitted = len(model.estimators_)
+    trees, leaf_proba = _pack_sklearn_trees(model.estimators_, len(model.classes_))
+    return AdaBoostComponent(
+        trees,
+        leaf_proba,
+        estimator_weights=np.asarray(model.estimator_weights_[:n_fitted], dtype=np.float64),
+        weight_sum=float(np.sum(model.estimator_weights_)),
+        algorithm=algorithm
+    )
+
+def _compile_lightgbm(model) -> GBDTComponent:
+    dump = model.booster_.dump_model()
+    objective_spec = dump.get('objective', 'multiclass').split()
+    objective = objective_spec[0]
+    if objective not in ('multiclass', 'multiclassova', 'binary'):
+        raise NotImplementedError(f"Unsupported LightGBM objective: {objective}")
+    sigmoid = 1.0
+    for token in objective_spec[1:]:
+        if token.startswith('sigmoid:'):
+            sigmoid = float(token.split(':', 1)[1])
+
+    roots, lefts, rights, features, thresholds = [], [], [], [], []
+    default_lefts, missing_types, leaf_values = [], [], []
+    missing_codes = {'None': MISSING_NONE, 'Zero': MISSING_ZERO, 'NaN': MISSING_NAN}
+    max_depth = 0
+
+    for tree_info in dump['tree_info']:
+        root_index = len(lefts)
+        roots.append(root_index)
+        # Explicit stack: (node dict, assigned index, depth)
+        stack = [(tree_info['tree_structure'], root_index, 0)]
+        lefts.append(0); rights.append(0); features.append(0); thresholds.append(0.0)
+        default_lefts.append(True); missing_types.append(MISSING_NONE); leaf_values.append(0.0)
+
+        while stack:
+            node, index, depth = stack.pop()
+            if 'leaf_value' in node and 'split_index' not in node:
+                lefts[index] = rights[index] = index
+                leaf_values[index] = float(node['leaf_value'])
+                max_depth = max(max_depth, depth)
+                continue
+
+            if node.get('decision_type', '<=') != '<=':
+                raise NotImplementedError("Categorical LightGBM splits are not supported")
+
+            features[index] = int(node['split_feature'])
+            thresholds[index] = float(node['threshold'])
+            default_lefts[index] = bool(node.get('default_left', True))
+            missing_types[index] = missing_codes.get(node.get('missing_type', 'None'), MISSING_NONE)
+
+            for side, child in (('left', node['left_child']), ('right', node['right_child'])):
+                child_index = len(lefts)
+                lefts.append(0); rights.append(0); features.append(0); thresholds.append(0.0)
+                default_lefts.append(True); missing_types.append(MISSING_NONE); leaf_values.append(0.0)
+                if side == 'left':
+                    lefts[index] = child_index
+                else:
+                    rights[index] = child_index
+                stack.append((child, child_index, depth + 1))
+
+    trees = _TreeArrays(roots, lefts, rights, features, thresholds, max_depth,
+                        default_left=default_lefts, missing_type=missing_types)
+    num_class = int(dump.get('num_class', 1))
+    return GBDTComponent(
+        trees,
+        np.asarray(leaf_values, dtype=np.float64),
+        num_class=num_class,
+        trees_per_iteration=int(dump.get('num_tree_per_iteration', num_class)),
+        objective=objective,
+        sigmoid=sigmoid,
+        average_output=bool(dump.get('average_output', False))
+    )
+
+def _compile_knn(model) -> KNNComponent:
+    if getattr(model, 'effective_metric_', 'euclidean') != 'euclidean':
+        raise NotImplementedError(f"Unsupported KNN metric: {model.effective_metric_}")
+    if model.weights not in ('uniform', 'distance'):
+        raise NotImplementedError("Callable KNN weights are not supported")
+    fit_y = np.asarray(model._y)
+    if fit_y.ndim != 1:
+        raise NotImplementedError("Multi-output KNN is not supported")
+    return KNNComponent(model._fit_X, fit_y, len(model.classes_), model.n_neighbors, model.weights)
+
+def _compile_svc(model) -> SVCComponent:
+    if model.kernel not in ('linear', 'rbf', 'poly', 'sigmoid'):
+        raise NotImplementedError(f"Unsupported SVC kernel: {model.kernel}")
+    if getattr(model, '_sparse', False):
+        raise NotImplementedError("Sparse SVC models are not supported")
+    prob_a = np.asarray(getattr(model, 'probA_', []))
+    if prob_a.size == 0:
+        raise NotImplementedError("SVC must be trained with probability=True")
+
+    n_classes = len(model.classes_)
+    n_support = np.asarray(model.n_support_)
+    dual_coef = np.asarray(model._dual_coef_, dtype=np.float64)
+    starts = np.concatenate([[0], np.cumsum(n_support)[:-1]])
+    n_pairs = n_classes * (n_classes - 1) // 2
+
+    # libsvm svm_predict_values: pair (i, j) uses sv_coef[j-1] on class i's SVs
+    # and sv_coef[i] on class j's SVs - folded into one (n_SV, n_pairs) matrix
+    coef = np.zeros((dual_coef.shape[1], n_pairs), dtype=np.float64)
+    pair = 0
+    for i in range(n_classes):
+        for j in range(i + 1, n_classes):
+            si, ci = starts[i], n_support[i]
+            sj, cj = starts[j], n_support[j]
+            coef[si:si + ci, pair] = dual_coef[j - 1, si:si + ci]
+            coef[sj:sj + cj, pair] = dual_coef[i, sj:sj + cj]
+            pair += 1
+
+    return SVCComponent(
+        support_vectors=model.support_vectors_,
+        coef=coef,
+        intercept=model._intercept_,
+        prob_a=prob_a,
+        prob_b=model.probB_,
+        n_classes=n_classes,
+        kernel=model.kernel,
+        gamma=model._gamma,
+        coef0=model.coef0,
+        degree=model.degree
+    )
+
+ESTIMATOR_COMPILERS = {
+    'RandomForestClassifier': _compile_forest,
+    'ExtraTreesClassifier': _compile_forest,
+    'DecisionTreeClassifier': _compile_forest,
+    'AdaBoostClassifier': _compile_adaboost,
+    'LGBMClassifier': _compile_lightgbm,
+    'KNeighborsClassifier': _compile_knn,
+    'SVC': _compile_svc,
+}
+
+def compile_estimator(estimator) -> _Component:
+    """Compile one fitted base estimator"""
+    name = type(estimator).__name__
+    compiler = ESTIMATOR_COMPILERS.get(name)
+    if compiler is None:
+        raise NotImplementedError(f"Unsupported estimator: {name}")
+    return compiler(estimator)
+
+def compile_model(model) -> CompiledEnsemble:
+    """
+    Compile a fitted soft-voting VotingClassifier (or a single supported estimator)
+
+    Args:
+        model: Fitted sklearn-compatible classifier
+
+    Returns:
+        CompiledEnsemble producing the same predict_proba output
+
+    Raises:
+        NotImplementedError: If the model contains an unsupported estimator
+    """
+    if type(model).__name__ == 'VotingClassifier':
+        if model.voting != 'soft':
+            raise NotImplementedError("Only soft voting is supported")
+        components = [compile_estimator(estimator) for estimator in model.estimators_]
+        weights = getattr(model, '_weights_not_none', None)
+        return CompiledEnsemble(components, weights, model.classes_)
+
+    return CompiledEnsemble([compile_estimator(model)], None, model.classes_)
+
+def check_parity(reference_model, compiled_model: CompiledEnsemble, X: np.ndarray) -> Dict:
+    """
+    Compare compiled output against the original model
+
+    Args:
+        reference_model: Original fitted model (sklearn API)
+        compiled_model: Result of `compile_model`
+        X: (N, n_features) evaluation samples
+
+    Returns:
+        Dictionary with max_abs_diff (probabilities) and label_agreement (0..1)
+    """
+    expected = np.asarray(reference_model.predict_proba(X))
+    actual = compiled_model.predict_proba(X)
+    expected_labels = np.asarray(reference_model.classes_)[np.argmax(expected, axis=1)]
+    actual_labels = compiled_model.classes_[np.argmax(actual, axis=1)]
+    return {
+        'samples': int(X.shape[0]),
+        'max_abs_diff': float(np.max(np.abs(expected - actual))),
+        'label_agreement': float(np.mean(expected_labels == actual_labels))
+    }
@@ -0,0 +1,297 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .hand_detector import HandDetector
+
+class _DetectorContext:
+    """One session's MediaPipe tracker plus the lock that serializes its frames"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.detector: Optional[HandDetector] = None
+        self.last_used = time.time()
+        self.closed = False
+        # Son tespit edilen el etrafındaki kırpma penceresi (x1, y1, x2, y2) ve kare boyutu
+        self.roi: Optional[Tuple[int, int, int, int]] = None
+        self.roi_shape: Optional[Tuple[int, int]] = None
+
+class HandDetectorPool:
+    """
+    Session-scoped pool of HandDetector contexts
+
+    MediaPipe's stream mode (static_image_mode=False) keeps tracking state
+    between frames. Sharing one instance across sessions mixes hands from
+    different users and forces palm detection on almost every frame, so each
+    session gets its own tracker. Contexts are evicted LRU when the pool is
+    full and after an idle timeout.
+
+    With ROI cropping enabled, a session whose previous frame had a hand only
+    sends an expanded window around that hand to MediaPipe. The window is
+    sticky - it only moves when the hand nears its edge or changes size - so
+    the tracker sees a stable coordinate frame. If the hand is lost inside
+    the window, the same frame is re-run on the full image.
+    """
+
+    def __init__(self, max_contexts: int = 16, idle_timeout: float = 60.0,
+                 min_detection_confidence: float = 0.3, min_tracking_confidence: float = 0.5,
+                 roi_enabled: bool = False, roi_expand: float = 2.0, roi_min_size: int = 96,
+                 roi_max_area: float = 0.5, rgb_input: bool = False):
+        """
+        Initialize detector pool
+
+        Args:
+            max_contexts: Maximum number of live trackers (memory cap per worker)
+            idle_timeout: Seconds after which an unused tracker is closed
+            min_detection_confidence: Passed to each HandDetector
+            min_tracking_confidence: Passed to each HandDetector
+            roi_enabled: Crop to the previous hand's neighbourhood before detection
+            roi_expand: Window side as a multiple of the hand's larger bounding box side
+            roi_min_size: Minimum window side in pixels
+            roi_max_area: Windows covering more than this fraction of the frame are not used
+            rgb_input: Frames arrive in RGB order (passed to each HandDetector)
+        """
+        self.max_contexts = max(1, max_contexts)
+        self.idle_timeout = idle_timeout
+        self.min_detection_confidence = min_detection_confidence
+        self.min_tracking_confidence = min_tracking_confidence
+        self.roi_enabled = roi_enabled
+        self.roi_expand = max(1.0, roi_expand)
+        self.roi_min_size = max(1, roi_min_size)
+        self.roi_max_area = roi_max_area
+        self.rgb_input = rgb_input
+
+        self._contexts: "OrderedDict[str, _DetectorContext]" = OrderedDict()
+        self._spares: List[HandDetector] = []  # warm_up ile ısıtılmış, henüz session'a atanmamış
+        self._lock = threading.Lock()
+        self._stats = {
+            'contexts_created': 0,
+            'contexts_evicted_lru': 0,
+            'contexts_evicted_idle': 0,
+            'context_hits': 0,
+            'context_misses': 0,
+            'spares_used': 0,
+            'roi_frames': 0,
+            'roi_hits': 0,
+            'roi_fallbacks': 0,
+            'roi_moves': 0
+        }
+
+    def process_frame(self, frame: np.ndarray, session_id: str = 'unknown') -> Dict:
+        """
+        Run hand detection on the session's own tracker
+
+        Args:
+            frame: BGR image from OpenCV (RGB when `rgb_input` is set)
+            session_id: Client session ID (X-Session-ID)
+
+        Returns:
+            Dictionary containing detection results (see HandDetector.process_frame)
+        """
+        while True:
+            context = self._acquire_context(session_id)
+            with context.lock:
+                # Evicted between lookup and lock - retry with a fresh context
+                if context.closed:
+                    continue
+                if context.detector is None:
+                    context.detector = self._take_spare() or self._create_detector()
+                context.last_used = time.time()
+                if not self.roi_enabled:
+                    return context.detector.process_frame(frame)
+                return self._process_with_roi(context, frame)
+
+    def _process_with_roi(self, context: _DetectorContext, frame: np.ndarray) -> Dict:
+        """Detect inside the session's ROI window, falling back to the full frame (caller holds context.lock)"""
+        shape = frame.shape[:2]
+        roi = context.roi if context.roi_shape == shape else None
+
+        if roi is not None:
+            result = context.detector.process_frame(frame, roi=roi)
+            hit = result['hand_detected']
+            with self._lock:
+                self._stats['roi_frames'] += 1
+                self._stats['roi_hits' if hit else 'roi_fallbacks'] += 1
+            if not hit:
+                # El pencereden çıktı - aynı kare tam görüntüde tekrar
+                result = context.detector.process_frame(frame)
+                roi = None
+        else:
+            result = context.detector.process_frame(frame)
+
+        new_roi = self._next_roi(roi, result, shape)
+        if roi is not None and new_roi != roi:
+            with self._lock:
+                self._stats['roi_moves'] += 1
+        context.roi = new_roi
+        context.roi_shape = shape if new_roi is not None else None
+        return result
+
+    def _next_roi(self, roi: Optional[Tuple[int, int, int, int]], result: Dict,
+                  shape: Tuple[int, int]) -> Optional[Tuple[int, int, int, int]]:
+        """Keep the current window while the hand sits well inside it, otherwise re-center"""
+        if not result['hand_detected'] or not result['landmarks']:
+            return None
+
+        height, width = shape
+        xs = [lm['x'] * width for lm in result['landmarks']]
+        ys = [lm['y'] * height for lm in result['landmarks']]
+        hand_x1, hand_x2, hand_y1, hand_y2 = min(xs), max(xs), min(ys), max(ys)
+        hand_size = max(hand_x2 - hand_x1, hand_y2 - hand_y1)
+
+        if roi is not None:
+            x1, y1, x2, y2 = roi
+            margin = 0.1 * min(x2 - x1, y2 - y1)
+            inside = (hand_x1 >= x1 + margin and hand_y1 >= y1 + margin and
+                      hand_x2 <= x2 - margin and hand_y2 <= y2 - margin)
+            # El çok küçüldüyse pencere gereğinden büyük - yeniden ortala
+            if inside and hand_size * self.roi_expand * 1.5 >= min(x2 - x1, y2 - y1):
+                return roi
+
+        side = max(hand_size * self.roi_expand, self.roi_min_size)
+        center_x, center_y = (hand_x1 + hand_x2) / 2.0, (hand_y1 + hand_y2) / 2.0
+        x1 = max(0, int(center_x - side / 2.0))
+        y1 = max(0, int(center_y - side / 2.0))
+        x2 = min(width, int(center_x + side / 2.0))
+        y2 = min(height, int(center_y + side / 2.0))
+        if x2 <= x1 or y2 <= y1 or (x2 - x1) * (y2 - y1) > self.roi_max_area * width * height:
+            return None
+        return x1, y1, x2, y2
+
+    def _create_detector(self) -> HandDetector:
+        """Build a new MediaPipe tracker with the pool's settings"""
+        return HandDetector(
+            min_detection_confidence=self.min_detection_confidence,
+            min_tracking_confidence=self.min_tracking_confidence,
+            rgb_input=self.rgb_input
+        )
+
+    def _take_spare(self) -> Optional[HandDetector]:
+        """Pop a pre-warmed tracker, if any"""
+        with self._lock:
+            if not self._spares:
+                return None
+            self._stats['spares_used'] += 1
+            return self._spares.pop()
+
+    def warm_up(self, frames: List[np.ndarray], spares: int = 1) -> Dict:
+        """
+        Build pre-warmed trackers for the next new sessions
+
+        The first frame through a fresh MediaPipe graph pays for graph and
+        TFLite interpreter allocation; warming spares here moves that cost
+        out of the first user request after a worker (re)start.
+
+        Args:
+            frames: Decoded frames (same channel order as requests) to run through each spare
+            spares: Number of spare trackers to keep
+
+        Returns:
+            Dictionary with `create_ms`, `first_frame_ms`, `mean_frame_ms`,
+            `hands_detected` and the detected `features` vectors
+        """
+        timings = {'create_ms': 0.0, 'first_frame_ms': 0.0, 'mean_frame_ms': 0.0,
+                   'hands_detected': 0, 'features': []}
+        if not frames:
+            return timings
+
+        frame_times = []
+        for _ in range(max(0, spares)):
+            start = time.perf_counter()
+            detector = self._create_detector()
+            timings['create_ms'] = max(timings['create_ms'], (time.perf_counter() - start) * 1000.0)
+
+            for frame in frames:
+                start = time.perf_counter()
+                result = detector.process_frame(frame)
+                frame_times.append((time.perf_counter() - start) * 1000.0)
+                if result.get('features'):
+                    timings['hands_detected'] += 1
+                    timings['features'].append(result['features'])
+
+            # Boş kare ile takip durumunu sıfırla - spare ilk session'a temiz başlasın
+            detector.process_frame(np.zeros_like(frames[0]))
+
+            with self._lock:
+                self._spares.append(detector)
+
+        if frame_times:
+            timings['first_frame_ms'] = frame_times[0]
+            timings['mean_frame_ms'] = sum(frame_times[1:]) / max(1, len(frame_times) - 1)
+        return timings
+
+    def _acquire_context(self, session_id: str) -> _DetectorContext:
+        """Look up or create the session's context, evicting idle/LRU entries"""
+        evicted = []
+        now = time.time()
+
+        with self._lock:
+            # Idle eviction - OrderedDict is in LRU order, so stop at the first fresh entry
+            while self._contexts:
+                oldest_id, oldest = next(iter(self._contexts.items()))
+                if oldest_id == session_id or now - oldest.last_used <= self.idle_timeout:
+                    break
+                self._contexts.popitem(last=False)
+                evicted.append(oldest)
+                self._stats['contexts_evicted_idle'] += 1
+
+            context = self._contexts.get(session_id)
+            if context is not None:
+                self._contexts.move_to_end(session_id)
+                self._stats['context_hits'] += 1
+            else:
+                self._stats['context_misses'] += 1
+                # LRU eviction when the pool is full
+                while len(self._contexts) >= self.max_contexts:
+                    _, oldest = self._contexts.popitem(last=False)
+                    evicted.append(oldest)
+                    self._stats['contexts_evicted_lru'] += 1
+
+                context = _DetectorContext()
+                self._contexts[session_id] = context
+                self._stats['contexts_created'] += 1
+
+            context.last_used = now
+
+        # Close evicted trackers outside the pool lock (may wait for an in-flight frame)
+        for old_context in evicted:
+            self._close_context(old_context)
+
+        return context
+
+    @staticmethod
+    def _close_context(context: _DetectorContext):
+        """Close a context's tracker once its current frame (if any) is done"""
+        with context.lock:
+            context.closed = True
+            if context.detector is not None:
+                context.detector.close()
+                context.detector = None
+
+    def get_stats(self) -> Dict:
+        """Get pool metrics"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['active_contexts'] = len(self._contexts)
+            stats['spare_detectors'] = len(self._spares)
+        stats['max_contexts'] = self.max_contexts
+        stats['idle_timeout'] = self.idle_timeout
+        stats['roi_enabled'] = self.roi_enabled
+        roi_frames = stats['roi_frames']
+        stats['roi_hit_rate'] = round(stats['roi_hits'] / roi_frames * 100, 2) if roi_frames else 0.0
+        return stats
+
+    def close(self):
+        """Close all trackers"""
+        with self._lock:
+            contexts = list(self._contexts.values())
+            self._contexts.clear()
+            spares = self._spares
+            self._spares = []
+        for context in contexts:
+            self._close_context(context)
+        for detector in spares:
+            detector.close()
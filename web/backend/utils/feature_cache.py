@@ -0,0 +1,155 @@
+import threading
+from collections import OrderedDict
+from itertools import islice
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+class FeatureCache:
+    """
+    Bounded LRU cache from quantized landmark features to classifier output
+
+    A hand held still produces landmark vectors that differ only by detector
+    jitter. Features are snapped to a grid and the grid cell is the cache key.
+    With 42 dimensions, jitter almost always pushes at least one coordinate
+    across a cell boundary, so an exact-key miss also probes the few most
+    recently used entries and accepts one whose anchor vector is within one
+    grid step in every coordinate (L-infinity).
+    """
+
+    def __init__(self, grid: float = 0.01, max_size: int = 1024, probe: int = 8):
+        """
+        Initialize feature cache
+
+        Args:
+            grid: Quantization step / match tolerance in normalized landmark units
+            max_size: Maximum number of cached vectors (LRU eviction)
+            probe: Most recently used entries checked by distance on an exact-key miss (0 disables)
+        """
+        if grid <= 0:
+            raise ValueError(f"Cache grid must be positive, got {grid}")
+
+        self.grid = grid
+        self.max_size = max(1, max_size)
+        self.probe = max(0, probe)
+        # key -> (anchor features, prediction)
+        self._entries: "OrderedDict[bytes, Tuple[np.ndarray, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._near_hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def _quantize(self, features) -> Tuple[np.ndarray, bytes]:
+        """Return (features as float32 array, grid cell key)"""
+        vector = np.asarray(features, dtype=np.float32)
+        cells = np.rint(vector / self.grid).astype(np.int32)
+        return vector, cells.tobytes()
+
+    def _lookup(self, vector: np.ndarray, key: bytes) -> Optional[Dict]:
+        """Exact cell, then nearest recent anchor (caller holds the lock)"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+        for recent_key in islice(reversed(self._entries), self.probe):
+            anchor, result = self._entries[recent_key]
+            if np.max(np.abs(anchor - vector)) <= self.grid:
+                self._entries.move_to_end(recent_key)
+                self._hits += 1
+                self._near_hits += 1
+                return result
+
+        self._misses += 1
+        return None
+
+    def _store(self, vector: np.ndarray, key: bytes, result: Dict):
+        """Insert a successful prediction (caller holds the lock)"""
+        if not result.get('success'):
+            return
+        self._entries[key] = (vector, dict(result))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def classify(self, features, classify_fn) -> Dict:
+        """
+        Return the cached prediction for `features`, calling `classify_fn` on a miss
+
+        Args:
+            features: 42 normalized landmark features
+            classify_fn: Function features -> prediction dictionary
+
+        Returns:
+            Prediction dictionary
+        """
+        vector, key = self._quantize(features)
+        with self._lock:
+            result = self._lookup(vector, key)
+        if result is not None:
+            return dict(result)
+
+        # Model çağrısı kilit dışında - diğer thread'ler beklemesin
+        result = classify_fn(features)
+        with self._lock:
+            self._store(vector, key, result)
+        return result
+
+    def classify_batch(self, features_list: List, classify_batch_fn) -> List[Dict]:
+        """
+        Batch variant of `classify` - only the misses go to `classify_batch_fn`
+
+        Args:
+            features_list: List of 42-feature vectors
+            classify_batch_fn: Function list of vectors -> list of prediction dictionaries
+
+        Returns:
+            List of prediction dictionaries in input order
+        """
+        quantized = [self._quantize(features) for features in features_list]
+        results: List[Optional[Dict]] = []
+        with self._lock:
+            for vector, key in quantized:
+                result = self._lookup(vector, key)
+                results.append(None if result is None else dict(result))
+
+        # Aynı hücreye düşen kayıplar tek satır olarak hesaplanır
+        pending: "OrderedDict[bytes, List[int]]" = OrderedDict()
+        for index, result in enumerate(results):
+            if result is None:
+                pending.setdefault(quantized[index][1], []).append(index)
+
+        if pending:
+            first_indices = [indices[0] for indices in pending.values()]
+            computed = classify_batch_fn([features_list[index] for index in first_indices])
+            with self._lock:
+                for indices, result in zip(pending.values(), computed):
+                    vector, key = quantized[indices[0]]
+                    self._store(vector, key, result)
+                    for index in indices:
+                        results[index] = dict(result)
+        return results
+
+    def get_stats(self) -> Dict:
+        """Get cache metrics"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'hits': self._hits,
+                'near_hits': self._near_hits,
+                'misses': self._misses,
+                'hit_rate': round(self._hits / lookups * 100, 2) if lookups else 0.0,
+                'evictions': self._evictions,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'grid': self.grid,
+                'probe': self.probe
+            }
+
+    def clear(self):
+        """Drop all entries"""
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,116 @@
+"""
+Resolution-aware frame decoding
+
+libjpeg can scale by 1/2, 1/4 or 1/8 inside the IDCT, so decoding a large
+JPEG straight to a reduced size is much cheaper than decoding it fully and
+resizing. The image header is parsed first to pick the largest reduction
+that still leaves the frame at least `target_width` pixels wide.
+
+OpenCV >= 4.10 can also emit RGB directly from the decoder (IMREAD_COLOR_RGB),
+which removes the BGR -> RGB copy in front of MediaPipe. On older builds
+frames stay BGR and HandDetector converts them as before.
+"""
+
+import struct
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+# OpenCV 4.8 (requirements.txt) bu bayrağı içermez - o durumda BGR decode
+IMREAD_COLOR_RGB = getattr(cv2, 'IMREAD_COLOR_RGB', None)
+RGB_DECODE_SUPPORTED = IMREAD_COLOR_RGB is not None
+
+# (ölçek, bayrak) - büyükten küçüğe
+_REDUCED_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+# SOF markers carrying frame size (C4 = DHT, C8 = JPG extension, CC = DAC are not frames)
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+def read_image_size(data) -> Optional[Tuple[int, int]]:
+    """
+    Read (width, height) from a JPEG or PNG header without decoding
+
+    Args:
+        data: bytes, bytearray or memoryview holding the encoded image
+
+    Returns:
+        (width, height), or None if the header is not recognized
+    """
+    view = memoryview(data).cast('B')
+    size = len(view)
+
+    if size >= 24 and view[:8] == _PNG_SIGNATURE:
+        width, height = struct.unpack_from('>II', view, 16)
+        return width, height
+
+    if size < 4 or view[0] != 0xFF or view[1] != 0xD8:
+        return None
+
+    # Marker segmentlerini SOF'a kadar atla
+    offset = 2
+    while offset + 9 <= size:
+        if view[offset] != 0xFF:
+            return None
+        marker = view[offset + 1]
+        if marker == 0xFF:  # dolgu baytı
+            offset += 1
+            continue
+        if marker in _JPEG_SOF_MARKERS:
+            height, width = struct.unpack_from('>HH', view, offset + 5)
+            return width, height
+        if marker == 0xD9 or marker == 0xDA:  # EOI / SOS - SOF bulunamadı
+            return None
+        segment_length, = struct.unpack_from('>H', view, offset + 2)
+        offset += 2 + segment_length
+    return None
+
+def decode_flags(data, target_width: int = 0, rgb: bool = False) -> Tuple[int, int]:
+    """
+    Choose imdecode flags for a frame
+
+    Args:
+        data: Encoded image
+        target_width: Smallest acceptable decoded width (0 disables reduced decoding)
+        rgb: Request RGB output when the OpenCV build supports it
+
+    Returns:
+        Tuple of (cv2.imdecode flags, scale factor)
+    """
+    flags, scale = cv2.IMREAD_COLOR, 1
+    if target_width > 0:
+        image_size = read_image_size(data)
+        if image_size is not None:
+            for factor, reduced_flag in _REDUCED_FLAGS:
+                if image_size[0] // factor >= target_width:
+                    flags, scale = reduced_flag, factor
+                    break
+
+    if rgb and RGB_DECODE_SUPPORTED:
+        # IMREAD_COLOR (BGR) ve IMREAD_COLOR_RGB birlikte verilemez
+        flags = (flags & ~cv2.IMREAD_COLOR) | IMREAD_COLOR_RGB
+    return flags, scale
+
+def decode_frame(data, target_width: int = 0, rgb: bool = False) -> np.ndarray:
+    """
+    Decode an encoded frame, reduced to about `target_width` when it is larger
+
+    Args:
+        data: bytes, bytearray or memoryview holding the encoded image
+        target_width: Smallest acceptable decoded width (0 decodes at full size)
+        rgb: Request RGB channel order (ignored when RGB_DECODE_SUPPORTED is False)
+
+    Returns:
+        Decoded image (RGB if requested and supported, otherwise BGR)
+    """
+    flags, _ = decode_flags(data, target_width, rgb)
+    # np.frombuffer kopyalamaz - cv2.imdecode doğrudan buffer'ı okur
+    image = cv2.imdecode(np.frombuffer(data, np.uint8), flags)
+    if image is None:
+        raise ValueError("Failed to decode image data")
+    return image
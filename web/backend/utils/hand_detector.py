@@ -4,16 +4,52 @@ import mediapipe as mp
 from typing import Optional, Tuple, List, Dict
 from config import Config
 
+NUM_LANDMARKS = 21
+NUM_FEATURES = NUM_LANDMARKS * 2
+
+def normalize_landmarks(x_coords: List[float], y_coords: List[float]) -> List[float]:
+    """
+    Normalize landmark coordinates into the model's 42-feature vector
+
+    Args:
+        x_coords: Normalized x coordinates of the hand landmarks
+        y_coords: Normalized y coordinates of the hand landmarks
+
+    Returns:
+        List of 42 features (x - x_min, y - y_min interleaved)
+    """
+    data_aux = []
+
+    # Normalize coordinates relative to the hand's bounding box
+    x_min = min(x_coords)
+    y_min = min(y_coords)
+
+    for x, y in zip(x_coords, y_coords):
+        data_aux.append(x - x_min)
+        data_aux.append(y - y_min)
+
+    # Ensure exactly 42 features
+    if len(data_aux) > NUM_FEATURES:
+        data_aux = data_aux[:NUM_FEATURES]
+    elif len(data_aux) < NUM_FEATURES:
+        # Pad with zeros if needed (shouldn't happen normally)
+        data_aux.extend([0.0] * (NUM_FEATURES - len(data_aux)))
+
+    return data_aux
+
 class HandDetector:
     """MediaPipe hand detection wrapper optimized for performance"""
 
-    def __init__(self, min_detection_confidence: float = 0.3, min_tracking_confidence: float = 0.5):
+    def __init__(self, min_detection_confidence: float = 0.3, min_tracking_confidence: float = 0.5,
+                 rgb_input: bool = False):
         """
         Initialize hand detector
 
         Args:
             min_detection_confidence: Minimum confidence for hand detection
+            rgb_input: Frames arrive in RGB order (decoded with IMREAD_COLOR_RGB), skip the conversion
         """
+        self.rgb_input = rgb_input
         self.mp_hands = mp.solutions.hands
         self.mp_drawing = mp.solutions.drawing_utils
         self.mp_drawing_styles = mp.solutions.drawing_styles
@@ -27,18 +63,35 @@ class HandDetector:
             max_num_hands=1  # Tek el yeterli - performans için optimize
         )
         
-    def process_frame(self, frame: np.ndarray) -> Dict:
+    def process_frame(self, frame: np.ndarray, roi: Optional[Tuple[int, int, int, int]] = None) -> Dict:
         """
         Process a frame and detect hands (optimized - single pass)
 
         Args:
-            frame: BGR image from OpenCV
+            frame: BGR image from OpenCV (RGB when `rgb_input` is set)
+            roi: Optional (x1, y1, x2, y2) pixel window; only this region is passed
+                to MediaPipe and results are mapped back to full-frame coordinates
 
         Returns:
             Dictionary containing detection results
         """
-        # Convert BGR to RGB
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        h, w = frame.shape[:2]
+        if roi is not None:
+            x1, y1, x2, y2 = roi
+            image = frame[y1:y2, x1:x2]
+            # Kırpılmış normalize koordinat -> tam kare normalize koordinat
+            offset_x, offset_y = x1 / w, y1 / h
+            scale_x, scale_y = (x2 - x1) / w, (y2 - y1) / h
+        else:
+            image = frame
+            offset_x = offset_y = 0.0
+            scale_x = scale_y = 1.0
+
+        # Convert BGR to RGB (RGB decode: only a cropped view needs a contiguous copy)
+        if self.rgb_input:
+            frame_rgb = np.ascontiguousarray(image)
+        else:
+            frame_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
 
         # Process the frame (single pass - no fallback)
         results = self.hands.process(frame_rgb)
@@ -62,16 +115,17 @@ class HandDetector:
             y_coords = []
 
             for landmark in hand_landmarks.landmark:
+                x = offset_x + landmark.x * scale_x
+                y = offset_y + landmark.y * scale_y
                 landmarks.append({
-                    'x': landmark.x,
-                    'y': landmark.y,
-                    'z': landmark.z
+                    'x': x,
+                    'y': y,
+                    'z': landmark.z * scale_x  # z, x ile aynı ölçekte (görüntü genişliği)
                 })
-                x_coords.append(landmark.x)
-                y_coords.append(landmark.y)
+                x_coords.append(x)
+                y_coords.append(y)
 
             # Calculate bounding box
-            h, w, _ = frame.shape
             x_min, x_max = min(x_coords), max(x_coords)
             y_min, y_max = min(y_coords), max(y_coords)
 
@@ -82,8 +136,8 @@ class HandDetector:
                 'y2': int(y_max * h) + 10
             }
 
-            # Normalize coordinates for model input
-            features = self._extract_features(hand_landmarks)
+            # Normalize coordinates for model input (full-frame scale, ROI'den bağımsız)
+            features = normalize_landmarks(x_coords, y_coords)
 
             response.update({
                 'hand_detected': True,
@@ -104,7 +158,6 @@ class HandDetector:
         Returns:
             List of 42 normalized features (21 landmarks × 2 coordinates)
         """
-        data_aux = []
         x_coords = []
         y_coords = []
         
@@ -113,22 +166,7 @@ class HandDetector:
             x_coords.append(landmark.x)
             y_coords.append(landmark.y)
         
-        # Normalize coordinates relative to the hand's bounding box
-        x_min = min(x_coords)
-        y_min = min(y_coords)
-        
-        for landmark in hand_landmarks.landmark:
-            data_aux.append(landmark.x - x_min)
-            data_aux.append(landmark.y - y_min)
-        
-        # Ensure exactly 42 features
-        if len(data_aux) > 42:
-            data_aux = data_aux[:42]
-        elif len(data_aux) < 42:
-            # Pad with zeros if needed (shouldn't happen normally)
-            data_aux.extend([0.0] * (42 - len(data_aux)))
-        
-        return data_aux
+        return normalize_landmarks(x_coords, y_coords)
     
     def draw_landmarks(self, frame: np.ndarray, landmarks: List[Dict]) -> np.ndarray:
         """
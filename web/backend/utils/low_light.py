@@ -0,0 +1,173 @@
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+# cv2.CLAHE nesnesi apply sırasında iç buffer kullanır - thread başına bir kopya
+_clahe_local = threading.local()
+
+def get_clahe(clip_limit: float = 2.0, tile_grid: int = 8):
+    """Return this thread's cached CLAHE operator for the given settings"""
+    key = (clip_limit, tile_grid)
+    cache = getattr(_clahe_local, 'operators', None)
+    if cache is None:
+        cache = _clahe_local.operators = {}
+    clahe = cache.get(key)
+    if clahe is None:
+        clahe = cache[key] = cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=(tile_grid, tile_grid))
+    return clahe
+
+@lru_cache(maxsize=8)
+def gamma_lut(gamma: float) -> np.ndarray:
+    """256-entry uint8 gamma table (gamma > 1.0 brightens), built once per value"""
+    gamma = max(0.5, min(3.0, gamma))
+    table = np.rint(np.power(np.arange(256) / 255.0, 1.0 / gamma) * 255.0).astype(np.uint8)
+    table.flags.writeable = False
+    return table
+
+class _LightState:
+    """Brightness estimate and low-light decision of one session"""
+
+    __slots__ = ('brightness', 'dark', 'countdown')
+
+    def __init__(self, brightness: float, dark: bool):
+        self.brightness = brightness
+        self.dark = dark
+        self.countdown = 0
+
+class LowLightPreprocessor:
+    """
+    Adaptive low-light correction in front of hand detection
+
+    A brightness estimate on a strided sample of the frame (or the motion
+    gate's thumbnail) decides whether the scene is dark. The decision is kept
+    per session and only re-measured every `check_interval` frames, with
+    hysteresis so a session near the threshold does not flicker between
+    modes. Dark frames get CLAHE plus a gamma curve on the luma channel
+    (YCrCb - half the cost of the LAB round trip); well-lit sessions pay only
+    for the occasional brightness probe.
+    """
+
+    def __init__(self, dark_threshold: float = 90.0, hysteresis: float = 10.0, gamma: float = 1.3,
+                 clip_limit: float = 2.0, tile_grid: int = 8, check_interval: int = 10,
+                 sample_stride: int = 8, max_sessions: int = 256, rgb_input: bool = False):
+        """
+        Initialize low-light preprocessor
+
+        Args:
+            dark_threshold: Mean brightness (0-255) below which a session counts as dark
+            hysteresis: Extra brightness a dark session needs before correction stops
+            gamma: Gamma applied to the luma channel (>1.0 brightens)
+            clip_limit: CLAHE clip limit
+            tile_grid: CLAHE tiles per side
+            check_interval: Frames between brightness measurements per session
+            sample_stride: Pixel stride of the brightness sample
+            max_sessions: Sessions tracked per worker (LRU)
+            rgb_input: Frames arrive in RGB order
+        """
+        self.dark_threshold = dark_threshold
+        self.hysteresis = max(0.0, hysteresis)
+        self.gamma = gamma
+        self.clip_limit = clip_limit
+        self.tile_grid = max(1, tile_grid)
+        self.check_interval = max(1, check_interval)
+        self.sample_stride = max(1, sample_stride)
+        self.max_sessions = max(1, max_sessions)
+        self._to_ycrcb = cv2.COLOR_RGB2YCrCb if rgb_input else cv2.COLOR_BGR2YCrCb
+        self._from_ycrcb = cv2.COLOR_YCrCb2RGB if rgb_input else cv2.COLOR_YCrCb2BGR
+        self._lut = gamma_lut(gamma)
+
+        self._states: "OrderedDict[str, _LightState]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            'frames': 0,
+            'brightness_checks': 0,
+            'frames_enhanced': 0,
+            'mode_switches': 0
+        }
+
+    def estimate_brightness(self, frame: np.ndarray, thumbnail: Optional[np.ndarray] = None) -> float:
+        """Mean brightness (0-255) of a grayscale thumbnail or a strided frame sample"""
+        if thumbnail is not None:
+            return float(np.mean(thumbnail))
+        return float(np.mean(frame[::self.sample_stride, ::self.sample_stride]))
+
+    def enhance(self, frame: np.ndarray) -> np.ndarray:
+        """CLAHE + gamma on the luma channel, returned in the input channel order"""
+        ycrcb = cv2.cvtColor(frame, self._to_ycrcb)
+        luma = np.ascontiguousarray(ycrcb[:, :, 0])
+        luma = get_clahe(self.clip_limit, self.tile_grid).apply(luma)
+        ycrcb[:, :, 0] = cv2.LUT(luma, self._lut)
+        return cv2.cvtColor(ycrcb, self._from_ycrcb, dst=ycrcb)
+
+    def process(self, session_id: str, frame: np.ndarray,
+                thumbnail: Optional[np.ndarray] = None) -> Tuple[np.ndarray, bool]:
+        """
+        Correct the frame if the session is in low-light mode
+
+        Args:
+            session_id: Client session ID
+            frame: Decoded frame
+            thumbnail: Optional grayscale thumbnail of the frame (motion gate)
+
+        Returns:
+            Tuple of (frame to detect on, True if it was enhanced)
+        """
+        with self._lock:
+            self._stats['frames'] += 1
+            state = self._states.get(session_id)
+            # Son ölçümden bu yana check_interval dolmadıysa kayıtlı kararı kullan
+            cached = state is not None and state.countdown > 0
+            if state is not None:
+                self._states.move_to_end(session_id)
+            if cached:
+                state.countdown -= 1
+                dark = state.dark
+
+        if not cached:
+            brightness = self.estimate_brightness(frame, thumbnail)
+            with self._lock:
+                self._stats['brightness_checks'] += 1
+                dark = self._update_state(session_id, brightness)
+
+        if not dark:
+            return frame, False
+
+        enhanced = self.enhance(frame)
+        with self._lock:
+            self._stats['frames_enhanced'] += 1
+        return enhanced, True
+
+    def _update_state(self, session_id: str, brightness: float) -> bool:
+        """Record a measurement and return the session's decision (caller holds the lock)"""
+        state = self._states.get(session_id)
+        if state is None:
+            state = _LightState(brightness, brightness < self.dark_threshold)
+            self._states[session_id] = state
+            while len(self._states) > self.max_sessions:
+                self._states.popitem(last=False)
+        else:
+            # Yumuşatılmış parlaklık - tek karelik gölge/patlama kararı çevirmesin
+            state.brightness = 0.5 * state.brightness + 0.5 * brightness
+            limit = self.dark_threshold + self.hysteresis if state.dark else self.dark_threshold
+            dark = state.brightness < limit
+            if dark != state.dark:
+                state.dark = dark
+                self._stats['mode_switches'] += 1
+        state.countdown = self.check_interval - 1
+        return state.dark
+
+    def get_stats(self) -> Dict:
+        """Get preprocessing metrics"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['sessions'] = len(self._states)
+            stats['dark_sessions'] = sum(1 for state in self._states.values() if state.dark)
+        frames = stats['frames']
+        stats['enhance_rate'] = round(stats['frames_enhanced'] / frames * 100, 2) if frames else 0.0
+        stats['dark_threshold'] = self.dark_threshold
+        stats['check_interval'] = self.check_interval
+        return stats
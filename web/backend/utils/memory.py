@@ -0,0 +1,51 @@
+import os
+from typing import Dict
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# /proc/self/smaps_rollup alanları -> rapor anahtarları (kB)
+_SMAPS_FIELDS = {
+    'Rss': 'rss_mb',
+    'Pss': 'pss_mb',
+    'Shared_Clean': 'shared_clean_mb',
+    'Shared_Dirty': 'shared_dirty_mb',
+    'Private_Clean': 'private_clean_mb',
+    'Private_Dirty': 'private_dirty_mb',
+}
+
+def get_memory_usage() -> Dict:
+    """
+    Get the current process' memory usage
+
+    RSS counts pages shared with the gunicorn master and the other workers
+    in full; PSS divides shared pages between the processes mapping them and
+    Private_Dirty is what this worker alone costs. Values are in MB.
+
+    Returns:
+        Dictionary with `pid`, `rss_mb` and (on Linux) PSS / shared / private breakdown
+    """
+    usage = {'pid': os.getpid()}
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                key, _, value = line.partition(':')
+                if key in _SMAPS_FIELDS:
+                    usage[_SMAPS_FIELDS[key]] = round(int(value.split()[0]) / 1024.0, 1)
+    except OSError:
+        # smaps_rollup yok (Linux < 4.14 / macOS) - sadece tepe RSS
+        if resource is None:
+            return usage
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        usage['rss_mb'] = round(maxrss / 1024.0, 1)
+    return usage
+
+def format_memory_usage(usage: Dict) -> str:
+    """One-line summary for logs"""
+    parts = [f"RSS {usage.get('rss_mb', 0):.1f} MB"]
+    if 'pss_mb' in usage:
+        parts.append(f"PSS {usage['pss_mb']:.1f} MB")
+        parts.append(f"private {usage.get('private_dirty_mb', 0):.1f} MB")
+    return ', '.join(parts)
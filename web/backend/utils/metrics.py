@@ -0,0 +1,314 @@
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Saniye - alt-milisaniye aşamalar (cache, serileştirme) ile MediaPipe ayrışsın
+STAGE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+Labels = Tuple[Tuple[str, str], ...]
+# (sample name, labels, value) - histogramlarda _bucket / _sum / _count ayrı sample
+Sample = Tuple[str, Labels, float]
+# (family name, type, HELP, samples)
+Family = Tuple[str, str, Optional[str], List[Sample]]
+
+class Histogram:
+    """Thread-safe fixed-bucket histogram (cumulative buckets, Prometheus style)"""
+
+    def __init__(self, buckets: Sequence[float]):
+        """
+        Initialize histogram
+
+        Args:
+            buckets: Sorted upper bounds; an implicit +Inf bucket is added
+        """
+        self.buckets: List[float] = sorted(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        """Record one observation"""
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> Dict:
+        """
+        Get a consistent copy of the histogram
+
+        Returns:
+            Dictionary with cumulative `buckets` ({upper_bound: count}), `sum` and `count`
+        """
+        with self._lock:
+            counts = list(self._counts)
+            total_sum = self._sum
+            total_count = self._count
+
+        cumulative = {}
+        running = 0
+        for bound, count in zip(self.buckets, counts):
+            running += count
+            cumulative[bound] = running
+        cumulative['+Inf'] = total_count
+
+        return {
+            'buckets': cumulative,
+            'sum': total_sum,
+            'count': total_count,
+            'mean': (total_sum / total_count) if total_count else 0.0
+        }
+
+class StageTimer:
+    """
+    Lap-style stage durations of one request
+
+    `lap(stage)` charges the time since the previous lap (or creation) to
+    `stage`; `skip()` moves the reference point without charging anyone.
+    """
+
+    __slots__ = ('start', '_last', 'durations')
+
+    def __init__(self):
+        self.start = self._last = time.perf_counter()
+        self.durations: Dict[str, float] = {}
+
+    def lap(self, stage: str):
+        """Charge the time since the previous lap to `stage` (seconds, accumulated)"""
+        now = time.perf_counter()
+        self.durations[stage] = self.durations.get(stage, 0.0) + (now - self._last)
+        self._last = now
+
+    def skip(self):
+        """Restart the lap clock without recording"""
+        self._last = time.perf_counter()
+
+    def total(self) -> float:
+        """Seconds since the timer was created"""
+        return time.perf_counter() - self.start
+
+class LabeledHistogram:
+    """Named histogram family - one `Histogram` per label value combination"""
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str],
+                 buckets: Sequence[float] = STAGE_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = buckets
+        self._series: Dict[Tuple[str, ...], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str):
+        """Record one observation for the given label values"""
+        series = self._series.get(label_values)
+        if series is None:
+            with self._lock:
+                series = self._series.setdefault(label_values, Histogram(self.buckets))
+        series.observe(value)
+
+    def collect(self) -> Family:
+        """Histogram family with _bucket / _sum / _count samples of every series"""
+        with self._lock:
+            series = sorted(self._series.items())
+
+        samples: List[Sample] = []
+        for label_values, histogram in series:
+            labels = tuple(zip(self.label_names, label_values))
+            samples.extend(_histogram_samples(self.name, labels, histogram.snapshot()))
+        return self.name, 'histogram', self.help_text, samples
+
+    def render(self) -> List[str]:
+        """Prometheus exposition lines"""
+        return render_families([self.collect()])
+
+class Metrics:
+    """
+    Request/stage histograms and pipeline counters of one worker
+
+    `observe_request` folds a finished `StageTimer` into per-stage and
+    per-endpoint histograms. Counters that other components already keep
+    (caches, motion gate, Redis fallbacks) are read from their `get_stats()`
+    at scrape time and rendered with `render_counter` / `render_gauge`.
+    """
+
+    def __init__(self, buckets: Sequence[float] = STAGE_BUCKETS):
+        self.stage_seconds = LabeledHistogram(
+            'signdesk_stage_duration_seconds', 'Time spent in each prediction pipeline stage.',
+            ('endpoint', 'stage'), buckets)
+        self.request_seconds = LabeledHistogram(
+            'signdesk_request_duration_seconds', 'End-to-end prediction request latency.',
+            ('endpoint',), buckets)
+        self._counters: Dict[Tuple[str, Labels], float] = defaultdict(float)
+        self._help: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def describe(self, name: str, help_text: str):
+        """Set the HELP text of a counter incremented through `inc`"""
+        self._help[name] = help_text
+
+    def observe_request(self, endpoint: str, timer: StageTimer, total: Optional[float] = None):
+        """Fold a finished request's stage durations into the histograms"""
+        for stage, seconds in timer.durations.items():
+            self.stage_seconds.observe(seconds, endpoint, stage)
+        self.request_seconds.observe(timer.total() if total is None else total, endpoint)
+
+    def inc(self, name: str, amount: float = 1.0, **labels: str):
+        """Increment a counter"""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] += amount
+
+    def counters(self) -> Dict[Tuple[str, Labels], float]:
+        """Copy of all counters"""
+        with self._lock:
+            return dict(self._counters)
+
+    def collect(self) -> List[Family]:
+        """Histogram families plus counters incremented through `inc`"""
+        families = [self.request_seconds.collect(), self.stage_seconds.collect()]
+        grouped: Dict[str, List[Tuple[Labels, float]]] = defaultdict(list)
+        for (name, labels), value in sorted(self.counters().items()):
+            grouped[name].append((labels, value))
+        for name, samples in grouped.items():
+            families.append(counter_family(name, self._help.get(name), samples))
+        return families
+
+    def render(self) -> List[str]:
+        """Histograms plus counters incremented through `inc`"""
+        return render_families(self.collect())
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_value(value: float) -> str:
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+def _format_labels(labels: Iterable[Tuple[str, str]]) -> str:
+    labels = list(labels)
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels) + '}'
+
+def _series(sample_name: str, labels: Labels) -> str:
+    return f"{sample_name}{_format_labels(labels)}"
+
+def counter_family(name: str, help_text: Optional[str], samples: Iterable[Tuple[Labels, float]]) -> Family:
+    """Counter family from (labels, value) samples"""
+    return name, 'counter', help_text, [(name, tuple(labels), value) for labels, value in samples]
+
+def gauge_family(name: str, help_text: Optional[str], samples: Iterable[Tuple[Labels, float]]) -> Family:
+    """Gauge family from (labels, value) samples"""
+    return name, 'gauge', help_text, [(name, tuple(labels), value) for labels, value in samples]
+
+def _histogram_samples(name: str, labels: Labels, snapshot: Dict, scale: float = 1.0) -> List[Sample]:
+    """_bucket / _sum / _count samples of a `Histogram.snapshot()` (bounds and sum multiplied by scale)"""
+    samples: List[Sample] = []
+    for bound, count in snapshot['buckets'].items():
+        le = bound if bound == '+Inf' else repr(round(float(bound) * scale, 12))
+        samples.append((f"{name}_bucket", labels + (('le', le),), count))
+    samples.append((f"{name}_sum", labels, snapshot['sum'] * scale))
+    samples.append((f"{name}_count", labels, snapshot['count']))
+    return samples
+
+def histogram_family(name: str, help_text: Optional[str], snapshot: Dict, scale: float = 1.0) -> Family:
+    """
+    Histogram family from a `Histogram.snapshot()`
+
+    Args:
+        name: Family name
+        help_text: HELP text
+        snapshot: Histogram snapshot
+        scale: Unit conversion applied to bucket bounds and sum (e.g. 0.001 for ms -> s)
+    """
+    return name, 'histogram', help_text, _histogram_samples(name, (), snapshot, scale)
+
+def render_families(families: Iterable[Family]) -> List[str]:
+    """Prometheus exposition lines of metric families"""
+    lines = []
+    for name, kind, help_text, samples in families:
+        if help_text:
+            lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for sample_name, labels, value in samples:
+            lines.append(f"{_series(sample_name, labels)} {_format_value(value)}")
+    return lines
+
+def render_counter(name: str, help_text: Optional[str], samples: Iterable[Tuple[Labels, float]]) -> List[str]:
+    """Exposition lines for a counter family given (labels, value) samples"""
+    return render_families([counter_family(name, help_text, samples)])
+
+def render_gauge(name: str, help_text: Optional[str], samples: Iterable[Tuple[Labels, float]]) -> List[str]:
+    """Exposition lines for a gauge family given (labels, value) samples"""
+    return render_families([gauge_family(name, help_text, samples)])
+
+# Fleet-wide aggregation (Redis hash alanı: "<family> <series>")
+
+def flatten_families(families: Iterable[Family], worker_id: str) -> Tuple[Dict[str, float], Dict[str, float]]:
+    """
+    Split families into summable samples and per-worker gauges
+
+    Counter and histogram samples are cumulative, so summing them over
+    workers gives the fleet value (bucket by bucket for histograms). Gauges
+    are not summable and get a `worker` label instead.
+
+    Returns:
+        Tuple of ({field: cumulative value}, {field: gauge value})
+    """
+    counters: Dict[str, float] = {}
+    gauges: Dict[str, float] = {}
+    for name, kind, _, samples in families:
+        for sample_name, labels, value in samples:
+            if kind == 'gauge':
+                gauges[f"{name} {_series(sample_name, labels + (('worker', worker_id),))}"] = value
+            else:
+                counters[f"{name} {_series(sample_name, labels)}"] = value
+    return counters, gauges
+
+def render_fleet(families: Iterable[Family], counters: Dict[str, float], gauges: Dict[str, float]) -> List[str]:
+    """
+    Exposition lines with fleet-wide values
+
+    HELP / TYPE and series order come from this worker's families; series
+    only other workers have seen follow in sorted order.
+
+    Args:
+        families: This worker's families (metadata)
+        counters: Summed samples of all workers ({field: value})
+        gauges: Gauge samples of all live workers ({field: value}, `worker` label included)
+    """
+    by_family: Dict[str, Dict[str, float]] = defaultdict(dict)
+    fleet_kinds: Dict[str, str] = {}
+    for samples, kind in ((counters, 'counter'), (gauges, 'gauge')):
+        for field, value in samples.items():
+            name, _, series = field.partition(' ')
+            by_family[name][series] = value
+            if kind == 'counter' and series.startswith(f"{name}_bucket"):
+                fleet_kinds[name] = 'histogram'
+            else:
+                fleet_kinds.setdefault(name, kind)
+
+    lines = []
+    for name, kind, help_text, samples in families:
+        fleet = by_family.pop(name, {})
+        if help_text:
+            lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        if kind != 'gauge':
+            # Hiç artmamış seriler (ör. boş histogram bucket'ları) Redis'e yazılmaz - 0 olarak döner
+            for sample_name, labels, _ in samples:
+                series = _series(sample_name, labels)
+                lines.append(f"{series} {_format_value(fleet.pop(series, 0))}")
+        for series, value in sorted(fleet.items()):
+            lines.append(f"{series} {_format_value(value)}")
+    # Bu worker'ın henüz hiç üretmediği aileler (ör. ilk `inc` başka worker'da)
+    for name, fleet in sorted(by_family.items()):
+        lines.append(f"# TYPE {name} {fleet_kinds[name]}")
+        for series, value in sorted(fleet.items()):
+            lines.append(f"{series} {_format_value(value)}")
+    return lines
@@ -0,0 +1,95 @@
+"""
+Model loading shared by the gunicorn master and the workers
+
+Kept out of app.py so gunicorn's `on_starting` hook can preload the model
+without importing the Flask app: the master must not open the Redis
+connection, start the breaker probe thread or import MediaPipe, since every
+forked worker would inherit those sockets and (dead) threads.
+"""
+
+import os
+import traceback
+from typing import Optional
+
+from config import Config
+from .predictor import SignLanguagePredictor
+
+# on_starting'de master'da yüklenen model - fork sonrası worker'lar copy-on-write paylaşır
+preloaded_predictor: Optional[SignLanguagePredictor] = None
+
+def resolve_model_path() -> Optional[str]:
+    """Find the pickled model (Config.MODEL_PATH or a known alternative location)"""
+    # Check if model file exists
+    model_path = Config.MODEL_PATH
+    if not os.path.exists(model_path):
+        print(f"⚠️ Model file not found at {model_path}")
+        # Try alternative paths
+        alternative_paths = [
+            './models/combined_model.p',
+            '/app/models/combined_model.p',
+            'models/combined_model.p',
+            '/opt/signdesk/backend/models/combined_model.p',
+            '/opt/signdesk/models/combined_model.p',
+            'C:\\Users\\aslan\\Desktop\\web\\backend\\models\\combined_model.p'
+        ]
+
+        for alt_path in alternative_paths:
+            if os.path.exists(alt_path):
+                print(f"✅ Found model at alternative path: {alt_path}")
+                model_path = alt_path
+                break
+        else:
+            print("❌ Model file not found in any alternative path")
+            print("Available files:")
+            for root, dirs, files in os.walk('.'):
+                for file in files:
+                    if file.endswith('.p') or file.endswith('.pkl'):
+                        print(f"  - {os.path.join(root, file)}")
+            return None
+    return model_path
+
+def load_predictor() -> Optional[SignLanguagePredictor]:
+    """
+    Load the predictor (model + label map)
+
+    Safe to call in the gunicorn master before forking: the model holds only
+    numpy arrays (memory-mapped with MMAP_MODEL for compiled/student models)
+    and starts no threads or MediaPipe graphs.
+
+    Returns:
+        SignLanguagePredictor, or None if no model file was found
+    """
+    model_path = resolve_model_path()
+    if model_path is None:
+        return None
+
+    print(f"🤖 Loading ML Model from {model_path}...")
+    predictor = SignLanguagePredictor(
+        model_path=model_path,
+        labels_dict=Config.LABELS_DICT,
+        top_k=Config.PREDICTION_TOP_K,
+        model_type=Config.MODEL_TYPE,
+        compiled_model_path=Config.COMPILED_MODEL_PATH,
+        student_model_path=Config.STUDENT_MODEL_PATH,
+        mmap_model=Config.MMAP_MODEL
+    )
+    print("✅ Predictor initialized")
+    return predictor
+
+def preload_model() -> bool:
+    """
+    Load the predictor once in the gunicorn master (shared copy-on-write by workers)
+
+    Compiled / student models are plain (memory-mapped) numpy arrays and stay
+    shared; a pickled sklearn model is shared too, but Python object headers
+    get copied as workers touch them.
+    """
+    global preloaded_predictor
+
+    try:
+        preloaded_predictor = load_predictor()
+        return preloaded_predictor is not None
+    except Exception as e:
+        print(f"❌ Error preloading model: {e}")
+        traceback.print_exc()
+        return False
@@ -0,0 +1,131 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+class _GateState:
+    """Reference thumbnail and response of a session's last fully processed frame"""
+
+    __slots__ = ('thumbnail', 'response', 'processed_at', 'skips')
+
+    def __init__(self, thumbnail: np.ndarray, response: Dict):
+        self.thumbnail = thumbnail
+        self.response = response
+        self.processed_at = time.time()
+        self.skips = 0
+
+class MotionGate:
+    """
+    Per-session motion gate in front of hand detection
+
+    Keeps a tiny grayscale thumbnail of the last frame that went through the
+    full pipeline. A thumbnail pixel counts as changed when it differs by more
+    than `pixel_threshold` gray levels (well above area-averaged sensor
+    noise); when the changed fraction stays below `threshold`, the previous
+    response is reused and MediaPipe / the classifier are skipped. A changed
+    fraction rather than a mean difference keeps small local changes such as
+    one finger moving from being averaged away. Comparing against the last
+    processed frame (not the last received one) keeps slow drift from
+    accumulating; `max_skips` and `max_age` force a periodic refresh.
+    """
+
+    def __init__(self, threshold: float = 0.002, pixel_threshold: int = 12, thumbnail_width: int = 64,
+                 max_skips: int = 10, max_age: float = 1.0, max_sessions: int = 256, rgb_input: bool = False):
+        """
+        Initialize motion gate
+
+        Args:
+            threshold: Changed-pixel fraction below which a frame counts as static
+            pixel_threshold: Gray-level difference for a thumbnail pixel to count as changed
+            thumbnail_width: Thumbnail width in pixels (height keeps the aspect ratio)
+            max_skips: Consecutive skipped frames before a full pass is forced
+            max_age: Seconds after which the reference response is refreshed
+            max_sessions: Sessions tracked per worker (LRU)
+            rgb_input: Frames arrive in RGB order
+        """
+        self.threshold = threshold
+        self.pixel_threshold = pixel_threshold
+        self.thumbnail_width = max(4, thumbnail_width)
+        self.max_skips = max(0, max_skips)
+        self.max_age = max_age
+        self.max_sessions = max(1, max_sessions)
+        self._gray_code = cv2.COLOR_RGB2GRAY if rgb_input else cv2.COLOR_BGR2GRAY
+
+        self._states: "OrderedDict[str, _GateState]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            'frames_checked': 0,
+            'frames_skipped': 0,
+            'forced_refreshes': 0
+        }
+
+    def make_thumbnail(self, frame: np.ndarray) -> np.ndarray:
+        """Downsample (strided, then area average) and convert to grayscale"""
+        height, width = frame.shape[:2]
+        thumb_height = max(1, round(height * self.thumbnail_width / width))
+        # Büyük karelerde INTER_AREA pahalı - önce ucuz adımlı alt örnekleme (~4x hedef)
+        stride = max(1, width // (self.thumbnail_width * 4))
+        if stride > 1:
+            frame = frame[::stride, ::stride]
+        small = cv2.resize(frame, (self.thumbnail_width, thumb_height), interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, self._gray_code)
+        return small
+
+    def check(self, session_id: str, frame: np.ndarray) -> Tuple[np.ndarray, Optional[Dict]]:
+        """
+        Compare a frame with the session's reference
+
+        Args:
+            session_id: Client session ID
+            frame: Decoded frame
+
+        Returns:
+            Tuple of (thumbnail for `update`, previous response copy or None if the frame must be processed)
+        """
+        thumbnail = self.make_thumbnail(frame)
+        now = time.time()
+
+        with self._lock:
+            self._stats['frames_checked'] += 1
+            state = self._states.get(session_id)
+            if state is None or state.thumbnail.shape != thumbnail.shape:
+                return thumbnail, None
+            self._states.move_to_end(session_id)
+
+            if state.skips >= self.max_skips or now - state.processed_at > self.max_age:
+                self._stats['forced_refreshes'] += 1
+                return thumbnail, None
+
+            difference = cv2.absdiff(thumbnail, state.thumbnail)
+            changed = np.count_nonzero(difference > self.pixel_threshold) / difference.size
+            if changed >= self.threshold:
+                return thumbnail, None
+
+            state.skips += 1
+            self._stats['frames_skipped'] += 1
+            return thumbnail, dict(state.response)
+
+    def update(self, session_id: str, thumbnail: np.ndarray, response: Dict):
+        """Store the reference thumbnail and response of a fully processed frame"""
+        with self._lock:
+            self._states[session_id] = _GateState(thumbnail, dict(response))
+            self._states.move_to_end(session_id)
+            while len(self._states) > self.max_sessions:
+                self._states.popitem(last=False)
+
+    def get_stats(self) -> Dict:
+        """Get gate metrics"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['sessions'] = len(self._states)
+        checked = stats['frames_checked']
+        stats['skip_rate'] = round(stats['frames_skipped'] / checked * 100, 2) if checked else 0.0
+        stats['threshold'] = self.threshold
+        stats['pixel_threshold'] = self.pixel_threshold
+        stats['max_skips'] = self.max_skips
+        stats['max_age'] = self.max_age
+        return stats
@@ -1,43 +1,96 @@
 import pickle
+import threading
+import time
 import numpy as np
+from collections import deque
 from typing import Optional, Dict, List
 import os
 
+from .metrics import Histogram
+from .compiled_model import CompiledEnsemble, compile_model
+from .student_model import StudentMLP
+
+MODEL_TYPES = ('sklearn', 'compiled', 'student')
+
 class SignLanguagePredictor:
     """Sign language prediction model wrapper"""
     
-    def __init__(self, model_path: str, labels_dict: Dict[int, str]):
+    def __init__(self, model_path: str, labels_dict: Dict[int, str], top_k: int = 3,
+                 model_type: str = 'sklearn', compiled_model_path: Optional[str] = None,
+                 student_model_path: Optional[str] = None, mmap_model: bool = False):
         """
         Initialize predictor
         
         Args:
             model_path: Path to the pickled model file
             labels_dict: Dictionary mapping label indices to letters
+            top_k: Number of alternatives returned with each prediction (<=1 disables)
+            model_type: 'sklearn' (pickled model), 'compiled' (NumPy engine) or 'student' (distilled MLP)
+            compiled_model_path: Path to the compiled .npz artifact (compiled type)
+            student_model_path: Path to the distilled student .npz (student type)
+            mmap_model: Memory-map the compiled / student artifact read-only (shared across forked workers)
         """
+        if model_type not in MODEL_TYPES:
+            raise ValueError(f"Unknown model type: {model_type} (expected one of {MODEL_TYPES})")
+        
         self.model = None
+        self.classes = None
         self.model_path = model_path
+        self.compiled_model_path = compiled_model_path
+        self.student_model_path = student_model_path
+        self.mmap_model = mmap_model
+        self.model_type = model_type
         self.labels_dict = labels_dict
+        self.top_k = top_k
         self._load_model()
     
     def _load_model(self):
-        """Load the trained model from pickle file"""
+        """Load the trained model (pickle, compiled artifact or student)"""
         try:
-            if not os.path.exists(self.model_path):
-                raise FileNotFoundError(f"Model file not found: {self.model_path}")
+            if self.model_type == 'student':
+                # Öğrenci model pickle'dan türetilemez - train_classifier.py ile üretilir
+                if not self.student_model_path or not os.path.exists(self.student_model_path):
+                    raise FileNotFoundError(f"Student model file not found: {self.student_model_path}")
+                self.model = StudentMLP.load(self.student_model_path, mmap=self.mmap_model)
+                print(f"✅ Student model loaded from {self.student_model_path}"
+                      f"{' (memory-mapped)' if self.mmap_model else ''}")
+            elif self.model_type == 'compiled' and self.compiled_model_path and os.path.exists(self.compiled_model_path):
+                self.model = CompiledEnsemble.load(self.compiled_model_path, mmap=self.mmap_model)
+                print(f"✅ Compiled model loaded from {self.compiled_model_path}"
+                      f"{' (memory-mapped)' if self.mmap_model else ''}")
+            else:
+                self.model = self._load_pickled_model()
+                if self.model_type == 'compiled':
+                    # Artifact yok - pickle'dan bellekte derle
+                    try:
+                        self.model = compile_model(self.model)
+                        print("✅ Model compiled in memory (run compile_model.py to cache the artifact)")
+                    except NotImplementedError as e:
+                        print(f"⚠️ Model cannot be compiled ({e}), using sklearn model")
+                        self.model_type = 'sklearn'
             
-            with open(self.model_path, 'rb') as f:
-                model_dict = pickle.load(f)
-            
-            self.model = model_dict['model']
-            print(f"✅ Model loaded successfully from {self.model_path}")
+            # predict_proba sütun sırası -> label index
+            self.classes = np.asarray(getattr(self.model, 'classes_', np.arange(len(self.labels_dict))))
+            print(f"✅ Model ready ({self.model_type})")
             
         except Exception as e:
             print(f"❌ Error loading model: {e}")
             raise
     
+    def _load_pickled_model(self):
+        """Load the trained sklearn model from pickle file"""
+        if not os.path.exists(self.model_path):
+            raise FileNotFoundError(f"Model file not found: {self.model_path}")
+        
+        with open(self.model_path, 'rb') as f:
+            model_dict = pickle.load(f)
+        
+        print(f"✅ Model loaded successfully from {self.model_path}")
+        return model_dict['model']
+    
     def predict(self, features: List[float]) -> Dict:
         """
-        Make prediction from hand landmark features (optimized)
+        Make prediction from hand landmark features (single model pass)
 
         Args:
             features: List of 42 normalized hand landmark features
@@ -51,41 +104,95 @@ class SignLanguagePredictor:
         if len(features) != 42:
             raise ValueError(f"Expected 42 features, got {len(features)}")
 
-        try:
-            # Convert to numpy array (float32 daha hızlı)
-            features_array = np.asarray(features, dtype=np.float32).reshape(1, -1)
+        # Convert to numpy array (float32 daha hızlı)
+        features_array = np.asarray(features, dtype=np.float32).reshape(1, -1)
+        return self._classify(features_array)[0]
+    
+    def predict_batch(self, features_list: List[List[float]]) -> List[Dict]:
+        """
+        Make predictions for many feature vectors with a single model call
+
+        Args:
+            features_list: List of 42-feature vectors
+
+        Returns:
+            List of prediction dictionaries (same shape as `predict`)
+        """
+        if self.model is None:
+            raise RuntimeError("Model not loaded")
 
-            # Make prediction
-            prediction = self.model.predict(features_array)
-            label_index = int(prediction[0])
+        if not features_list:
+            return []
 
-            # Get the letter
-            letter = self.labels_dict.get(label_index, None)
+        for features in features_list:
+            if len(features) != 42:
+                raise ValueError(f"Expected 42 features, got {len(features)}")
 
-            # Get real confidence from model probabilities
+        # Stack into a single (N, 42) array - tek predict_proba çağrısı
+        features_array = np.asarray(features_list, dtype=np.float32)
+        return self._classify(features_array)
+    
+    def _classify(self, features_array: np.ndarray) -> List[Dict]:
+        """
+        Run the model once and derive label, confidence and top-k from the probabilities
+
+        A soft-voting ensemble computes predict() as argmax(predict_proba()), so
+        calling both would run every base estimator twice.
+
+        Args:
+            features_array: (N, 42) float32 array
+
+        Returns:
+            List of N prediction dictionaries
+        """
+        try:
             try:
                 probabilities = self.model.predict_proba(features_array)
-                confidence = float(np.max(probabilities))
             except Exception:
                 # Fallback to predict if predict_proba not available
-                confidence = 0.85
+                label_indices = self.model.predict(features_array)
+                return [self._build_result(int(label_index), 0.85, None) for label_index in label_indices]
 
-            return {
-                'success': True,
-                'letter': letter,
-                'label_index': label_index,
-                'confidence': confidence,
-                'error': None
-            }
+            probabilities = np.asarray(probabilities)
+            best = np.argmax(probabilities, axis=1)
+            results = []
+            for row, best_index in zip(probabilities, best):
+                top_k = None
+                if self.top_k > 1:
+                    k = min(self.top_k, row.shape[0])
+                    top_indices = np.argpartition(row, -k)[-k:]
+                    top_indices = top_indices[np.argsort(row[top_indices])[::-1]]
+                    top_k = [self._build_entry(int(self.classes[i]), float(row[i])) for i in top_indices]
+                results.append(self._build_result(int(self.classes[best_index]), float(row[best_index]), top_k))
+            return results
 
         except Exception as e:
-            return {
+            return [{
                 'success': False,
                 'letter': None,
                 'label_index': None,
                 'confidence': 0.0,
+                'top_k': None,
                 'error': str(e)
-            }
+            } for _ in range(len(features_array))]
+    
+    def _build_entry(self, label_index: int, confidence: float) -> Dict:
+        """Build one {letter, label_index, confidence} entry"""
+        return {
+            'letter': self.labels_dict.get(label_index, None),
+            'label_index': label_index,
+            'confidence': confidence
+        }
+    
+    def _build_result(self, label_index: int, confidence: float, top_k: Optional[List[Dict]]) -> Dict:
+        """Build a successful prediction result"""
+        result = self._build_entry(label_index, confidence)
+        result.update({
+            'success': True,
+            'top_k': top_k,
+            'error': None
+        })
+        return result
     
     def get_labels(self) -> Dict[int, str]:
         """Get the labels dictionary"""
@@ -93,4 +200,150 @@ class SignLanguagePredictor:
     
     def is_loaded(self) -> bool:
         """Check if model is loaded"""
-        return self.model is not None
\ No newline at end of file
+        return self.model is not None
+
+# Histogram bucket'ları - batch boyutu ve kuyrukta bekleme süresi (ms)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+BATCH_WAIT_MS_BUCKETS = (0.5, 1, 2, 3, 5, 10, 25, 50)
+
+class _PendingPrediction:
+    """One caller's feature vector waiting for its batch"""
+
+    __slots__ = ('features', 'enqueued_at', 'event', 'result')
+
+    def __init__(self, features: List[float]):
+        self.features = features
+        self.enqueued_at = time.monotonic()
+        self.event = threading.Event()
+        self.result = None
+
+class MicroBatchScheduler:
+    """
+    Cross-request micro-batching in front of SignLanguagePredictor
+
+    Concurrent callers (threaded Flask / gthread workers) each submit one
+    feature vector; a background thread collects them for at most
+    `max_wait_ms` (or until `max_batch_size` is reached), runs a single
+    vectorized `predict_batch` and wakes every caller with its own result.
+    """
+
+    def __init__(self, predictor: SignLanguagePredictor, max_batch_size: int = 16, max_wait_ms: float = 3.0):
+        """
+        Initialize scheduler
+
+        Args:
+            predictor: Loaded SignLanguagePredictor
+            max_batch_size: Maximum rows per model call
+            max_wait_ms: Maximum time the first queued request waits for company
+        """
+        self.predictor = predictor
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+
+        self.batch_size_histogram = Histogram(BATCH_SIZE_BUCKETS)
+        self.wait_time_histogram = Histogram(BATCH_WAIT_MS_BUCKETS)
+
+        self._queue = deque()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopped = False
+        # Batcher takılırsa (thread öldü / model kilitlendi) istek sonsuza kadar beklemesin
+        self.wait_timeout = max(1.0, self.max_wait * 100)
+        self.fallbacks = 0
+
+    def predict(self, features: List[float]) -> Dict:
+        """
+        Queue one feature vector and block until its batch has been classified
+
+        Falls back to a direct `predictor.predict` call if the batch does not
+        come back within `wait_timeout` seconds.
+
+        Args:
+            features: List of 42 normalized hand landmark features
+
+        Returns:
+            Dictionary containing prediction results (same shape as SignLanguagePredictor.predict)
+        """
+        if len(features) != 42:
+            raise ValueError(f"Expected 42 features, got {len(features)}")
+
+        item = _PendingPrediction(features)
+        with self._condition:
+            # Thread lazily started - gunicorn fork'undan sonra ilk istekte oluşur
+            if self._thread is None or not self._thread.is_alive():
+                self._stopped = False
+                self._thread = threading.Thread(target=self._run, name='predict-batcher', daemon=True)
+                self._thread.start()
+            self._queue.append(item)
+            self._condition.notify()
+
+        if item.event.wait(self.wait_timeout):
+            return item.result
+
+        # Süre doldu - kuyruktan çek (hâlâ oradaysa) ve doğrudan sınıflandır
+        with self._condition:
+            try:
+                self._queue.remove(item)
+            except ValueError:
+                pass
+            self.fallbacks += 1
+        return self.predictor.predict(features)
+
+    def _run(self):
+        """Background loop - collect, classify, dispatch"""
+        while True:
+            with self._condition:
+                while not self._queue and not self._stopped:
+                    self._condition.wait()
+                if self._stopped and not self._queue:
+                    return
+
+                # Wait is bounded by the oldest request's deadline
+                deadline = self._queue[0].enqueued_at + self.max_wait
+                while len(self._queue) < self.max_batch_size and not self._stopped:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+                batch_len = min(len(self._queue), self.max_batch_size)
+                batch = [self._queue.popleft() for _ in range(batch_len)]
+
+            dispatched_at = time.monotonic()
+            try:
+                results = self.predictor.predict_batch([item.features for item in batch])
+            except Exception as e:
+                results = [{
+                    'success': False,
+                    'letter': None,
+                    'label_index': None,
+                    'confidence': 0.0,
+                    'top_k': None,
+                    'error': str(e)
+                } for _ in batch]
+
+            self.batch_size_histogram.observe(len(batch))
+            for item, result in zip(batch, results):
+                self.wait_time_histogram.observe((dispatched_at - item.enqueued_at) * 1000.0)
+                item.result = result
+                item.event.set()
+
+    def get_stats(self) -> Dict:
+        """Get batch-size and wait-time histograms"""
+        return {
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000.0,
+            'queue_depth': len(self._queue),
+            'wait_timeout_s': self.wait_timeout,
+            'fallbacks': self.fallbacks,
+            'batch_size': self.batch_size_histogram.snapshot(),
+            'wait_time_ms': self.wait_time_histogram.snapshot()
+        }
+
+    def close(self):
+        """Stop the background thread after draining queued requests"""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
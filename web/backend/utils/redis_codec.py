@@ -0,0 +1,149 @@
+"""
+Redis payload encoding
+
+Values used to be `json.dumps(..., default=str)` text. `RedisCodec` can encode
+them with msgpack (when installed) and packs landmark lists - 21 {x, y}
+dicts in every cached prediction - into one float64 block instead of 42
+map entries. Payloads above `compress_threshold` bytes are zlib-compressed.
+
+Every non-JSON payload starts with a 3-byte header: format version, codec
+and compression flag. Bytes below 0x20 can never start a JSON document, so
+untagged values are read as the original JSON format. New workers therefore
+read what old workers wrote. Old workers cannot read tagged values, so a
+rolling upgrade runs with the default `REDIS_SERIALIZER=json` and no
+compression (untagged, readable by both); operators opt in to msgpack and
+compression once every worker is upgraded.
+"""
+
+import json
+import logging
+import struct
+import zlib
+from typing import Any
+
+try:
+    import msgpack
+except ImportError:  # opsiyonel - yoksa JSON
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+_CODEC_JSON = ord('j')
+_CODEC_MSGPACK = ord('m')
+_FLAG_RAW = ord('-')
+_FLAG_ZLIB = ord('z')
+
+# msgpack ext tipleri - landmark listeleri tek float64 bloğu olarak
+_EXT_LANDMARKS_XY = 1
+_EXT_LANDMARKS_XYZ = 2
+_LANDMARK_KEYS = {
+    _EXT_LANDMARKS_XY: ('x', 'y'),
+    _EXT_LANDMARKS_XYZ: ('x', 'y', 'z'),
+}
+
+def _default(value):
+    """Fallback for values the encoder does not know (NumPy arrays/scalars, datetimes)"""
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return str(value)
+
+def _landmark_ext(items: list):
+    """Pack a list of float {x, y} / {x, y, z} dicts, or return None if the list has another shape"""
+    first = items[0]
+    if not isinstance(first, dict):
+        return None
+    keys = tuple(first)
+    code = next((code for code, names in _LANDMARK_KEYS.items() if names == keys), None)
+    if code is None:
+        return None
+    values = []
+    for item in items:
+        if not isinstance(item, dict) or tuple(item) != keys:
+            return None
+        values.extend(item.values())
+    # Sadece hepsi float ise - int değerler geri okununca float'a dönmesin
+    if not all(isinstance(value, float) for value in values):
+        return None
+    return msgpack.ExtType(code, struct.pack(f'<{len(values)}d', *values))
+
+def _pack_landmarks(value):
+    """Replace landmark lists (at any depth) with ext blocks before msgpack encoding"""
+    if isinstance(value, dict):
+        return {key: _pack_landmarks(item) for key, item in value.items()}
+    if isinstance(value, list) and value:
+        packed = _landmark_ext(value)
+        if packed is not None:
+            return packed
+        return [_pack_landmarks(item) for item in value]
+    return value
+
+def _ext_hook(code: int, data: bytes):
+    names = _LANDMARK_KEYS.get(code)
+    if names is None:
+        return msgpack.ExtType(code, data)
+    values = struct.unpack(f'<{len(data) // 8}d', data)
+    width = len(names)
+    return [dict(zip(names, values[i:i + width])) for i in range(0, len(values), width)]
+
+class RedisCodec:
+    """Serializer for values stored in Redis (msgpack or JSON, optional zlib)"""
+
+    def __init__(self, serializer: str = 'json', compress_threshold: int = 0, compress_level: int = 1):
+        """
+        Initialize codec
+
+        Args:
+            serializer: 'msgpack' or 'json' (msgpack falls back to json when not installed)
+            compress_threshold: Encoded size in bytes above which zlib is applied (0 disables)
+            compress_level: zlib level (1 = fastest)
+        """
+        serializer = (serializer or 'json').lower()
+        if serializer == 'msgpack' and msgpack is None:
+            logger.warning("⚠️ msgpack not installed - Redis payloads stay JSON")
+            serializer = 'json'
+        if serializer not in ('msgpack', 'json'):
+            raise ValueError(f"Unknown Redis serializer: {serializer}")
+        self.serializer = serializer
+        self.compress_threshold = max(0, compress_threshold)
+        self.compress_level = compress_level
+
+    def encode(self, value: Any) -> bytes:
+        """Serialize a value (tagged unless it is plain JSON)"""
+        if self.serializer == 'msgpack':
+            payload = msgpack.packb(_pack_landmarks(value), default=_default, use_bin_type=True)
+            codec = _CODEC_MSGPACK
+        else:
+            payload = json.dumps(value, default=_default, separators=(',', ':')).encode('utf-8')
+            codec = _CODEC_JSON
+
+        if self.compress_threshold and len(payload) > self.compress_threshold:
+            compressed = zlib.compress(payload, self.compress_level)
+            if len(compressed) < len(payload):
+                return bytes((FORMAT_VERSION, codec, _FLAG_ZLIB)) + compressed
+
+        if codec == _CODEC_JSON:
+            # Etiketsiz JSON - eski worker'lar da okuyabilir
+            return payload
+        return bytes((FORMAT_VERSION, codec, _FLAG_RAW)) + payload
+
+    def decode(self, data) -> Any:
+        """Deserialize a tagged payload or a legacy JSON string"""
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        if not data or data[0] >= 0x20:
+            return json.loads(data)
+
+        version, codec, flag = data[0], data[1], data[2]
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported Redis payload version: {version}")
+        payload = data[3:]
+        if flag == _FLAG_ZLIB:
+            payload = zlib.decompress(payload)
+        if codec == _CODEC_MSGPACK:
+            if msgpack is None:
+                raise ValueError("msgpack payload but msgpack is not installed")
+            return msgpack.unpackb(payload, raw=False, strict_map_key=False, ext_hook=_ext_hook)
+        if codec == _CODEC_JSON:
+            return json.loads(payload)
+        raise ValueError(f"Unknown Redis payload codec: {codec}")
@@ -1,21 +1,113 @@
 import redis
-import json
+import os
 import time
 import logging
-from typing import Optional, Dict, Any, List
+import random
+import threading
+from collections import defaultdict
+from typing import Optional, Dict, Any, List, Tuple
 from config import Config
+from utils.redis_codec import RedisCodec
 
 logger = logging.getLogger(__name__)
 
+# Session düzeni: session:{id} hash'i (alan başına JSON) + sınırlı geçmiş listeleri (en yeni başta)
+PREDICTIONS_SUFFIX = ':predictions'
+WORDS_SUFFIX = ':words'
+MAX_SESSION_PREDICTIONS = 50
+MAX_SESSION_WORDS = 100
+# Son aktiviteye göre sıralı session indeksi (sorted set) - süre dolumu taraması blob okumaz
+SESSION_ACTIVITY_KEY = 'sessions:activity'
+
+# Boşta kalan session'ları atomik sil: skor script içinde okunur, arada yazılan session silinmez.
+# Session anahtarları KEYS'te değil - tek Redis (cluster değil) varsayımı.
+SWEEP_IDLE_SESSIONS_SCRIPT = """
+local ids = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+for _, id in ipairs(ids) do
+    local key = 'session:' .. id
+    redis.call('DEL', key, key .. ARGV[3], key .. ARGV[4])
+    redis.call('ZREM', KEYS[1], id)
+end
+return #ids
+"""
+
+def new_session_data() -> Dict[str, Any]:
+    """Default session dictionary (fields missing from the Redis hash take these values)"""
+    now = time.time()
+    return {
+        'created_at': now,
+        'last_activity': now,
+        'request_count': 0,
+        'total_time': 0.0,
+        'user_data': {},
+        'predictions': [],
+        'word_history': [],
+        'settings': {
+            'confidence_threshold': 0.5,
+            'letter_delay': 3000,
+            'language': 'tr'
+        }
+    }
+
 class RedisManager:
     """Redis connection and session management"""
     
     def __init__(self):
         self.redis_client = None
         self.connection_pool = None
-        self._connect()
+        self.codec = RedisCodec(
+            serializer=Config.REDIS_SERIALIZER,
+            compress_threshold=Config.REDIS_COMPRESS_THRESHOLD
+        )
+        # Redis'e ulaşılamadığı (fallback) veya komutun hata verdiği çağrılar, işlem bazında
+        self._stats = {'fallbacks': defaultdict(int), 'errors': defaultdict(int)}
+        self._stats_lock = threading.Lock()
+        
+        # Circuit breaker - açıkken tüm çağrılar anında in-memory fallback'e düşer,
+        # arka plan probe'u üstel backoff ile yeniden bağlanmayı dener
+        self._circuit_open = False
+        self._circuit_lock = threading.Lock()
+        self._probe_thread = None
+        self._retry_delay = Config.REDIS_BREAKER_BASE_DELAY
+        self._next_probe_at = 0.0
+        self._breaker_stats = {'trips': 0, 'probe_failures': 0, 'recoveries': 0}
+        
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork)
+        
+        if not self._connect():
+            self._trip("initial connection failed")
+    
+    def _after_fork(self):
+        """Reset breaker locks in a forked worker (the parent's probe thread does not survive fork)"""
+        self._circuit_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._probe_thread = None
+    
+    def _record(self, kind: str, operation: str):
+        """Count a fallback / error for an operation"""
+        with self._stats_lock:
+            self._stats[kind][operation] += 1
+    
+    def _record_error(self, operation: str, error: Exception):
+        """Count a command error; connection-level errors open the circuit"""
+        self._record('errors', operation)
+        if isinstance(error, (redis.exceptions.ConnectionError, redis.exceptions.TimeoutError)):
+            self._trip(f"{operation}: {error}")
     
-    def _connect(self):
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-operation fallback and error counts plus circuit breaker state"""
+        with self._stats_lock:
+            stats = {kind: dict(counts) for kind, counts in self._stats.items()}
+        with self._circuit_lock:
+            stats['circuit'] = dict(self._breaker_stats,
+                                    state='open' if self._circuit_open else 'closed',
+                                    retry_delay=round(self._retry_delay, 2),
+                                    next_probe_in=round(max(0.0, self._next_probe_at - time.time()), 2)
+                                    if self._circuit_open else 0.0)
+        return stats
+    
+    def _connect(self) -> bool:
         """Establish Redis connection with fallback"""
         try:
             # Create connection pool
@@ -37,287 +129,613 @@ class RedisManager:
             # Test connection
             self.redis_client.ping()
             logger.info("✅ Redis connected successfully")
+            return True
 
         except Exception as e:
             logger.warning(f"⚠️ Redis connection failed: {e}")
             logger.info("🔄 Falling back to in-memory storage")
-            self.redis_client = None
+            return False
     
-    def _ensure_connection(self):
-        """Ensure Redis connection is active"""
-        if not self.is_connected():
-            self._connect()
-        elif self.redis_client:
-            try:
-                self.redis_client.ping()
-            except:
-                logger.warning("🔄 Redis connection lost, reconnecting...")
-                self._connect()
+    def _trip(self, reason: str):
+        """Open the circuit and make sure the health probe is running"""
+        with self._circuit_lock:
+            if not self._circuit_open:
+                self._circuit_open = True
+                self._breaker_stats['trips'] += 1
+                self._retry_delay = Config.REDIS_BREAKER_BASE_DELAY
+                self._next_probe_at = time.time() + self._retry_delay
+                logger.warning(f"⚡ Redis circuit opened ({reason}) - using in-memory fallback")
+            self._start_probe()
     
-    def is_connected(self):
-        """Check if Redis is connected"""
+    def _start_probe(self):
+        """Start the health probe thread if it is not running (caller holds _circuit_lock)"""
+        # Fork sonrası (gunicorn) ebeveynin thread'i çocukta çalışmaz - is_alive False döner
+        if self._probe_thread is not None and self._probe_thread.is_alive():
+            return
+        self._probe_thread = threading.Thread(target=self._probe_loop, name="redis-health-probe", daemon=True)
+        self._probe_thread.start()
+    
+    def _probe_loop(self):
+        """Retry the connection with exponential backoff until Redis answers"""
+        while True:
+            with self._circuit_lock:
+                if not self._circuit_open:
+                    return
+                wait = self._next_probe_at - time.time()
+            if wait > 0:
+                time.sleep(wait)
+                continue
+            
+            if self._probe():
+                with self._circuit_lock:
+                    self._circuit_open = False
+                    self._breaker_stats['recoveries'] += 1
+                    self._retry_delay = Config.REDIS_BREAKER_BASE_DELAY
+                logger.info("✅ Redis circuit closed - Redis reachable again")
+                return
+            
+            with self._circuit_lock:
+                self._breaker_stats['probe_failures'] += 1
+                self._retry_delay = min(self._retry_delay * 2, Config.REDIS_BREAKER_MAX_DELAY)
+                # Jitter - worker'lar Redis'e aynı anda yüklenmesin
+                self._next_probe_at = time.time() + self._retry_delay * random.uniform(0.8, 1.2)
+    
+    def _probe(self) -> bool:
+        """One health check: PING on the existing client, reconnect if there is none"""
+        if self.redis_client is None:
+            return self._connect()
         try:
-            if self.redis_client:
-                self.redis_client.ping()
-                return True
-        except:
-            pass
-        return False
+            self.redis_client.ping()
+            return True
+        except Exception:
+            return False
+    
+    def is_connected(self):
+        """Check if Redis is usable (no round-trip - reflects the circuit breaker state)"""
+        if self.redis_client is None or self._circuit_open:
+            if self._circuit_open and (self._probe_thread is None or not self._probe_thread.is_alive()):
+                with self._circuit_lock:
+                    self._start_probe()
+            return False
+        return True
+    
+    @staticmethod
+    def _session_keys(session_id: str) -> Tuple[str, str, str]:
+        """Hash, prediction list and word list keys of a session"""
+        key = f"session:{session_id}"
+        return key, f"{key}{PREDICTIONS_SUFFIX}", f"{key}{WORDS_SUFFIX}"
+    
+    def _queue_session_fields(self, pipe, session_id: str, fields: Dict[str, Any]):
+        """Queue a session write on a pipeline (scalar/dict fields -> hash, history -> capped lists)"""
+        key, predictions_key, words_key = self._session_keys(session_id)
+        fields = dict(fields)
+        for field, list_key, limit in (('predictions', predictions_key, MAX_SESSION_PREDICTIONS),
+                                       ('word_history', words_key, MAX_SESSION_WORDS)):
+            if field in fields:
+                # Liste başı en yeni kayıt - eski sırayı (eskiden yeniye) tersten it
+                items = (fields.pop(field) or [])[-limit:]
+                pipe.delete(list_key)
+                if items:
+                    pipe.lpush(list_key, *[self.codec.encode(item) for item in items])
+        if fields:
+            pipe.hset(key, mapping={field: self.codec.encode(value) for field, value in fields.items()})
+    
+    def _queue_expire(self, pipe, session_id: str, ttl: Optional[int] = None):
+        """Queue the sliding TTL refresh of all session keys and the activity index update"""
+        ttl = ttl or Config.REDIS_SESSION_TTL
+        for key in self._session_keys(session_id):
+            pipe.expire(key, ttl)
+        pipe.zadd(SESSION_ACTIVITY_KEY, {session_id: time.time()})
+    
+    def _migrate_legacy_session(self, session_id: str):
+        """Convert a session stored as one JSON string (older layout) to hash + lists"""
+        key = f"session:{session_id}"
+        raw = self.redis_client.get(key)
+        ttl = self.redis_client.ttl(key)
+        data = self.codec.decode(raw) if raw else {}
+        # Listeler her durumda yeniden yazılsın (yarım kalmış yazımın kopyaları temizlenir)
+        data.setdefault('predictions', [])
+        data.setdefault('word_history', [])
+        pipe = self.redis_client.pipeline(transaction=True)
+        pipe.delete(key)
+        self._queue_session_fields(pipe, session_id, data)
+        self._queue_expire(pipe, session_id, ttl if ttl and ttl > 0 else None)
+        pipe.execute()
+        logger.info(f"🔄 Migrated legacy session {session_id} to hash layout")
+    
+    def _execute_session(self, session_id: str, build) -> List[Any]:
+        """Run build(pipe) + execute, migrating a legacy string session once on WRONGTYPE"""
+        for attempt in range(2):
+            pipe = self.redis_client.pipeline(transaction=True)
+            build(pipe)
+            try:
+                return pipe.execute()
+            except redis.exceptions.ResponseError as e:
+                if attempt or 'WRONGTYPE' not in str(e):
+                    raise
+                self._migrate_legacy_session(session_id)
     
     def set_session_data(self, session_id: str, data: Dict[str, Any], ttl: Optional[int] = None) -> bool:
-        """Set session data in Redis"""
+        """Replace session data in Redis"""
         try:
-            self._ensure_connection()
             if not self.is_connected():
+                self._record('fallbacks', 'set_session_data')
                 return False
             
-            key = f"session:{session_id}"
-            ttl = ttl or Config.REDIS_SESSION_TTL
-            
-            # Serialize data
-            serialized_data = json.dumps(data, default=str)
+            def build(pipe):
+                pipe.delete(*self._session_keys(session_id))
+                self._queue_session_fields(pipe, session_id, data)
+                self._queue_expire(pipe, session_id, ttl)
             
-            # Set with TTL
-            result = self.redis_client.setex(key, ttl, serialized_data)
-            return bool(result)
+            self._execute_session(session_id, build)
+            return True
             
         except Exception as e:
+            self._record_error('set_session_data', e)
             logger.error(f"❌ Redis set_session_data error: {e}")
             return False
     
     def get_session_data(self, session_id: str) -> Optional[Dict[str, Any]]:
-        """Get session data from Redis"""
+        """Get session data from Redis (reassembled into the single-dict shape)"""
         try:
-            self._ensure_connection()
             if not self.is_connected():
+                self._record('fallbacks', 'get_session_data')
                 return None
             
-            key = f"session:{session_id}"
-            data = self.redis_client.get(key)
+            key, predictions_key, words_key = self._session_keys(session_id)
             
-            if data:
-                return json.loads(data)
-            return None
+            def build(pipe):
+                pipe.hgetall(key)
+                pipe.lrange(predictions_key, 0, -1)
+                pipe.lrange(words_key, 0, -1)
+            
+            fields, predictions, words = self._execute_session(session_id, build)
+            if not fields and not predictions and not words:
+                return None
+            
+            session_data = new_session_data()
+            for field, value in fields.items():
+                if isinstance(field, bytes):
+                    field = field.decode('utf-8')
+                session_data[field] = self.codec.decode(value)
+            session_data['predictions'] = [self.codec.decode(item) for item in reversed(predictions)]
+            session_data['word_history'] = [self.codec.decode(item) for item in reversed(words)]
+            return session_data
             
         except Exception as e:
+            self._record_error('get_session_data', e)
             logger.error(f"❌ Redis get_session_data error: {e}")
             return None
     
     def update_session_data(self, session_id: str, updates: Dict[str, Any], ttl: Optional[int] = None) -> bool:
-        """Update session data in Redis"""
+        """Update session data in Redis (HSET of the changed fields, no read)"""
         try:
-            self._ensure_connection()
             if not self.is_connected():
+                self._record('fallbacks', 'update_session_data')
                 return False
             
-            # Get existing data
-            existing_data = self.get_session_data(session_id) or {}
+            now = time.time()
             
-            # Merge updates
-            existing_data.update(updates)
-            existing_data['last_activity'] = time.time()
+            def build(pipe):
+                pipe.hsetnx(f"session:{session_id}", 'created_at', self.codec.encode(now))
+                self._queue_session_fields(pipe, session_id, dict(updates, last_activity=now))
+                self._queue_expire(pipe, session_id, ttl)
             
-            # Save back
-            return self.set_session_data(session_id, existing_data, ttl)
+            self._execute_session(session_id, build)
+            return True
             
         except Exception as e:
+            self._record_error('update_session_data', e)
             logger.error(f"❌ Redis update_session_data error: {e}")
             return False
     
-    def add_session_prediction(self, session_id: str, prediction: Dict[str, Any]) -> bool:
-        """Add prediction to session history"""
+    def _queue_history(self, pipe, session_id: str, predictions: List[Dict[str, Any]], words: List[Dict[str, Any]]):
+        """Queue LPUSH + LTRIM of new history entries (oldest first) and the session hash touch"""
+        key, predictions_key, words_key = self._session_keys(session_id)
+        now = time.time()
+        for list_key, entries, limit in ((predictions_key, predictions, MAX_SESSION_PREDICTIONS),
+                                         (words_key, words, MAX_SESSION_WORDS)):
+            if entries:
+                pipe.lpush(list_key, *[self.codec.encode(entry) for entry in entries[-limit:]])
+                pipe.ltrim(list_key, 0, limit - 1)
+        pipe.hsetnx(key, 'created_at', self.codec.encode(now))
+        pipe.hset(key, 'last_activity', self.codec.encode(now))
+        self._queue_expire(pipe, session_id)
+    
+    def _append_history(self, operation: str, session_id: str, predictions: List[Dict[str, Any]],
+                        words: List[Dict[str, Any]]) -> bool:
+        """Append history entries of one session in one round-trip"""
         try:
-            self._ensure_connection()
             if not self.is_connected():
+                self._record('fallbacks', operation)
                 return False
             
-            # Get existing data
-            session_data = self.get_session_data(session_id) or {
-                'created_at': time.time(),
-                'last_activity': time.time(),
-                'request_count': 0,
-                'total_time': 0.0,
-                'user_data': {},
-                'predictions': [],
-                'word_history': [],
-                'settings': {
-                    'confidence_threshold': 0.5,
-                    'letter_delay': 3000,
-                    'language': 'tr'
-                }
-            }
-            
-            # Add prediction
-            session_data['predictions'].append({
-                'prediction': prediction,
-                'timestamp': time.time()
-            })
-            
-            # Keep only last 50 predictions
-            if len(session_data['predictions']) > 50:
-                session_data['predictions'] = session_data['predictions'][-50:]
-            
-            session_data['last_activity'] = time.time()
-            
-            # Save back
-            return self.set_session_data(session_id, session_data)
+            self._execute_session(session_id, lambda pipe: self._queue_history(pipe, session_id, predictions, words))
+            return True
             
         except Exception as e:
-            logger.error(f"❌ Redis add_session_prediction error: {e}")
+            self._record_error(operation, e)
+            logger.error(f"❌ Redis {operation} error: {e}")
             return False
     
+    def add_session_prediction(self, session_id: str, prediction: Dict[str, Any]) -> bool:
+        """Add prediction to session history (capped list, last 50)"""
+        return self._append_history('add_session_prediction', session_id,
+                                    [{'prediction': prediction, 'timestamp': time.time()}], [])
+    
     def add_session_word(self, session_id: str, word: str) -> bool:
-        """Add word to session history"""
+        """Add word to session history (capped list, last 100)"""
+        return self._append_history('add_session_word', session_id,
+                                    [], [{'word': word, 'timestamp': time.time()}])
+    
+    def add_session_history(self, batch: Dict[str, Dict[str, List[Dict[str, Any]]]]) -> bool:
+        """
+        Append coalesced history of many sessions in one pipelined round-trip
+        
+        Args:
+            batch: {session_id: {'predictions': [...], 'word_history': [...]}}, entries oldest first
+        """
         try:
-            self._ensure_connection()
             if not self.is_connected():
+                self._record('fallbacks', 'add_session_history')
                 return False
             
-            # Get existing data
-            session_data = self.get_session_data(session_id) or {
-                'created_at': time.time(),
-                'last_activity': time.time(),
-                'request_count': 0,
-                'total_time': 0.0,
-                'user_data': {},
-                'predictions': [],
-                'word_history': [],
-                'settings': {
-                    'confidence_threshold': 0.5,
-                    'letter_delay': 3000,
-                    'language': 'tr'
-                }
-            }
-            
-            # Add word
-            session_data['word_history'].append({
-                'word': word,
-                'timestamp': time.time()
-            })
-            
-            # Keep only last 100 words
-            if len(session_data['word_history']) > 100:
-                session_data['word_history'] = session_data['word_history'][-100:]
-            
-            session_data['last_activity'] = time.time()
-            
-            # Save back
-            return self.set_session_data(session_id, session_data)
+            pipe = self.redis_client.pipeline(transaction=False)
+            spans = []
+            for session_id, history in batch.items():
+                start = len(pipe)
+                self._queue_history(pipe, session_id, history.get('predictions', []), history.get('word_history', []))
+                spans.append((session_id, start, len(pipe)))
+            results = pipe.execute(raise_on_error=False)
+            
+            # Eski (string) formatta kalan session'lar - taşı ve tek başına tekrar yaz
+            for session_id, start, end in spans:
+                errors = [r for r in results[start:end] if isinstance(r, Exception)]
+                if not errors:
+                    continue
+                if not any('WRONGTYPE' in str(error) for error in errors):
+                    raise errors[0]
+                history = batch[session_id]
+                self._execute_session(session_id, lambda retry_pipe: self._queue_history(
+                    retry_pipe, session_id, history.get('predictions', []), history.get('word_history', [])))
+            return True
             
         except Exception as e:
-            logger.error(f"❌ Redis add_session_word error: {e}")
+            self._record_error('add_session_history', e)
+            logger.error(f"❌ Redis add_session_history error: {e}")
             return False
     
     def set_cache(self, key: str, data: Any, ttl: Optional[int] = None) -> bool:
         """Set cache data in Redis"""
         try:
-            self._ensure_connection()
             if not self.is_connected():
+                self._record('fallbacks', 'set_cache')
                 return False
             
             cache_key = f"cache:{key}"
             ttl = ttl or Config.REDIS_CACHE_TTL
             
-            # Serialize data
-            serialized_data = json.dumps(data, default=str)
+            # Serialize data (msgpack/JSON + sıkıştırma - RedisCodec)
+            serialized_data = self.codec.encode(data)
             
             # Set with TTL
             result = self.redis_client.setex(cache_key, ttl, serialized_data)
             return bool(result)
             
         except Exception as e:
+            self._record_error('set_cache', e)
             logger.error(f"❌ Redis set_cache error: {e}")
             return False
     
     def get_cache(self, key: str) -> Optional[Any]:
         """Get cache data from Redis"""
         try:
-            self._ensure_connection()
             if not self.is_connected():
+                self._record('fallbacks', 'get_cache')
                 return None
             
             cache_key = f"cache:{key}"
             data = self.redis_client.get(cache_key)
             
             if data:
-                return json.loads(data)
+                return self.codec.decode(data)
             return None
             
         except Exception as e:
+            self._record_error('get_cache', e)
             logger.error(f"❌ Redis get_cache error: {e}")
             return None
     
     def delete_session(self, session_id: str) -> bool:
         """Delete session from Redis"""
         try:
-            self._ensure_connection()
             if not self.is_connected():
+                self._record('fallbacks', 'delete_session')
                 return False
             
-            key = f"session:{session_id}"
-            result = self.redis_client.delete(key)
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.delete(*self._session_keys(session_id))
+            pipe.zrem(SESSION_ACTIVITY_KEY, session_id)
+            result, _ = pipe.execute()
             return bool(result)
             
         except Exception as e:
+            self._record_error('delete_session', e)
             logger.error(f"❌ Redis delete_session error: {e}")
             return False
     
-    def get_all_sessions(self) -> List[str]:
-        """Get all active session IDs"""
+    @staticmethod
+    def _session_ids(keys) -> List[str]:
+        """Session IDs of `session:*` keys (history list keys skipped)"""
+        session_ids = []
+        for key in keys:
+            if isinstance(key, bytes):
+                key = key.decode('utf-8')
+            # Geçmiş listeleri aynı session'a ait - hash anahtarı yeterli
+            if key.endswith(PREDICTIONS_SUFFIX) or key.endswith(WORDS_SUFFIX):
+                continue
+            session_ids.append(key[len('session:'):])
+        return session_ids
+    
+    def scan_sessions(self, cursor: int = 0, count: int = 100) -> Tuple[int, List[str]]:
+        """
+        One SCAN page of session IDs (non-blocking, unlike KEYS)
+        
+        Args:
+            cursor: Cursor from the previous page (0 starts a new iteration)
+            count: SCAN COUNT hint - keys examined, not IDs returned
+            
+        Returns:
+            Tuple of (next cursor - 0 when the iteration is complete, session IDs)
+        """
         try:
-            self._ensure_connection()
             if not self.is_connected():
-                return []
+                self._record('fallbacks', 'scan_sessions')
+                return 0, []
             
-            pattern = "session:*"
-            keys = self.redis_client.keys(pattern)
+            next_cursor, keys = self.redis_client.scan(cursor=cursor, match="session:*", count=count)
+            return int(next_cursor), self._session_ids(keys)
             
-            # Extract session IDs
-            session_ids = []
-            for key in keys:
-                if isinstance(key, bytes):
-                    key = key.decode('utf-8')
-                session_id = key.replace('session:', '')
-                session_ids.append(session_id)
+        except Exception as e:
+            self._record_error('scan_sessions', e)
+            logger.error(f"❌ Redis scan_sessions error: {e}")
+            return 0, []
+    
+    def get_all_sessions(self) -> List[str]:
+        """Get all active session IDs (incremental SCAN)"""
+        try:
+            if not self.is_connected():
+                self._record('fallbacks', 'get_all_sessions')
+                return []
             
-            return session_ids
+            return self._session_ids(self.redis_client.scan_iter(match="session:*", count=500))
             
         except Exception as e:
+            self._record_error('get_all_sessions', e)
             logger.error(f"❌ Redis get_all_sessions error: {e}")
             return []
     
-    def cleanup_expired_sessions(self) -> int:
-        """Clean up expired sessions (Redis handles TTL automatically)"""
+    def cleanup_expired_sessions(self, max_idle: int = 86400, batch_size: int = 500) -> int:
+        """
+        Delete sessions idle for longer than `max_idle` seconds
+        
+        Idle sessions come only from the activity index - no SCAN, no session
+        data read. Each batch runs as one Lua script, so a session written
+        between the range query and the delete (its score moved past the
+        cutoff) is never removed. Keys without a TTL from before the activity
+        index are handled once by `expire_legacy_sessions`.
+        
+        Args:
+            max_idle: Seconds since the last write after which a session is removed
+            batch_size: Sessions removed per script call
+            
+        Returns:
+            Number of sessions removed
+        """
         try:
-            self._ensure_connection()
             if not self.is_connected():
+                self._record('fallbacks', 'cleanup_expired_sessions')
                 return 0
             
-            # Redis automatically handles TTL, but we can check for sessions
-            # that might have been created before TTL was set
-            session_ids = self.get_all_sessions()
+            cutoff = time.time() - max_idle
+            sweep = self.redis_client.register_script(SWEEP_IDLE_SESSIONS_SCRIPT)
             cleaned_count = 0
-            
-            for session_id in session_ids:
-                session_data = self.get_session_data(session_id)
-                if session_data:
-                    # Check if session is older than 24 hours
-                    if time.time() - session_data.get('last_activity', 0) > 86400:
-                        self.delete_session(session_id)
-                        cleaned_count += 1
+            while True:
+                removed = int(sweep(keys=[SESSION_ACTIVITY_KEY],
+                                    args=[cutoff, batch_size, PREDICTIONS_SUFFIX, WORDS_SUFFIX]))
+                cleaned_count += removed
+                if removed < batch_size:
+                    break
             
             return cleaned_count
             
         except Exception as e:
+            self._record_error('cleanup_expired_sessions', e)
             logger.error(f"❌ Redis cleanup_expired_sessions error: {e}")
             return 0
     
+    def expire_legacy_sessions(self, batch_size: int = 500) -> int:
+        """
+        One-time admin pass: give session keys without a TTL one
+        
+        Sessions written before TTLs were set are not in the activity index
+        either, so the idle sweep never sees them. This walks the keyspace with
+        SCAN (O(keyspace) - run it once after the upgrade, not periodically)
+        and lets Redis expire them itself.
+        
+        Args:
+            batch_size: SCAN COUNT hint / keys per pipeline
+            
+        Returns:
+            Number of keys that received a TTL
+        """
+        try:
+            if not self.is_connected():
+                self._record('fallbacks', 'expire_legacy_sessions')
+                return 0
+            
+            expired_count = 0
+            cursor = 0
+            while True:
+                cursor, keys = self.redis_client.scan(cursor=cursor, match="session:*", count=batch_size)
+                if keys:
+                    pipe = self.redis_client.pipeline(transaction=False)
+                    for key in keys:
+                        pipe.ttl(key)
+                    ttls = pipe.execute()
+                    pipe = self.redis_client.pipeline(transaction=False)
+                    for key, ttl in zip(keys, ttls):
+                        if ttl == -1:
+                            pipe.expire(key, Config.REDIS_SESSION_TTL)
+                    if len(pipe):
+                        expired_count += len(pipe)
+                        pipe.execute()
+                if int(cursor) == 0:
+                    break
+            
+            logger.info(f"🔄 Legacy session keys given a TTL: {expired_count}")
+            return expired_count
+            
+        except Exception as e:
+            self._record_error('expire_legacy_sessions', e)
+            logger.error(f"❌ Redis expire_legacy_sessions error: {e}")
+            return 0
+    
+    def incr_global_state(self, deltas: Dict[str, float], sessions: Dict[str, float],
+                          worker_id: str, session_window: int,
+                          metric_deltas: Optional[Dict[str, float]] = None,
+                          metric_gauges: Optional[Dict[str, float]] = None) -> bool:
+        """
+        Apply one worker's batched counter deltas in a single pipeline
+        
+        Args:
+            deltas: Counter increments ({name: amount}); float amounts use HINCRBYFLOAT
+            sessions: Sessions active since the last flush ({session_id: last_activity})
+            worker_id: Reporting worker (heartbeat member)
+            session_window: Seconds a session counts as active
+            metric_deltas: Prometheus counter / histogram sample increments ({field: amount})
+            metric_gauges: This worker's current Prometheus gauges ({field: value}), replaced as a whole
+        """
+        try:
+            if not self.is_connected():
+                self._record('fallbacks', 'incr_global_state')
+                return False
+            
+            now = time.time()
+            # MULTI/EXEC - flush ya tamamen uygulanır ya hiç; aggregator başarısız flush'ı tekrar gönderir
+            pipe = self.redis_client.pipeline(transaction=True)
+            for name, amount in deltas.items():
+                if not amount:
+                    continue
+                if isinstance(amount, float):
+                    pipe.hincrbyfloat("global_state:counters", name, amount)
+                else:
+                    pipe.hincrby("global_state:counters", name, amount)
+            if sessions:
+                pipe.zadd("global_state:sessions", sessions)
+            for field, amount in (metric_deltas or {}).items():
+                pipe.hincrbyfloat("global_state:metrics", field, amount)
+            if metric_gauges is not None:
+                gauges_key = f"global_state:gauges:{worker_id}"
+                pipe.delete(gauges_key)
+                if metric_gauges:
+                    pipe.hset(gauges_key, mapping=metric_gauges)
+                    pipe.expire(gauges_key, session_window)
+            # Pencere dışına düşen session'lar ve ölü worker'lar
+            pipe.zremrangebyscore("global_state:sessions", 0, now - session_window)
+            pipe.zadd("global_state:workers", {worker_id: now})
+            pipe.zremrangebyscore("global_state:workers", 0, now - session_window)
+            pipe.execute()
+            return True
+            
+        except Exception as e:
+            self._record_error('incr_global_state', e)
+            logger.error(f"❌ Redis incr_global_state error: {e}")
+            return False
+    
+    def get_global_state(self, session_window: int, worker_timeout: float) -> Optional[Dict[str, Any]]:
+        """
+        Read fleet-wide counters, active session count and reporting workers
+        
+        Args:
+            session_window: Seconds a session counts as active
+            worker_timeout: Seconds since the last heartbeat for a worker to count
+        """
+        try:
+            if not self.is_connected():
+                self._record('fallbacks', 'get_global_state')
+                return None
+            
+            now = time.time()
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.hgetall("global_state:counters")
+            pipe.zcount("global_state:sessions", now - session_window, "+inf")
+            pipe.zcount("global_state:workers", now - worker_timeout, "+inf")
+            counters, active_sessions, workers = pipe.execute()
+            
+            state = {}
+            for name, value in counters.items():
+                if isinstance(name, bytes):
+                    name = name.decode('utf-8')
+                value = float(value)
+                state[name] = int(value) if value.is_integer() else value
+            state['active_sessions'] = active_sessions
+            state['workers_reporting'] = workers
+            return state
+            
+        except Exception as e:
+            self._record_error('get_global_state', e)
+            logger.error(f"❌ Redis get_global_state error: {e}")
+            return None
+    
+    def get_global_metrics(self, worker_timeout: float) -> Optional[Tuple[Dict[str, float], Dict[str, float], int]]:
+        """
+        Read fleet-wide Prometheus samples
+        
+        Args:
+            worker_timeout: Seconds since the last heartbeat for a worker's gauges to count
+            
+        Returns:
+            Tuple of (summed counter / histogram samples, gauges of live workers,
+            live worker count), or None when Redis is unavailable
+        """
+        try:
+            if not self.is_connected():
+                self._record('fallbacks', 'get_global_metrics')
+                return None
+            
+            workers = self.redis_client.zrangebyscore("global_state:workers", time.time() - worker_timeout, "+inf")
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.hgetall("global_state:metrics")
+            for worker_id in workers:
+                if isinstance(worker_id, bytes):
+                    worker_id = worker_id.decode('utf-8')
+                pipe.hgetall(f"global_state:gauges:{worker_id}")
+            results = pipe.execute()
+            
+            decoded = []
+            for values in results:
+                decoded.append({
+                    (field.decode('utf-8') if isinstance(field, bytes) else field): float(value)
+                    for field, value in values.items()
+                })
+            counters = decoded[0]
+            gauges = {}
+            for worker_gauges in decoded[1:]:
+                gauges.update(worker_gauges)
+            return counters, gauges, len(workers)
+            
+        except Exception as e:
+            self._record_error('get_global_metrics', e)
+            logger.error(f"❌ Redis get_global_metrics error: {e}")
+            return None
+    
     def get_redis_info(self) -> Dict[str, Any]:
         """Get Redis server information"""
         try:
-            self._ensure_connection()
             if not self.is_connected():
-                return {"connected": False, "error": "Not connected"}
+                self._record('fallbacks', 'get_redis_info')
+                return {"connected": False, "error": "Not connected", "circuit": self.get_stats()['circuit']}
             
             info = self.redis_client.info()
             return {
@@ -326,10 +744,12 @@ class RedisManager:
                 "uptime": info.get('uptime_in_seconds'),
                 "memory_used": info.get('used_memory_human'),
                 "connected_clients": info.get('connected_clients'),
-                "total_commands_processed": info.get('total_commands_processed')
+                "total_commands_processed": info.get('total_commands_processed'),
+                "circuit": self.get_stats()['circuit']
             }
             
         except Exception as e:
+            self._record_error('get_redis_info', e)
             logger.error(f"❌ Redis get_redis_info error: {e}")
             return {"connected": False, "error": str(e)}
     
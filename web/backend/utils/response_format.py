@@ -0,0 +1,100 @@
+"""
+Prediction response projection and encoding
+
+Clients at 10 FPS often need only the letter, yet every response carried
+21 landmark dicts, a bounding box, an ISO timestamp and the session ID.
+`fields=` selects top-level keys, compact mode replaces the landmark dicts
+with a flat int16 array (a JSON list of integers), and orjson (when installed)
+replaces the stdlib encoder.
+"""
+
+import json
+from typing import Dict, FrozenSet, List, Optional
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # opsiyonel - yoksa standart json modülü
+    orjson = None
+
+# Landmark -> int: 1e-4 çözünürlük, int16 aralığı normalize koordinatta ±3.27
+LANDMARK_SCALE = 10000
+_INT16_MIN, _INT16_MAX = -32768, 32767
+
+# Her yanıtta kalan alanlar - istemci başarı/hata durumunu her zaman görebilsin
+ALWAYS_FIELDS = ('success', 'error')
+FIELD_ALIASES = {
+    'bbox': 'bounding_box',
+    'letter': 'prediction',
+}
+
+def parse_fields(spec: Optional[str]) -> Optional[FrozenSet[str]]:
+    """
+    Parse a `fields=` selector such as "prediction,bbox"
+
+    Args:
+        spec: Comma separated top-level field names (aliases: bbox, letter)
+
+    Returns:
+        Set of field names, or None when every field is requested
+    """
+    if not spec:
+        return None
+    names = set()
+    for name in spec.split(','):
+        name = name.strip()
+        if name:
+            names.add(FIELD_ALIASES.get(name, name))
+    return frozenset(names) if names else None
+
+def compact_landmarks(landmarks: List[Dict]) -> np.ndarray:
+    """Flatten [{x, y}, ...] to int16 [x0, y0, x1, y1, ...] scaled by LANDMARK_SCALE"""
+    flat = np.fromiter((value for landmark in landmarks for value in (landmark['x'], landmark['y'])),
+                       dtype=np.float64, count=2 * len(landmarks))
+    flat = np.rint(flat * LANDMARK_SCALE)
+    np.clip(flat, _INT16_MIN, _INT16_MAX, out=flat)
+    return flat.astype(np.int16)
+
+def format_response(body: Dict, fields: Optional[FrozenSet[str]] = None, compact: bool = False) -> Dict:
+    """
+    Project a prediction response and optionally compact its landmarks
+
+    The input dict is not modified (it may be cached or held by the motion gate).
+
+    Args:
+        body: Full prediction response
+        fields: Top-level fields to keep (None keeps all)
+        compact: Replace `landmarks` with `landmarks_i16` / `landmarks_scale`
+
+    Returns:
+        Response dictionary to serialize
+    """
+    if fields is None and not compact:
+        return body
+
+    if fields is None:
+        result = dict(body)
+    else:
+        result = {key: body[key] for key in ALWAYS_FIELDS if key in body}
+        for key in fields:
+            if key in body:
+                result[key] = body[key]
+
+    if compact and 'landmarks' in result:
+        landmarks = result.pop('landmarks')
+        result['landmarks_i16'] = compact_landmarks(landmarks) if landmarks else None
+        result['landmarks_scale'] = LANDMARK_SCALE
+    return result
+
+def _default(value):
+    """Fallback for values the encoder does not know (NumPy arrays/scalars, datetimes)"""
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return str(value)
+
+def dumps(body) -> bytes:
+    """Serialize to compact JSON bytes (orjson if available)"""
+    if orjson is not None:
+        return orjson.dumps(body, default=_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(body, separators=(',', ':'), default=_default).encode('utf-8')
@@ -0,0 +1,97 @@
+"""
+Distilled student model (pure NumPy)
+
+train_classifier.py distills the best soft-voting combination into a small
+MLP (42 -> hidden ReLU -> classes) and saves it as `student_model.npz`.
+`StudentMLP` loads that file and exposes the sklearn-style `classes_`,
+`predict_proba` and `predict` that SignLanguagePredictor expects.
+"""
+
+from typing import Sequence
+
+import numpy as np
+
+from .compiled_model import mmap_npz
+
+FORMAT_VERSION = 1
+
+class StudentMLP:
+    """Two-layer MLP student with input standardization"""
+
+    def __init__(self, weights: Sequence[np.ndarray], biases: Sequence[np.ndarray],
+                 mean: np.ndarray, scale: np.ndarray, classes: np.ndarray):
+        """
+        Initialize student model
+
+        Args:
+            weights: Layer weight matrices (hidden layers use ReLU, last layer softmax)
+            biases: Layer bias vectors
+            mean: Per-feature training mean
+            scale: Per-feature training std
+            classes: Label index of every output column
+        """
+        if len(weights) != len(biases) or not weights:
+            raise ValueError("Student model needs matching, non-empty weight and bias lists")
+
+        self.weights = [np.ascontiguousarray(w, dtype=np.float32) for w in weights]
+        self.biases = [np.asarray(b, dtype=np.float32) for b in biases]
+        # (x - mean) / scale == x * inv_scale + shift
+        scale = np.asarray(scale, dtype=np.float32)
+        self.inv_scale = 1.0 / scale
+        self.shift = -np.asarray(mean, dtype=np.float32) * self.inv_scale
+        self.classes_ = np.asarray(classes)
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """
+        Class probabilities
+
+        Args:
+            X: (N, 42) feature array
+
+        Returns:
+            (N, n_classes) probability array, columns ordered as `classes_`
+        """
+        h = np.asarray(X, dtype=np.float32) * self.inv_scale + self.shift
+        last = len(self.weights) - 1
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            h = h @ w
+            h += b
+            if i < last:
+                np.maximum(h, 0.0, out=h)
+
+        h -= h.max(axis=1, keepdims=True)
+        np.exp(h, out=h)
+        h /= h.sum(axis=1, keepdims=True)
+        return h
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Predicted label indices"""
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = False) -> "StudentMLP":
+        """
+        Load a student model written by train_classifier.py
+
+        Args:
+            path: Path to the .npz file
+            mmap: Memory-map the arrays read-only instead of reading them into
+                  private memory (float32 weights are used in place)
+
+        Returns:
+            StudentMLP instance
+        """
+        if mmap:
+            data = mmap_npz(path)
+        else:
+            with np.load(path, allow_pickle=False) as archive:
+                data = {name: archive[name] for name in archive.files}
+
+        version = int(data['format_version'])
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported student model format: {version} (expected {FORMAT_VERSION})")
+
+        n_layers = sum(1 for key in data if key.startswith('W'))
+        weights = [data[f'W{i}'] for i in range(n_layers)]
+        biases = [data[f'b{i}'] for i in range(n_layers)]
+        return cls(weights, biases, data['mean'], data['scale'], data['classes'])
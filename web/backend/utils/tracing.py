@@ -0,0 +1,173 @@
+"""
+Per-request stage timing for clients
+
+Every prediction response carries a `Server-Timing` header built from the
+request's `StageTimer`, so the browser devtools (and `fetch` via
+`PerformanceResourceTiming.serverTiming`) show where a slow frame went.
+Pipeline stages are grouped into the names clients care about: decode,
+detect, classify, redis (cache lookup + session write + cache store) and
+total.
+
+A client that sends the debug header additionally gets every raw stage in
+the header and an `X-Trace-ID`; the full record is appended to a size-rotated
+JSONL file so it can be matched later with the X-Session-ID of the request.
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import uuid
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from typing import Callable, Dict, Optional
+
+# Pipeline aşaması -> Server-Timing adı (listede olmayanlar kendi adıyla gider)
+SERVER_TIMING_GROUPS = {
+    'body_parse': 'parse',
+    'detection': 'detect',
+    'classification': 'classify',
+    'cache_lookup': 'redis',
+    'session_write': 'redis',
+    'cache_store': 'redis',
+}
+
+# Trace kaydına yanıttan kopyalanan alanlar (landmark'lar dosyayı şişirmesin)
+TRACE_RESPONSE_FIELDS = ('success', 'hand_detected', 'prediction', 'confidence',
+                         'cached', 'motion_skipped', 'error', 'count')
+
+def server_timing_header(durations: Dict[str, float], total: float, detailed: bool = False) -> str:
+    """
+    Build a Server-Timing header value
+
+    Args:
+        durations: Stage durations in seconds (StageTimer.durations)
+        total: End-to-end request time in seconds
+        detailed: Emit every raw stage instead of the grouped names
+
+    Returns:
+        Header value such as "decode;dur=1.20, detect;dur=7.85, total;dur=10.41"
+    """
+    grouped: Dict[str, float] = {}
+    for stage, seconds in durations.items():
+        name = stage if detailed else SERVER_TIMING_GROUPS.get(stage, stage)
+        grouped[name] = grouped.get(name, 0.0) + seconds
+    grouped['total'] = total
+    return ', '.join(f"{name};dur={seconds * 1000:.2f}" for name, seconds in grouped.items())
+
+class _TraceFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler that reports the outcome of every record
+
+    `Handler.emit` never raises - I/O errors go to `handleError`, which
+    would print a traceback per record. Here they are counted instead.
+    `emit` runs under the handler lock, so the per-record flag is safe.
+    """
+
+    def __init__(self, *args, on_result: Callable[[bool], None], **kwargs):
+        super().__init__(*args, **kwargs)
+        self.on_result = on_result
+        self._failed = False
+
+    def emit(self, record):
+        self._failed = False
+        super().emit(record)
+        self.on_result(not self._failed)
+
+    def handleError(self, record):
+        self._failed = True
+        print(f"⚠️ Trace write failed: {sys.exc_info()[1]}")
+
+class TraceWriter:
+    """
+    Append request traces to a size-rotated JSONL file
+
+    RotatingFileHandler does the locking and rotation. Rotation is not safe
+    across processes, so `{pid}` in the path gives every Gunicorn worker its
+    own file.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 10 * 1024 * 1024, backup_count: int = 3):
+        """
+        Initialize trace writer
+
+        Args:
+            path: JSONL file path (`{pid}` is replaced with the worker PID)
+            max_bytes: File size that triggers a rotation
+            backup_count: Rotated files kept next to the active one
+        """
+        self.path = path.replace('{pid}', str(os.getpid()))
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        handler = _TraceFileHandler(self.path, maxBytes=max(0, max_bytes), backupCount=max(0, backup_count),
+                                    encoding='utf-8', delay=True, on_result=self._count_write)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        self._logger = logging.getLogger(f"signdesk.trace.{os.getpid()}.{id(self)}")
+        self._logger.setLevel(logging.INFO)
+        self._logger.propagate = False
+        self._logger.addHandler(handler)
+        self._handler = handler
+
+        self._lock = threading.Lock()
+        self._stats = {'traces_written': 0, 'write_errors': 0}
+
+    def _count_write(self, written: bool):
+        """Handler callback - one call per emitted trace"""
+        with self._lock:
+            self._stats['traces_written' if written else 'write_errors'] += 1
+
+    def write(self, endpoint: str, session_id: str, status: int, durations: Dict[str, float],
+              total: float, response: Optional[Dict] = None) -> str:
+        """
+        Append one request trace
+
+        Args:
+            endpoint: Endpoint label (predict, landmarks, batch)
+            session_id: X-Session-ID of the request
+            status: HTTP status code
+            durations: Stage durations in seconds
+            total: End-to-end request time in seconds
+            response: Response body (only the summary fields are recorded)
+
+        Returns:
+            Trace ID (also sent back as X-Trace-ID)
+        """
+        trace_id = uuid.uuid4().hex
+        record = {
+            'trace_id': trace_id,
+            'timestamp': datetime.now().isoformat(),
+            'endpoint': endpoint,
+            'session_id': session_id,
+            'status': status,
+            'pid': os.getpid(),
+            'stages_ms': {stage: round(seconds * 1000, 3) for stage, seconds in durations.items()},
+            'total_ms': round(total * 1000, 3),
+        }
+        if response:
+            record['response'] = {key: response[key] for key in TRACE_RESPONSE_FIELDS if key in response}
+
+        try:
+            line = json.dumps(record, separators=(',', ':'), default=str)
+        except (TypeError, ValueError) as e:
+            print(f"⚠️ Trace write failed: {e}")
+            self._count_write(False)
+            return trace_id
+
+        # Dosya hataları handler'ın handleError'ına düşer ve orada sayılır
+        self._logger.info(line)
+        return trace_id
+
+    def close(self):
+        """Flush and close the trace file"""
+        self._logger.removeHandler(self._handler)
+        self._handler.close()
+
+    def get_stats(self) -> Dict:
+        """Get trace writer metrics"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats['path'] = self.path
+        return stats
@@ -0,0 +1,134 @@
+import atexit
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Dict, List
+
+HistoryBatch = Dict[str, Dict[str, List[Dict[str, Any]]]]
+
+class SessionHistoryWriter:
+    """
+    Write-behind queue for session history
+
+    Prediction / word history is best-effort telemetry, so the request only
+    appends an entry to a bounded in-process deque. A background thread
+    drains it every `flush_interval` seconds (or as soon as `batch_size`
+    entries are waiting), groups the entries per session and hands the
+    batch to `write_batch` - one pipelined Redis round-trip for all sessions.
+    When the queue is full the oldest entry is dropped: the newest history
+    is the one a client is most likely to read back.
+    """
+
+    def __init__(self, write_batch: Callable[[HistoryBatch], Any], max_pending: int = 10000,
+                 flush_interval: float = 0.05, batch_size: int = 500):
+        """
+        Initialize session history writer
+
+        Args:
+            write_batch: Callable receiving {session_id: {'predictions': [...], 'word_history': [...]}}
+            max_pending: Queued entries before the oldest are dropped
+            flush_interval: Seconds between flushes
+            batch_size: Queue depth that triggers an early flush
+        """
+        self.write_batch = write_batch
+        self.max_pending = max(1, max_pending)
+        self.flush_interval = max(0.001, flush_interval)
+        self.batch_size = max(1, batch_size)
+
+        self._pending = deque(maxlen=self.max_pending)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._stats = {
+            'enqueued': 0,
+            'dropped': 0,
+            'written': 0,
+            'batches': 0,
+            'failed_batches': 0
+        }
+
+    def start(self):
+        """Start the background flush thread"""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="session-history-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self):
+        """Stop the flush thread and write what is left"""
+        self._stop.set()
+        self._wake.set()
+        self.flush()
+
+    def add_prediction(self, session_id: str, prediction: Dict[str, Any]):
+        """Queue a prediction history entry"""
+        self._put(session_id, 'predictions', {'prediction': prediction, 'timestamp': time.time()})
+
+    def add_word(self, session_id: str, word: str):
+        """Queue a word history entry"""
+        self._put(session_id, 'word_history', {'word': word, 'timestamp': time.time()})
+
+    def _put(self, session_id: str, kind: str, entry: Dict[str, Any]):
+        with self._lock:
+            if len(self._pending) == self.max_pending:
+                # deque(maxlen) en eskiyi kendisi atar - sadece say
+                self._stats['dropped'] += 1
+            self._pending.append((session_id, kind, entry))
+            self._stats['enqueued'] += 1
+            depth = len(self._pending)
+        if depth >= self.batch_size:
+            self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Write all queued entries, coalesced per session
+
+        Returns:
+            Number of entries handed to `write_batch`
+        """
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                entries = list(self._pending)
+                self._pending.clear()
+
+            batch: HistoryBatch = OrderedDict()
+            for session_id, kind, entry in entries:
+                history = batch.get(session_id)
+                if history is None:
+                    history = batch[session_id] = {'predictions': [], 'word_history': []}
+                history[kind].append(entry)
+
+            try:
+                self.write_batch(batch)
+                ok = True
+            except Exception as e:
+                print(f"⚠️ Session history flush failed: {e}")
+                ok = False
+
+            with self._lock:
+                self._stats['batches'] += 1
+                if ok:
+                    self._stats['written'] += len(entries)
+                else:
+                    self._stats['failed_batches'] += 1
+            return len(entries)
+
+    def get_stats(self) -> Dict:
+        """Get queue metrics"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['queue_depth'] = len(self._pending)
+        stats['max_pending'] = self.max_pending
+        stats['flush_interval'] = self.flush_interval
+        return stats
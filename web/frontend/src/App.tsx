@@ -1,5 +1,5 @@
 import { useState, useEffect, useRef } from 'react';
-import { AppMode } from './types';
+import { ApiResponse, AppMode } from './types';
 
 // Hooks
 import { useWebcam } from './hooks/useWebcam';
@@ -52,6 +52,7 @@ function App() {
   const isRequestPendingRef = useRef<boolean>(false); // Prevent request queue buildup
   const lastProcessingMsRef = useRef<number>(FRAME_CAPTURE_INTERVAL);
   const skipLogCounterRef = useRef<number>(0);
+  const handleResponseRef = useRef<(response: ApiResponse) => void>(() => {});
 
   // New stable letter algorithm state
   const stableLetterRef = useRef<{
@@ -152,6 +153,7 @@ function App() {
   const stopSignToTextMode = () => {
     // Stop camera
     webcam.stopCamera();
+    prediction.stopStream();
 
     // Stop frame capture
     if (frameCaptureIntervalRef.current) {
@@ -169,6 +171,95 @@ function App() {
     wordBuilder.clearAll();
   };
 
+  /**
+   * Apply one prediction result (HTTP response or stream message)
+   */
+  const handlePredictionResponse = (response: ApiResponse) => {
+    // Adaptive scheduling based on last processing time
+    const clamp = (v: number, min: number, max: number) => Math.max(min, Math.min(max, v));
+    const procMs = (response as any)?.processing_time_ms;
+    if (typeof procMs === 'number' && !Number.isNaN(procMs)) {
+      lastProcessingMsRef.current = clamp(Math.round(procMs + 10), 33, 250);
+    }
+
+    // Enhanced Stable Letter Algorithm
+    const predictedLetter = response.prediction?.letter;
+    const predictedConfidence = response.prediction?.confidence ?? 0;
+
+    if (response.hand_detected && predictedLetter) {
+      const stable = stableLetterRef.current;
+
+      // Show letter in UI if confidence is above minimum threshold
+      if (predictedConfidence >= MIN_CONFIDENCE_FOR_UI) {
+        setCurrentUiLetter(predictedLetter);
+
+        // Calculate countdown based on stability progress
+        const framesRemaining = Math.max(0, STABLE_LETTER_FRAMES - stable.count);
+        const secondsRemaining = Math.ceil((framesRemaining * FRAME_CAPTURE_INTERVAL) / 1000);
+        setCurrentUiCountdown(secondsRemaining);
+      }
+
+      // Process letter for addition if confidence meets stability threshold
+      if (predictedConfidence >= LETTER_STABILITY_THRESHOLD) {
+        if (stable.letter === predictedLetter) {
+          // Same letter as before, increment count
+          stable.count += 1;
+
+          // Determine required frames based on confidence
+          const requiredFrames = predictedConfidence >= HIGH_CONFIDENCE_THRESHOLD ? 3 : STABLE_LETTER_FRAMES;
+
+          // Check if we have enough consecutive frames
+          if (stable.count >= requiredFrames && stable.lastAddedLetter !== predictedLetter) {
+            // Add letter directly (already stable)
+            wordBuilder.addStableLetter(predictedLetter);
+            stable.lastAddedLetter = predictedLetter;
+            console.log(`✅ Stable letter added: ${predictedLetter} (${stable.count} frames, conf: ${predictedConfidence.toFixed(3)})`);
+            // Reflect confirmation on UI (countdown 0 shows onaylandı)
+            setCurrentUiLetter(predictedLetter);
+            setCurrentUiCountdown(0);
+          }
+        } else {
+          // Different letter, reset counter
+          stable.letter = predictedLetter;
+          stable.count = 1;
+          stable.lastAddedLetter = null;
+          console.log(`🔄 New letter detected: ${predictedLetter} (confidence: ${predictedConfidence.toFixed(3)})`);
+        }
+      } else {
+        // Low confidence, reset tracking but keep UI if above minimum
+        stable.letter = null;
+        stable.count = 0;
+        stable.lastAddedLetter = null;
+      }
+
+      // Reset no-hand counter
+      noHandFramesRef.current = 0;
+
+    } else if (!response.hand_detected) {
+      // Increment consecutive no-hand frames and clear after threshold
+      noHandFramesRef.current += 1;
+      if (noHandFramesRef.current >= NO_HAND_CONSECUTIVE_FRAMES_TO_CLEAR) {
+        // Reset stable letter tracking
+        stableLetterRef.current = { letter: null, count: 0, lastAddedLetter: null };
+        wordBuilder.clearPendingLetter();
+        noHandFramesRef.current = 0;
+        console.log('🧹 Hand lost, cleared pending letter');
+      }
+      // Clear UI when hand is not detected
+      setCurrentUiLetter(null);
+      setCurrentUiCountdown(0);
+    } else {
+      // Hand detected but no letter or very low confidence
+      stableLetterRef.current = { letter: null, count: 0, lastAddedLetter: null };
+      noHandFramesRef.current = 0;
+      // Clear UI for very low confidence
+      setCurrentUiLetter(null);
+      setCurrentUiCountdown(0);
+    }
+  };
+  // Stream callback'i ilk render'a takılı kalmasın - her render'da güncel handler
+  handleResponseRef.current = handlePredictionResponse;
+
   /**
    * Start frame capture loop
    */
@@ -176,7 +267,6 @@ function App() {
     if (frameCaptureTimeoutRef.current || frameCaptureIntervalRef.current) {
       return;
     }
-    const clamp = (v: number, min: number, max: number) => Math.max(min, Math.min(max, v));
     const scheduleNext = (delay: number) => {
       if (frameCaptureTimeoutRef.current) {
         clearTimeout(frameCaptureTimeoutRef.current);
@@ -200,99 +290,32 @@ function App() {
         return;
       }
 
-      // Capture frame
-      const frameBase64 = webcam.captureFrame();
+      // Capture frame (JPEG Blob - binary upload via api.predictBinary)
+      const frameBlob = await webcam.captureFrame();
 
-      if (!frameBase64) {
+      if (!frameBlob) {
         scheduleNext(FRAME_CAPTURE_INTERVAL);
         return;
       }
 
+      // WebSocket açıksa kare stream'e gider; sonuç handlePredictionResponse'a asenkron gelir
+      if (prediction.streamFrame(frameBlob)) {
+        scheduleNext(lastProcessingMsRef.current || FRAME_CAPTURE_INTERVAL);
+        return;
+      }
+
       // Mark request as pending
       isRequestPendingRef.current = true;
 
       try {
         // Send to backend for prediction
-        const response = await prediction.sendFrame(frameBase64);
+        const response = await prediction.sendFrame(frameBlob);
 
         if (!response) {
           return;
         }
 
-        // Enhanced Stable Letter Algorithm
-        const predictedLetter = response.prediction?.letter;
-        const predictedConfidence = response.prediction?.confidence ?? 0;
-
-        if (response.hand_detected && predictedLetter) {
-          const stable = stableLetterRef.current;
-
-          // Show letter in UI if confidence is above minimum threshold
-          if (predictedConfidence >= MIN_CONFIDENCE_FOR_UI) {
-            setCurrentUiLetter(predictedLetter);
-
-            // Calculate countdown based on stability progress
-            const framesRemaining = Math.max(0, STABLE_LETTER_FRAMES - stable.count);
-            const secondsRemaining = Math.ceil((framesRemaining * FRAME_CAPTURE_INTERVAL) / 1000);
-            setCurrentUiCountdown(secondsRemaining);
-          }
-
-          // Process letter for addition if confidence meets stability threshold
-          if (predictedConfidence >= LETTER_STABILITY_THRESHOLD) {
-            if (stable.letter === predictedLetter) {
-              // Same letter as before, increment count
-              stable.count += 1;
-
-              // Determine required frames based on confidence
-              const requiredFrames = predictedConfidence >= HIGH_CONFIDENCE_THRESHOLD ? 3 : STABLE_LETTER_FRAMES;
-
-              // Check if we have enough consecutive frames
-              if (stable.count >= requiredFrames && stable.lastAddedLetter !== predictedLetter) {
-                // Add letter directly (already stable)
-                wordBuilder.addStableLetter(predictedLetter);
-                stable.lastAddedLetter = predictedLetter;
-                console.log(`✅ Stable letter added: ${predictedLetter} (${stable.count} frames, conf: ${predictedConfidence.toFixed(3)})`);
-                // Reflect confirmation on UI (countdown 0 shows onaylandı)
-                setCurrentUiLetter(predictedLetter);
-                setCurrentUiCountdown(0);
-              }
-            } else {
-              // Different letter, reset counter
-              stable.letter = predictedLetter;
-              stable.count = 1;
-              stable.lastAddedLetter = null;
-              console.log(`🔄 New letter detected: ${predictedLetter} (confidence: ${predictedConfidence.toFixed(3)})`);
-            }
-          } else {
-            // Low confidence, reset tracking but keep UI if above minimum
-            stable.letter = null;
-            stable.count = 0;
-            stable.lastAddedLetter = null;
-          }
-
-          // Reset no-hand counter
-          noHandFramesRef.current = 0;
-
-        } else if (!response.hand_detected) {
-          // Increment consecutive no-hand frames and clear after threshold
-          noHandFramesRef.current += 1;
-          if (noHandFramesRef.current >= NO_HAND_CONSECUTIVE_FRAMES_TO_CLEAR) {
-            // Reset stable letter tracking
-            stableLetterRef.current = { letter: null, count: 0, lastAddedLetter: null };
-            wordBuilder.clearPendingLetter();
-            noHandFramesRef.current = 0;
-            console.log('🧹 Hand lost, cleared pending letter');
-          }
-          // Clear UI when hand is not detected
-          setCurrentUiLetter(null);
-          setCurrentUiCountdown(0);
-        } else {
-          // Hand detected but no letter or very low confidence
-          stableLetterRef.current = { letter: null, count: 0, lastAddedLetter: null };
-          noHandFramesRef.current = 0;
-          // Clear UI for very low confidence
-          setCurrentUiLetter(null);
-          setCurrentUiCountdown(0);
-        }
+        handlePredictionResponse(response);
       } catch (error) {
         console.error('❌ Prediction error:', error);
       } finally {
@@ -300,13 +323,10 @@ function App() {
         isRequestPendingRef.current = false;
       }
 
-      // Adaptive scheduling based on last processing time
-      const procMs = (prediction.lastResponse as any)?.processing_time_ms;
-      if (typeof procMs === 'number' && !Number.isNaN(procMs)) {
-        lastProcessingMsRef.current = clamp(Math.round(procMs + 10), 33, 250);
-      }
       scheduleNext(lastProcessingMsRef.current || FRAME_CAPTURE_INTERVAL);
     };
+    // Kalıcı WebSocket bağlantısı - açılana kadar / koparsa kareler HTTP POST ile gider
+    prediction.startStream((response) => handleResponseRef.current(response));
     // Run an immediate tick once (sets next schedule inside)
     tick();
   };
@@ -324,6 +344,7 @@ function App() {
         window.clearTimeout(frameCaptureTimeoutRef.current);
         frameCaptureTimeoutRef.current = null;
       }
+      prediction.stopStream();
       webcam.stopCamera();
     };
   }, []);
@@ -1,10 +1,13 @@
 import { useState, useCallback, useRef } from 'react';
-import { api } from '@/services/api';
-import { ApiResponse, PredictionResult } from '@/types';
+import { api, openPredictionStream, PredictionStream } from '@/services/api';
+import { ApiResponse, PredictionResult, StreamApiResponse } from '@/types';
 import { CONFIDENCE_THRESHOLD } from '@/utils/constants';
 
 interface UsePredictionReturn {
-  sendFrame: (frame: string) => Promise<ApiResponse | null>;
+  sendFrame: (frame: string | Blob) => Promise<ApiResponse | null>;
+  startStream: (onResult: (response: ApiResponse) => void) => void;
+  streamFrame: (frame: Blob) => boolean;
+  stopStream: () => void;
   isLoading: boolean;
   error: string | null;
   lastPrediction: PredictionResult | null;
@@ -14,6 +17,11 @@ interface UsePredictionReturn {
 // Request throttling - optimized for performance (10 FPS)
 const MIN_REQUEST_INTERVAL = 100; // milisaniye (50ms → 100ms)
 const MAX_CONCURRENT_REQUESTS = 1; // Tek seferde sadece 1 istek
+// WebSocket'te sunucuya gönderilip henüz işlenmemiş en fazla kare (backend STREAM_QUEUE_SIZE)
+const MAX_STREAM_IN_FLIGHT = 2;
+// Stream koparsa (worker restart'ı, backend stream limiti / 503) üstel backoff ile yeniden bağlan
+const STREAM_RECONNECT_BASE_DELAY = 1000; // milisaniye
+const STREAM_RECONNECT_MAX_DELAY = 30000;
 
 export const usePrediction = (): UsePredictionReturn => {
   const [isLoading, setIsLoading] = useState(false);
@@ -34,10 +42,18 @@ export const usePrediction = (): UsePredictionReturn => {
   const lastRequestTimeRef = useRef<number>(0);
   const pendingRequestsRef = useRef<number>(0);
 
+  // WebSocket stream state
+  const streamRef = useRef<PredictionStream | null>(null);
+  const streamSentRef = useRef<number>(0);
+  const streamSeqRef = useRef<number>(0);
+  const streamWantedRef = useRef(false);
+  const streamAttemptsRef = useRef(0);
+  const streamReconnectTimerRef = useRef<ReturnType<typeof setTimeout> | null>(null);
+
   /**
    * Send frame to backend for prediction with optimized throttling
    */
-  const sendFrame = useCallback(async (frame: string): Promise<ApiResponse | null> => {
+  const sendFrame = useCallback(async (frame: string | Blob): Promise<ApiResponse | null> => {
     const now = Date.now();
 
     // Throttling: Check minimum interval
@@ -63,7 +79,9 @@ export const usePrediction = (): UsePredictionReturn => {
       pendingRequestsRef.current += 1;
 
       // Send to API
-      const response = await api.predict(frame);
+      const response = typeof frame === 'string'
+        ? await api.predict(frame)
+        : await api.predictBinary(frame);
 
       // Update state
       setLastResponse(response);
@@ -142,8 +160,88 @@ export const usePrediction = (): UsePredictionReturn => {
     }
   }, [isLoading, consecutiveErrors]);
 
+  /**
+   * Open the WebSocket stream - results arrive asynchronously in onResult
+   * A dropped stream is reopened with exponential backoff until stopStream;
+   * frames go over HTTP (sendFrame) in the meantime.
+   */
+  const startStream = useCallback((onResult: (response: ApiResponse) => void) => {
+    if (streamRef.current || streamReconnectTimerRef.current) return;
+    streamWantedRef.current = true;
+    streamAttemptsRef.current = 0;
+
+    const connect = () => {
+      streamReconnectTimerRef.current = null;
+      // seq her bağlantıda sunucu tarafında sıfırdan başlar
+      streamSentRef.current = 0;
+      streamSeqRef.current = 0;
+      const stream = openPredictionStream(
+        (response: StreamApiResponse) => {
+          streamAttemptsRef.current = 0;
+          // seq = sunucunun aldığı son kare; öncekiler işlendi veya düşürüldü
+          streamSeqRef.current = Math.max(streamSeqRef.current, response.seq ?? 0);
+          setLastResponse(response);
+          if (response.success && response.prediction) {
+            setLastPrediction(response.prediction);
+          }
+          onResult(response);
+        },
+        () => {
+          if (streamRef.current !== stream) return;
+          streamRef.current = null;
+          if (!streamWantedRef.current) return;
+
+          const delay = Math.min(
+            STREAM_RECONNECT_MAX_DELAY,
+            STREAM_RECONNECT_BASE_DELAY * 2 ** streamAttemptsRef.current
+          );
+          streamAttemptsRef.current += 1;
+          console.log(`🔌 Prediction stream closed - using HTTP, reconnecting in ${delay} ms`);
+          streamReconnectTimerRef.current = setTimeout(connect, delay);
+        }
+      );
+      streamRef.current = stream;
+    };
+
+    connect();
+  }, []);
+
+  /**
+   * Push a frame over the open stream
+   * Returns false when the stream is not open (caller falls back to sendFrame)
+   */
+  const streamFrame = useCallback((frame: Blob): boolean => {
+    const stream = streamRef.current;
+    if (!stream || !stream.isOpen()) {
+      return false;
+    }
+    // Sunucu kuyruğu dolmasın - cevabı gelmemiş kareler varken yeni kare atlanır
+    if (streamSentRef.current - streamSeqRef.current < MAX_STREAM_IN_FLIGHT) {
+      stream.send(frame);
+      streamSentRef.current += 1;
+    }
+    return true;
+  }, []);
+
+  /**
+   * Close the WebSocket stream
+   */
+  const stopStream = useCallback(() => {
+    streamWantedRef.current = false;
+    if (streamReconnectTimerRef.current) {
+      clearTimeout(streamReconnectTimerRef.current);
+      streamReconnectTimerRef.current = null;
+    }
+    const stream = streamRef.current;
+    streamRef.current = null;
+    stream?.close();
+  }, []);
+
   return {
     sendFrame,
+    startStream,
+    streamFrame,
+    stopStream,
     isLoading,
     error,
     lastPrediction,
@@ -1,5 +1,5 @@
 import { useRef, useState, useCallback, RefObject, useEffect } from 'react';
-import { videoFrameToBase64 } from '@/utils/helpers';
+import { videoFrameToBlob } from '@/utils/helpers';
 import { CAMERA_WIDTH, CAMERA_HEIGHT } from '@/utils/constants';
 
 export interface UseWebcamReturn {
@@ -9,7 +9,7 @@ export interface UseWebcamReturn {
   error: string | null;
   startCamera: () => Promise<void>;
   stopCamera: () => void;
-  captureFrame: () => string | null;
+  captureFrame: () => Promise<Blob | null>;
 }
 
 export const useWebcam = (): UseWebcamReturn => {
@@ -137,9 +137,9 @@ export const useWebcam = (): UseWebcamReturn => {
   }, []);
 
   /**
-   * Capture current video frame as base64
+   * Capture current video frame as a JPEG Blob
    */
-  const captureFrame = useCallback((): string | null => {
+  const captureFrame = useCallback(async (): Promise<Blob | null> => {
     if (!videoRef.current || !canvasRef.current) {
       console.log('⚠️ [capture] refs missing', {
         hasVideoRef: !!videoRef.current,
@@ -151,8 +151,7 @@ export const useWebcam = (): UseWebcamReturn => {
     // isActive kontrolünü üst seviye döngüde yapıyoruz
 
     try {
-      const base64 = videoFrameToBase64(videoRef.current, canvasRef.current);
-      return base64;
+      return await videoFrameToBlob(videoRef.current, canvasRef.current);
     } catch (err) {
       console.error('❌ [capture] error capturing frame:', err);
       return null;
@@ -1,5 +1,5 @@
 import axios, { AxiosInstance } from 'axios';
-import { ApiResponse, HealthCheckResponse } from '@/types';
+import { ApiResponse, BatchApiResponse, HealthCheckResponse, Landmark, StreamApiResponse } from '@/types';
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:5001';
 
@@ -19,6 +19,8 @@ const getOrCreateSessionId = (): string => {
   }
 };
 const SESSION_ID = getOrCreateSessionId();
+// Backend BINARY_FRAME_MIMETYPES ile aynı
+const BINARY_FRAME_TYPES = ['image/jpeg', 'image/png', 'image/webp'];
 
 const apiClient: AxiosInstance = axios.create({
   baseURL: API_BASE_URL,
@@ -48,6 +50,25 @@ export const api = {
     const response = await apiClient.post('/api/predict', { frame: frameBase64 });
     return response.data;
   },
+  // Binary upload - JPEG blob doğrudan gönderilir (base64 + JSON overhead yok)
+  predictBinary: async (frame: Blob): Promise<ApiResponse> => {
+    // Backend'in tanımadığı tipler JSON parser'a düşmesin - decoder içerikten anlar
+    const contentType = BINARY_FRAME_TYPES.includes(frame.type) ? frame.type : 'application/octet-stream';
+    const response = await apiClient.post('/api/predict', frame, {
+      headers: { 'Content-Type': contentType },
+    });
+    return response.data;
+  },
+  // Landmark-only tahmin - istemci tarafı el takibi için (görüntü gönderilmez)
+  predictLandmarks: async (landmarks: Landmark[]): Promise<ApiResponse> => {
+    const response = await apiClient.post('/api/predict/landmarks', { landmarks });
+    return response.data;
+  },
+  // Batch tahmin - buffer'lanmış kareler tek istekte, tek model çağrısıyla
+  predictBatch: async (frames: string[]): Promise<BatchApiResponse> => {
+    const response = await apiClient.post('/api/predict/batch', { frames });
+    return response.data;
+  },
   test: async (): Promise<{ message: string; timestamp: string }> => {
     const response = await apiClient.get('/api/test');
     return response.data;
@@ -57,4 +78,44 @@ export const api = {
     return response.data;
   },
 };
+// WebSocket streaming - kareler sürekli gönderilir, sonuçlar asenkron döner
+export interface PredictionStream {
+  send: (frame: string | Blob) => void;
+  isOpen: () => boolean;
+  close: () => void;
+}
+
+export const openPredictionStream = (
+  onResult: (response: StreamApiResponse) => void,
+  onClose?: () => void
+): PredictionStream => {
+  const wsUrl = API_BASE_URL.replace(/^http/, 'ws');
+  const socket = new WebSocket(`${wsUrl}/api/stream?session_id=${encodeURIComponent(SESSION_ID)}`);
+  socket.binaryType = 'arraybuffer';
+  let nextId = 0;
+
+  socket.onmessage = (event) => {
+    try {
+      onResult(JSON.parse(event.data as string));
+    } catch (err) {
+      console.error('❌ Stream message parse error:', err);
+    }
+  };
+  socket.onclose = () => onClose?.();
+
+  return {
+    send: (frame) => {
+      if (socket.readyState !== WebSocket.OPEN) return;
+      if (typeof frame === 'string') {
+        nextId += 1;
+        socket.send(JSON.stringify({ frame, id: nextId }));
+      } else {
+        socket.send(frame);
+      }
+    },
+    isOpen: () => socket.readyState === WebSocket.OPEN,
+    close: () => socket.close(),
+  };
+};
+
 export default api;
\ No newline at end of file
@@ -1,8 +1,15 @@
 // API Related Types
+export interface PredictionAlternative {
+  letter: string | null;
+  confidence: number;
+  label_index: number;
+}
+
 export interface PredictionResult {
   letter: string | null;
   confidence: number;
   label_index: number | null;
+  top_k?: PredictionAlternative[] | null;
 }
 
 export interface Landmark {
@@ -22,17 +29,49 @@ export interface ApiResponse {
   hand_detected: boolean;
   prediction: PredictionResult;
   landmarks?: Landmark[];
+  // landmarks=compact: düz [x0, y0, x1, y1, ...] int16, koordinat = değer / landmarks_scale
+  landmarks_i16?: number[] | null;
+  landmarks_scale?: number;
   bounding_box?: BoundingBox;
   timestamp: string;
   error?: string | null;
   session_id?: string;
   cached?: boolean;
+  motion_skipped?: boolean;
+}
+
+export interface StreamApiResponse extends ApiResponse {
+  seq: number;
+  frame_id: number | null;
+  dropped_frames: number;
+}
+
+export interface BatchApiResponse {
+  success: boolean;
+  count: number;
+  results: ApiResponse[];
+  session_id?: string;
+  timestamp: string;
+}
+
+export interface WarmupState {
+  enabled: boolean;
+  completed: boolean;
+  duration_ms: number | null;
+  frames: number;
+  source: string | null;
+  timings: Record<string, number>;
+  error: string | null;
+  completed_at: string | null;
 }
 
 export interface HealthCheckResponse {
   status: 'healthy' | 'unhealthy';
+  live?: boolean;
+  ready?: boolean;
   model_loaded: boolean;
   mediapipe_ready: boolean;
+  warmup?: WarmupState;
   timestamp: string;
   config?: {
     min_detection_confidence: number;
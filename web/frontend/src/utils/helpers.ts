@@ -38,6 +38,34 @@ export const videoFrameToBase64 = (
   }
 };
 
+/**
+ * Convert video frame to a JPEG Blob (sent as binary - no base64 / JSON overhead)
+ */
+export const videoFrameToBlob = (
+  video: HTMLVideoElement,
+  canvas: HTMLCanvasElement
+): Promise<Blob | null> => {
+  try {
+    const ctx = canvas.getContext('2d');
+    if (!ctx) return Promise.resolve(null);
+
+    // Guard: ensure video has valid dimensions (metadata loaded)
+    if (!video.videoWidth || !video.videoHeight) {
+      return Promise.resolve(null);
+    }
+
+    canvas.width = video.videoWidth;
+    canvas.height = video.videoHeight;
+    ctx.drawImage(video, 0, 0, canvas.width, canvas.height);
+
+    // toBlob encode'u ana thread dışında yapar (toDataURL senkron + base64 string)
+    return new Promise((resolve) => canvas.toBlob(resolve, 'image/jpeg', 0.8));
+  } catch (error) {
+    console.error('Error converting frame to blob:', error);
+    return Promise.resolve(null);
+  }
+};
+
 /**
  * Format confidence score as percentage
  */